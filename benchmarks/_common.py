@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+import os
+import site
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+
+def emit(name: str, results: Dict[str, Any]) -> None:
+    print(json.dumps({"benchmark": name, "results": results}, indent=2))
+
+
+def subprocess_env(**overrides: str) -> Dict[str, str]:
+    env = dict(os.environ, **overrides)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(SRC_DIR), env.get("PYTHONPATH")])
+    )
+    return env
+
+
+def isolated_env(directory: str, **overrides: str) -> Dict[str, str]:
+    # subprocess_env() with config, data, cache and runtime directories
+    # under directory, so a benchmark that starts the app neither reads nor
+    # changes the user's settings and history, nor finds their instance.
+    # platformdirs honours XDG_* on Linux and HOME on macOS; the user site
+    # is pinned so that packages installed with --user are still found.
+    root = Path(directory)
+    paths = {
+        "HOME": root / "home",
+        "XDG_CONFIG_HOME": root / "config",
+        "XDG_DATA_HOME": root / "data",
+        "XDG_CACHE_HOME": root / "cache",
+        "XDG_RUNTIME_DIR": root / "runtime",
+    }
+    for path in paths.values():
+        path.mkdir(parents=True, exist_ok=True)
+    env = {name: str(path) for name, path in paths.items()}
+    env["PYTHONUSERBASE"] = os.environ.get("PYTHONUSERBASE") or site.getuserbase()
+    return subprocess_env(**env, **overrides)
@@ -0,0 +1,165 @@
+"""Latency from a session transition to the alert sound starting.
+
+Drives a TimerEngine whose on_transition plays the alert, and times from the
+transition to the first sign of audio leaving the player: the first
+positionChanged past zero for QMediaPlayer (the previous path, decoding the
+mp3 on every play) and playingChanged for the preloaded QSoundEffect. Also
+reports the one-off decode into the cache, the decoded WAV's format and
+length, and a warm-cache prepare(). The decode runs whenever QtMultimedia
+has a decoder backend; the latency runs also need an audio output device
+and are reported as skipped without one.
+"""
+from __future__ import annotations
+
+import statistics
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import _common
+
+RUNS = 10
+TIMEOUT = 5.0
+
+
+def _wait(app, predicate, timeout: float = TIMEOUT) -> bool:
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            return False
+        app.processEvents()
+        time.sleep(0.001)
+    return True
+
+
+def _measure(app, engine, started_signal, is_started) -> float:
+    from pypomodoro.core.timer_engine import SessionState
+
+    marks = []
+    handler = lambda *args: is_started() and not marks and marks.append(time.perf_counter())
+    started_signal.connect(handler)
+    transition = time.perf_counter()
+    engine._transition_to(SessionState.SHORT_BREAK, auto_start=True)
+    ok = _wait(app, lambda: bool(marks))
+    started_signal.disconnect(handler)
+    if not ok:
+        raise RuntimeError("no playback within timeout")
+    return (marks[0] - transition) * 1000
+
+
+def _decode(app, cache: Path) -> dict:
+    # The decoder path on its own: mp3 -> cached PCM WAV, then a warm prepare.
+    from pypomodoro.core.sounds import SoundPlayer, cache_key
+
+    player = SoundPlayer(cache_dir=cache)
+    player.configure(True, "")
+    started = time.perf_counter()
+    player.prepare()
+    _wait(app, lambda: player._decoding is None, timeout=15.0)
+    decode_ms = (time.perf_counter() - started) * 1000
+    if player._failed is not None:
+        raise RuntimeError("decoding the alert failed (see the pypomodoro trace)")
+    with wave.open(str(cache / f"{cache_key(player._sound_file)}.wav")) as decoded:
+        wav = {
+            "channels": decoded.getnchannels(),
+            "sample_width": decoded.getsampwidth(),
+            "sample_rate": decoded.getframerate(),
+            "seconds": round(decoded.getnframes() / decoded.getframerate(), 3),
+        }
+    warm = SoundPlayer(cache_dir=cache)
+    warm.configure(True, "")
+    calls = 1000
+    started = time.perf_counter()
+    for _ in range(calls):
+        warm._effect_file = None
+        warm.prepare()
+    prepare_us = (time.perf_counter() - started) / calls * 1e6
+    return {
+        "first_decode_ms": round(decode_ms, 1),
+        "decoded_wav": wav,
+        "cached_prepare_us": round(prepare_us, 1),
+    }
+
+
+def main() -> None:
+    try:
+        from PySide6.QtCore import QCoreApplication
+        from PySide6.QtMultimedia import QAudioDecoder, QMediaDevices
+    except ImportError as exc:
+        _common.emit("alert_latency", {"skipped": str(exc)})
+        return
+    from pypomodoro.core.sounds import SoundPlayer
+    from pypomodoro.core.timer_engine import TimerEngine
+
+    app = QCoreApplication([])
+    results: dict = {}
+    if QAudioDecoder().isSupported():
+        with tempfile.TemporaryDirectory() as cache:
+            results["decode"] = _decode(app, Path(cache))
+    else:
+        results["decode"] = {"skipped": "no QtMultimedia decoder backend"}
+    if QMediaDevices.defaultAudioOutput().isNull():
+        results["playback"] = {"skipped": "no audio output device"}
+        _common.emit("alert_latency", results)
+        return
+
+    with tempfile.TemporaryDirectory() as cache:
+        player = SoundPlayer(cache_dir=Path(cache))
+        player.configure(True, "")
+
+        # Previous path: QMediaPlayer decoding the mp3 on every play.
+        media = player._ensure_player()
+        media.setSource(player._sound_file.as_uri())
+
+        def play_media() -> None:
+            media.stop()
+            media.play()
+
+        play = play_media
+        engine = TimerEngine(25, 5, 20, on_transition=lambda event: play())
+        media_runs = []
+        for _ in range(RUNS):
+            media_runs.append(
+                _measure(app, engine, media.positionChanged, lambda: media.position() > 0)
+            )
+            media.stop()
+
+        started = time.perf_counter()
+        player.prepare()
+        if not _wait(app, lambda: player._effect is not None and player._effect.isLoaded()):
+            raise RuntimeError("decoded alert did not load")
+        decode_ms = (time.perf_counter() - started) * 1000
+
+        warm = SoundPlayer(cache_dir=Path(cache))
+        warm.configure(True, "")
+        started = time.perf_counter()
+        warm.prepare()
+        _wait(app, lambda: warm._effect is not None and warm._effect.isLoaded())
+        warm_ms = (time.perf_counter() - started) * 1000
+
+        play = player.play
+        effect = player._effect
+        effect_runs = []
+        for _ in range(RUNS):
+            effect_runs.append(_measure(app, engine, effect.playingChanged, effect.isPlaying))
+            effect.stop()
+            _wait(app, lambda: not effect.isPlaying())
+
+    results["playback"] = {
+        "media_player_ms": {
+            "median": round(statistics.median(media_runs), 2),
+            "max": round(max(media_runs), 2),
+        },
+        "sound_effect_ms": {
+            "median": round(statistics.median(effect_runs), 2),
+            "max": round(max(effect_runs), 2),
+        },
+        "first_decode_ms": round(decode_ms, 1),
+        "cached_prepare_ms": round(warm_ms, 1),
+    }
+    _common.emit("alert_latency", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Cost per transition of checkpointing the engine.
+
+Alternates start_break()/skip_break() on an engine wired to an EventBus and
+times each transition with no checkpoint, with the memory-mapped
+EngineCheckpoint, and with the same fields rewritten as JSON (plain
+write_text, and the atomic temp file + fsync + rename used for the config).
+"""
+from __future__ import annotations
+
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import _common
+
+from pypomodoro.core.checkpoint import EngineCheckpoint
+from pypomodoro.core.config import atomic_write_text
+from pypomodoro.core.events import EventBus
+from pypomodoro.core.timer_engine import TimerEngine
+
+TRANSITIONS = 20_000
+FSYNC_TRANSITIONS = 500
+
+
+def _json_saver(engine: TimerEngine, path: Path, atomic: bool):
+    def save(event) -> None:
+        payload = json.dumps(
+            {
+                "state": engine.state.value,
+                "is_running": engine.is_running,
+                "cycle_count": engine.cycle_count,
+                "remaining_seconds": engine.remaining_seconds,
+                "planned_seconds": engine.session_planned,
+                "wall_deadline": engine.wall_clock() + engine.time_remaining(),
+                "session_started_at": engine.session_started_at,
+            }
+        )
+        if atomic:
+            atomic_write_text(path, payload)
+        else:
+            path.write_text(payload, encoding="utf-8")
+
+    return save
+
+
+def _per_transition_us(subscriber_factory, transitions: int) -> float:
+    now = [0.0]
+    bus = EventBus()
+    engine = TimerEngine(25, 5, 20, clock=lambda: now[0], bus=bus)
+    if subscriber_factory is not None:
+        bus.subscribe(subscriber_factory(engine), offload_when_slow=False)
+    engine.start()
+    started = time.perf_counter()
+    for index in range(transitions):
+        now[0] += 1.0
+        if index % 2:
+            engine.skip_break()
+        else:
+            engine.start_break()
+    elapsed = time.perf_counter() - started
+    bus.close()
+    return round(elapsed / transitions * 1e6, 2)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        base = Path(directory)
+        checkpoint = EngineCheckpoint(base / "checkpoint.bin")
+        results = {
+            "none_us": _per_transition_us(None, TRANSITIONS),
+            "mmap_checkpoint_us": _per_transition_us(checkpoint.subscriber, TRANSITIONS),
+            "json_write_text_us": _per_transition_us(
+                lambda engine: _json_saver(engine, base / "plain.json", atomic=False),
+                TRANSITIONS // 10,
+            ),
+            "json_atomic_fsync_us": _per_transition_us(
+                lambda engine: _json_saver(engine, base / "atomic.json", atomic=True),
+                FSYNC_TRANSITIONS,
+            ),
+        }
+        checkpoint.close()
+    results["mmap_overhead_us"] = round(results["mmap_checkpoint_us"] - results["none_us"], 2)
+    _common.emit("checkpoint", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Cold start and time to first paint of the GUI.
+
+Launches ``python -X importtime -m pypomodoro`` on the offscreen Qt platform
+with PYPOMODORO_STARTUP_PROBE set, so the window reports its first paint on
+stderr and quits. Reports the spawn-to-first-paint time, the slowest imports
+and whether any module that should load lazily was imported before the
+first paint. Exits non-zero when --budget-ms is exceeded or a lazy module
+was loaded eagerly.
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import _common
+
+LAZY_MODULES = (
+    "PySide6.QtMultimedia",
+    "plyer",
+    "pypomodoro.ui.settings_dialog",
+)
+
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+_FIRST_PAINT = re.compile(r"pypomodoro: first-paint ([0-9.]+)")
+
+
+def _run_once() -> Dict[str, Any]:
+    # Private directories keep the single-instance check from finding (and
+    # forwarding to) an instance the user has running, and the app from
+    # touching the user's config and history.
+    with tempfile.TemporaryDirectory(prefix="pypomodoro-bench-") as home:
+        env = _common.isolated_env(
+            home,
+            QT_QPA_PLATFORM="offscreen",
+            PYPOMODORO_STARTUP_PROBE="1",
+        )
+        started = time.time()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "pypomodoro"],
+            capture_output=True,
+            text=True,
+            env=env,
+            timeout=60,
+        )
+        finished = time.time()
+    imports: List[Dict[str, Any]] = []
+    first_paint = None
+    for line in completed.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            imports.append(
+                {
+                    "module": match.group(4),
+                    "self_us": int(match.group(1)),
+                    "cumulative_us": int(match.group(2)),
+                    "top_level": len(match.group(3)) <= 1,
+                }
+            )
+            continue
+        match = _FIRST_PAINT.search(line)
+        if match:
+            first_paint = float(match.group(1))
+    if first_paint is None:
+        tail = completed.stderr.strip().splitlines()[-1:] or ["no output"]
+        raise RuntimeError(f"no first-paint marker: {tail[0]}")
+    return {
+        "first_paint_ms": (first_paint - started) * 1000,
+        "exit_ms": (finished - started) * 1000,
+        "imports": imports,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    try:
+        runs = [_run_once() for _ in range(args.runs)]
+    except RuntimeError as exc:
+        _common.emit("cold_start", {"error": str(exc)})
+        return 1
+    imports = runs[-1]["imports"]
+    top_level = sorted(
+        (entry for entry in imports if entry["top_level"]),
+        key=lambda entry: entry["cumulative_us"],
+        reverse=True,
+    )
+    loaded = {entry["module"] for entry in imports}
+    eager = [name for name in LAZY_MODULES if name in loaded]
+    first_paint_ms = statistics.median(run["first_paint_ms"] for run in runs)
+    results = {
+        "first_paint_ms_median": round(first_paint_ms, 1),
+        "exit_ms_median": round(statistics.median(run["exit_ms"] for run in runs), 1),
+        "import_total_ms": round(sum(e["cumulative_us"] for e in top_level) / 1000, 1),
+        "slowest_imports_ms": {
+            entry["module"]: round(entry["cumulative_us"] / 1000, 1)
+            for entry in top_level[:10]
+        },
+        "eagerly_loaded": eager,
+    }
+    _common.emit("cold_start", results)
+    if eager:
+        return 1
+    if args.budget_ms is not None and first_paint_ms > args.budget_ms:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,46 @@
+"""Caller-side cost of saving the config during a burst of edits.
+
+Applies 100 setting changes back to back, once calling save_config for each
+(the previous settings path) and once through ConfigStore, and reports the
+time spent on the calling thread and the number of file writes.
+"""
+from __future__ import annotations
+
+import tempfile
+import time
+from pathlib import Path
+
+import _common
+
+from pypomodoro.core.config import AppConfig, save_config
+from pypomodoro.core.config_store import ConfigStore
+
+EDITS = 100
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "config.json"
+
+        started = time.perf_counter()
+        for index in range(EDITS):
+            save_config(AppConfig(work_minutes=20 + index % 30), path)
+        sync = {
+            "caller_ms": round((time.perf_counter() - started) * 1000, 2),
+            "writes": EDITS,
+        }
+
+        store = ConfigStore(path, config=AppConfig(), debounce=0.1)
+        started = time.perf_counter()
+        for index in range(EDITS):
+            store.update(work_minutes=21 + index % 30)
+        caller = time.perf_counter() - started
+        time.sleep(0.3)
+        store.close()
+        behind = {"caller_ms": round(caller * 1000, 2), "writes": store.writes}
+
+    _common.emit("config_store", {"edits": EDITS, "save_config": sync, "config_store": behind})
+
+
+if __name__ == "__main__":
+    main()
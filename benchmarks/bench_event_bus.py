@@ -0,0 +1,55 @@
+"""EventBus dispatch cost per published event with 50 subscribers.
+
+Times publish() for 50 inline (SYNC) subscribers, 50 THREAD subscribers
+(cost to the publisher is the enqueue), 50 type-filtered subscribers that
+all skip the event, and a mix of the three.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import _common
+from pypomodoro.core.events import BATCH, SYNC, THREAD, EventBus
+from pypomodoro.core.timer_engine import SessionState, TimerEvent, TimerEventType
+
+SUBSCRIBERS = 50
+
+
+def _noop(event) -> None:
+    return None
+
+
+def _measure(modes, events: int, filtered: bool = False) -> float:
+    bus = EventBus()
+    for index in range(SUBSCRIBERS):
+        mode = modes[index % len(modes)]
+        types = [TimerEventType.RESET] if filtered else None
+        bus.subscribe(_noop, event_types=types, mode=mode, queue_size=events + 1, batch_interval=0.01)
+    event = TimerEvent(TimerEventType.TRANSITION, SessionState.WORK, SessionState.SHORT_BREAK, 1)
+    started = time.perf_counter()
+    for _ in range(events):
+        bus.publish(event)
+    elapsed = time.perf_counter() - started
+    bus.close()
+    return round(elapsed / events * 1e6, 2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=20_000)
+    args = parser.parse_args()
+    _common.emit(
+        "event_bus_dispatch_us_per_event",
+        {
+            "subscribers": SUBSCRIBERS,
+            "sync": _measure([SYNC], args.events),
+            "thread": _measure([THREAD], args.events),
+            "filtered_out": _measure([SYNC], args.events, filtered=True),
+            "mixed_sync_thread_batch": _measure([SYNC, THREAD, BATCH], args.events),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""History export throughput and memory.
+
+Writes a synthetic history of ROWS sessions (20 a day, default 10M) straight
+into the on-disk format, then exports it in every format, in full and with a
+one-month window filtered to work sessions, and reports rows/sec and the
+peak RSS of each export. Exports run in a fresh interpreter each and write
+to os.devnull, so the numbers cover reading, filtering and encoding.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from array import array
+from datetime import date, timedelta
+from pathlib import Path
+
+import _common
+from pypomodoro.core.history import RECORD, STATE_CODES
+from pypomodoro.core.timer_engine import SessionState
+
+SESSIONS_PER_DAY = 20
+FIRST_DAY = date(2000, 1, 1)
+PATTERN = [SessionState.WORK, SessionState.SHORT_BREAK] * 4 + [SessionState.LONG_BREAK]
+
+
+def _generate(directory: Path, rows: int) -> None:
+    # Same files SessionHistory writes: records, day index, state indexes.
+    directory.mkdir(parents=True, exist_ok=True)
+    codes = [STATE_CODES[state] for state in PATTERN]
+    state_files = {
+        code: (directory / f"state_{state.value}.idx").open("wb")
+        for state, code in STATE_CODES.items()
+    }
+    with (directory / "sessions.bin").open("wb") as sessions, (
+        directory / "days.idx"
+    ).open("wb") as days:
+        number = 0
+        day = FIRST_DAY
+        while number < rows:
+            midnight = time.mktime(day.timetuple())
+            count = min(SESSIONS_PER_DAY, rows - number)
+            days.write(array("i", [day.toordinal(), number]).tobytes())
+            chunk = bytearray()
+            by_state = {code: array("I") for code in state_files}
+            for slot in range(count):
+                code = codes[(number + slot) % len(codes)]
+                start = midnight + 8 * 3600 + slot * 1800
+                planned = 1500 if code == 0 else 300
+                chunk += RECORD.pack(start, start + planned, code, planned, planned, number // 2)
+                by_state[code].append(number + slot)
+            sessions.write(chunk)
+            for code, numbers in by_state.items():
+                state_files[code].write(numbers.tobytes())
+            number += count
+            day += timedelta(days=1)
+    for handle in state_files.values():
+        handle.close()
+
+
+def _child(directory: Path, format: str, start: float, end: float, work_only: bool) -> None:
+    from pypomodoro.core.export import export_history
+    from pypomodoro.core.history import SessionHistory
+
+    history = SessionHistory(directory)
+    states = [SessionState.WORK] if work_only else None
+    mode = "wb" if format == "columnar" else "w"
+    with open(os.devnull, mode) as sink:
+        started = time.perf_counter()
+        rows = export_history(
+            history, sink, format, start if start >= 0 else None, end if end >= 0 else None, states
+        )
+        elapsed = time.perf_counter() - started
+    history.close()
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"rows": rows, "seconds": elapsed, "peak_rss_kib": peak_kib}))
+
+
+def _run_child(directory: Path, format: str, start: float, end: float, work_only: bool) -> dict:
+    completed = subprocess.run(
+        [sys.executable, __file__, "--child", str(directory), format,
+         str(start), str(end), str(int(work_only))],
+        capture_output=True,
+        text=True,
+        env=_common.subprocess_env(),
+        check=True,
+    )
+    return json.loads(completed.stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--child", nargs=5)
+    args = parser.parse_args()
+    if args.child:
+        directory, format, start, end, work_only = args.child
+        _child(Path(directory), format, float(start), float(end), work_only == "1")
+        return
+
+    results = {"rows": args.rows}
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp) / "history"
+        started = time.perf_counter()
+        _generate(directory, args.rows)
+        results["generate_s"] = round(time.perf_counter() - started, 1)
+        days = args.rows // SESSIONS_PER_DAY
+        window_start = FIRST_DAY + timedelta(days=days // 2)
+        month = (
+            time.mktime(window_start.timetuple()),
+            time.mktime((window_start + timedelta(days=30)).timetuple()),
+        )
+        for format in ("csv", "jsonl", "columnar"):
+            full = _run_child(directory, format, -1, -1, False)
+            results[f"{format}_rows_per_s"] = round(full["rows"] / full["seconds"])
+            results[f"{format}_peak_rss_kib"] = full["peak_rss_kib"]
+            window = _run_child(directory, format, month[0], month[1], True)
+            results[f"{format}_month_work_rows"] = window["rows"]
+            results[f"{format}_month_work_ms"] = round(window["seconds"] * 1000, 2)
+    _common.emit("export", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Import time and resident memory of the headless runner versus the GUI.
+
+Each entry point is imported in a fresh interpreter, which reports its own
+elapsed import time, peak RSS and whether any PySide6 module got loaded.
+"""
+from __future__ import annotations
+
+import json
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict
+
+import _common
+
+_PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+    rss_kib //= 1024
+print(json.dumps({{
+    "import_ms": elapsed * 1000,
+    "max_rss_kib": rss_kib,
+    "pyside6_loaded": any(name.startswith("PySide6") for name in sys.modules),
+}}))
+"""
+
+RUNS = 5
+
+
+def _probe(module: str) -> Dict[str, Any]:
+    env = _common.subprocess_env()
+    samples = []
+    for _ in range(RUNS):
+        completed = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module)],
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+        if completed.returncode != 0:
+            return {"error": completed.stderr.strip().splitlines()[-1]}
+        samples.append(json.loads(completed.stdout))
+    return {
+        "import_ms_median": round(statistics.median(s["import_ms"] for s in samples), 2),
+        "max_rss_kib_median": statistics.median(s["max_rss_kib"] for s in samples),
+        "pyside6_loaded": samples[0]["pyside6_loaded"],
+    }
+
+
+def main() -> None:
+    results = {
+        "headless": _probe("pypomodoro.headless"),
+        "gui": _probe("pypomodoro.app"),
+    }
+    _common.emit("headless_startup", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Session history append cost and indexed query latency.
+
+Writes ROWS synthetic sessions (about 20 per day, oldest first) into a
+temporary history directory, then times a cold open and the "focus minutes
+this week" query the UI needs.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import _common
+from pypomodoro.core.history import SessionHistory, SessionRecord
+from pypomodoro.core.timer_engine import SessionState
+
+DAY = 86400.0
+SESSIONS_PER_DAY = 20
+
+
+def _populate(history: SessionHistory, rows: int, end: float) -> float:
+    first_day = end - (rows // SESSIONS_PER_DAY + 1) * DAY
+    pattern = [SessionState.WORK, SessionState.SHORT_BREAK] * 4 + [SessionState.LONG_BREAK]
+    started = time.perf_counter()
+    for number in range(rows):
+        day, slot = divmod(number, SESSIONS_PER_DAY)
+        start = first_day + day * DAY + 8 * 3600 + slot * 1800
+        state = pattern[number % len(pattern)]
+        planned = 1500 if state == SessionState.WORK else 300
+        history.append(
+            SessionRecord(start, start + planned, state, planned, planned, number // 2)
+        )
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    now = time.time()
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        writer = SessionHistory(directory)
+        append_seconds = _populate(writer, args.rows, now)
+        writer.close()
+
+        started = time.perf_counter()
+        history = SessionHistory(directory)
+        count = len(history)
+        open_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        focus = history.focus_seconds(now - 7 * DAY, now)
+        week_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        long_breaks = sum(1 for _ in history.records(state=SessionState.LONG_BREAK))
+        long_break_ms = (time.perf_counter() - started) * 1000
+        history.close()
+
+    _common.emit(
+        "session_history",
+        {
+            "rows": count,
+            "append_us_per_row": round(append_seconds / args.rows * 1e6, 2),
+            "cold_open_ms": round(open_ms, 2),
+            "focus_minutes_this_week": focus // 60,
+            "focus_week_query_ms": round(week_ms, 2),
+            "long_break_count": long_breaks,
+            "long_break_scan_ms": round(long_break_ms, 2),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Startup memory of the translation catalogs versus installed locales.
+
+Installs 1, 14, 50 and 200 catalogs (copies of the shipped ones under
+synthetic codes) into a temporary locales directory and measures, with
+tracemalloc, the memory held after loading the strings for one language.
+The shipped catalogs are 14. "all_loaded" loads every catalog up front, which
+is what the old module-level _STRINGS dict amounted to.
+"""
+from __future__ import annotations
+
+import gc
+import json
+import shutil
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import _common
+
+from pypomodoro.core import i18n
+
+INSTALLED = (1, 14, 50, 200)
+
+
+def _install(directory: Path, count: int) -> None:
+    shipped = sorted(
+        (path for path in i18n.locales_dir().glob("*.json") if path.stem != "index"),
+        key=lambda path: path.stem != i18n.ROOT_LANGUAGE,
+    )
+    names = {}
+    for index in range(count):
+        source = shipped[index % len(shipped)]
+        code = source.stem if index < len(shipped) else f"{source.stem}-x{index}"
+        shutil.copy(source, directory / f"{code}.json")
+        names[code] = code
+    (directory / "index.json").write_text(json.dumps(names), encoding="utf-8")
+
+
+def _measure(directory: Path, load_all: bool) -> float:
+    original = i18n.locales_dir
+    i18n.locales_dir = lambda: directory
+    i18n._CATALOGS.clear()
+    i18n._STRINGS.clear()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        languages = list(i18n.available_languages()) if load_all else ["en"]
+        for language in languages:
+            i18n.get_strings(language).format("cycles_completed", count=2)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        i18n.locales_dir = original
+        i18n._CATALOGS.clear()
+        i18n._STRINGS.clear()
+    return round(current / 1024, 1)
+
+
+def main() -> None:
+    results = {}
+    for count in INSTALLED:
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            _install(directory, count)
+            results[str(count)] = {
+                "lazy_kib": _measure(directory, load_all=False),
+                "all_loaded_kib": _measure(directory, load_all=True),
+            }
+    _common.emit("i18n_memory", {"installed_locales": results})
+
+
+if __name__ == "__main__":
+    main()
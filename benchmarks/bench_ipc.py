@@ -0,0 +1,83 @@
+"""Cost of controlling a running instance from the command line.
+
+Starts an InstanceServer in this process (the handler answers like the GUI
+would, without Qt) and measures the socket round trip of send_command, and
+the wall time and loaded modules of `python -m pypomodoro status` run as a
+subprocess against it. Compare with bench_cold_start.py for what a second
+launch cost when it booted its own QApplication.
+"""
+from __future__ import annotations
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import _common
+
+RUNS = 200
+CLI_RUNS = 10
+
+_MODULES_PROBE = (
+    "import sys; from pypomodoro.__main__ import main; main(['status']); "
+    "print(len(sys.modules), any(m.startswith(('PySide6', 'plyer')) for m in sys.modules))"
+)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as runtime:
+        os.environ["XDG_RUNTIME_DIR"] = runtime
+        from pypomodoro.core.ipc import InstanceServer, send_command
+
+        server = InstanceServer(lambda command: {"message": "Focus 25:00", "state": "work"})
+        server.start()
+        try:
+            round_trips = []
+            for _ in range(RUNS):
+                started = time.perf_counter()
+                send_command("status")
+                round_trips.append((time.perf_counter() - started) * 1000)
+
+            env = _common.subprocess_env(XDG_RUNTIME_DIR=runtime)
+            cli = []
+            for _ in range(CLI_RUNS):
+                started = time.perf_counter()
+                subprocess.run(
+                    [sys.executable, "-m", "pypomodoro", "status"],
+                    env=env,
+                    check=True,
+                    capture_output=True,
+                )
+                cli.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            subprocess.run([sys.executable, "-c", "pass"], env=env, check=True)
+            bare_python_ms = (time.perf_counter() - started) * 1000
+            probe = subprocess.run(
+                [sys.executable, "-c", _MODULES_PROBE],
+                env=env,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.split()
+        finally:
+            server.close()
+
+    _common.emit(
+        "ipc",
+        {
+            "round_trip_ms": {
+                "median": round(statistics.median(round_trips), 3),
+                "max": round(max(round_trips), 3),
+            },
+            "cli_status_ms": round(statistics.median(cli), 1),
+            "bare_python_ms": round(bare_python_ms, 1),
+            "cli_modules_loaded": int(probe[-2]),
+            "cli_loads_qt_or_plyer": probe[-1] == "True",
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
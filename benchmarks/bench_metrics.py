@@ -0,0 +1,70 @@
+"""Overhead of the runtime metrics.
+
+Times a trivial function bare, wrapped in @timed with metrics disabled and
+enabled, and a direct observe() call; then renders the Prometheus text for
+histograms holding a day of one-second ticks and serves it over HTTP.
+"""
+from __future__ import annotations
+
+import random
+import time
+import timeit
+import urllib.request
+
+import _common
+
+from pypomodoro.core import metrics
+
+CALLS = 200_000
+TICKS_PER_DAY = 86_400
+
+
+def _noop() -> None:
+    pass
+
+
+@metrics.timed("update_display_ms")
+def _timed_noop() -> None:
+    pass
+
+
+def _per_call_ns(function, number: int = CALLS) -> float:
+    best = min(timeit.repeat(function, number=number, repeat=5))
+    return round(best / number * 1e9, 1)
+
+
+def main() -> None:
+    registry = metrics.get_metrics()
+    results = {
+        "bare_call_ns": _per_call_ns(_noop),
+        "timed_disabled_ns": _per_call_ns(_timed_noop),
+    }
+    registry.enabled = True
+    results["timed_enabled_ns"] = _per_call_ns(_timed_noop)
+    results["observe_enabled_ns"] = _per_call_ns(
+        lambda: metrics.observe("tick_interval_ms", 1000.4)
+    )
+    rng = random.Random(1)
+    for _ in range(TICKS_PER_DAY):
+        metrics.observe("tick_interval_ms", rng.gauss(1000.0, 2.0))
+    results["render_us"] = round(
+        min(timeit.repeat(registry.render, number=200, repeat=5)) / 200 * 1e6, 1
+    )
+    results["render_bytes"] = len(registry.render().encode("utf-8"))
+
+    registry.enable(port=0)
+    port = registry._server.server_address[1]
+    started = time.perf_counter()
+    for _ in range(100):
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            response.read()
+    results["scrape_ms"] = round((time.perf_counter() - started) / 100 * 1000, 3)
+    registry.close()
+    results["timed_disabled_overhead_ns"] = round(
+        results["timed_disabled_ns"] - results["bare_call_ns"], 1
+    )
+    _common.emit("metrics", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Cost of compiling schedules and of following them.
+
+Times parsing + compiling a schedule uncached and cached, a session
+completion on the default and on a 400-slot schedule (both a table lookup,
+so they should match), and update_settings() with and without a schedule
+change.
+"""
+from __future__ import annotations
+
+import timeit
+
+import _common
+
+from pypomodoro.core.schedule import DEFAULT_SCHEDULE, compile_schedule, parse_schedule
+from pypomodoro.core.timer_engine import TimerEngine
+
+LONG_SCHEDULE = "((work, short)*3, work, long)*50"
+COMPLETIONS = 100_000
+
+
+def _per_call_us(function, number: int, repeat: int = 5) -> float:
+    best = min(timeit.repeat(function, number=number, repeat=repeat))
+    return round(best / number * 1e6, 3)
+
+
+def _uncached(spec: str) -> None:
+    parse_schedule.cache_clear()
+    compile_schedule.cache_clear()
+    compile_schedule(spec, 25, 5, 20)
+
+
+def _completion_us(schedule: str) -> float:
+    engine = TimerEngine(25, 5, 20, schedule=schedule)
+    engine.start()
+
+    def complete() -> None:
+        engine.remaining_seconds = 0
+        engine._handle_session_complete()
+
+    return _per_call_us(complete, COMPLETIONS)
+
+
+def main() -> None:
+    settings = TimerEngine(25, 5, 20)
+    schedules = [DEFAULT_SCHEDULE, "(work, short)*3, work, long"]
+    flip = [0]
+
+    def change_schedule() -> None:
+        flip[0] ^= 1
+        settings.update_settings(25, 5, 20, True, True, schedule=schedules[flip[0]])
+
+    results = {
+        "compile_default_us": _per_call_us(lambda: _uncached(DEFAULT_SCHEDULE), 2_000),
+        "compile_long_us": _per_call_us(lambda: _uncached(LONG_SCHEDULE), 200),
+        "compile_cached_us": _per_call_us(
+            lambda: compile_schedule(DEFAULT_SCHEDULE, 25, 5, 20), 200_000
+        ),
+        "complete_default_us": _completion_us(DEFAULT_SCHEDULE),
+        "complete_long_us": _completion_us(LONG_SCHEDULE),
+        "update_settings_same_us": _per_call_us(
+            lambda: settings.update_settings(25, 5, 20, True, True), 50_000
+        ),
+        "update_settings_new_schedule_us": _per_call_us(change_schedule, 50_000),
+    }
+    _common.emit("schedule", results)
+
+
+if __name__ == "__main__":
+    main()
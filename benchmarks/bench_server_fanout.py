@@ -0,0 +1,153 @@
+"""Fan-out latency of the WebSocket server with many local subscribers.
+
+Starts ``python -m pypomodoro --serve`` in a subprocess (with throwaway
+config/data directories), connects CLIENTS WebSocket subscribers, then
+alternates POST /pause and POST /start. Every command broadcasts one status
+event stamped with the server time; each client records how long it took to
+arrive. The client side runs in this single process, so the numbers include
+its own parsing cost.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import resource
+import socket
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+import _common
+
+
+def _raise_fd_limit() -> None:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or hard > 65536:
+        hard = 65536
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> bytes:
+    _, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", await reader.readexactly(8))
+    return await reader.readexactly(length)
+
+
+async def _subscriber(port: int, latencies: List[float], ready: asyncio.Event, counter: List[int], total: int) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    key = base64.b64encode(os.urandom(16)).decode("ascii")
+    writer.write(
+        (
+            "GET /ws HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n"
+            f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        ).encode("ascii")
+    )
+    await reader.readuntil(b"\r\n\r\n")
+    await _read_frame(reader)
+    counter[0] += 1
+    if counter[0] == total:
+        ready.set()
+    try:
+        while True:
+            payload = json.loads(await _read_frame(reader))
+            latencies.append(time.time() - payload["time"])
+    except (asyncio.IncompleteReadError, ConnectionError):
+        writer.close()
+
+
+async def _post(port: int, path: str) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: 0\r\n\r\n".encode())
+    await writer.drain()
+    await reader.read()
+    writer.close()
+
+
+async def _run(port: int, clients: int, rounds: int) -> dict:
+    latencies: List[float] = []
+    ready = asyncio.Event()
+    counter = [0]
+    connect_started = time.perf_counter()
+    tasks = []
+    for _ in range(clients):
+        tasks.append(asyncio.create_task(_subscriber(port, latencies, ready, counter, clients)))
+        await asyncio.sleep(0)
+    await asyncio.wait_for(ready.wait(), timeout=120)
+    connect_seconds = time.perf_counter() - connect_started
+
+    round_ms = []
+    for number in range(rounds):
+        expected = (number + 1) * clients
+        started = time.perf_counter()
+        await _post(port, "/pause" if number % 2 == 0 else "/start")
+        while len(latencies) < expected:
+            await asyncio.sleep(0.001)
+        round_ms.append((time.perf_counter() - started) * 1000)
+    for task in tasks:
+        task.cancel()
+    ordered = sorted(latencies)
+    return {
+        "clients": clients,
+        "rounds": rounds,
+        "connect_seconds": round(connect_seconds, 2),
+        "delivered": len(latencies),
+        "latency_ms_p50": round(ordered[len(ordered) // 2] * 1000, 2),
+        "latency_ms_p99": round(ordered[int(len(ordered) * 0.99)] * 1000, 2),
+        "latency_ms_max": round(ordered[-1] * 1000, 2),
+        "round_to_last_client_ms_median": round(statistics.median(round_ms), 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    _raise_fd_limit()
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = _common.subprocess_env(XDG_CONFIG_HOME=tmp, XDG_DATA_HOME=tmp)
+        server = subprocess.Popen(
+            [sys.executable, "-m", "pypomodoro", "--serve", str(port), "--no-notify"],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            preexec_fn=_raise_fd_limit,
+        )
+        try:
+            deadline = time.time() + 10
+            while time.time() < deadline:
+                try:
+                    socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+                    break
+                except OSError:
+                    time.sleep(0.05)
+            results = asyncio.run(_run(port, args.clients, args.rounds))
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+    _common.emit("server_fanout", results)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,83 @@
+"""advance() versus per-second tick(), and the what-if simulator.
+
+Simulates one 8-hour day with 28,800 tick() calls and with one advance()
+call, then runs a grid of 400 work/short/long break variants over DAYS
+working days serially and on a process pool.
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import time
+
+import _common
+from pypomodoro.core.config import AppConfig
+from pypomodoro.core.simulator import what_if
+from pypomodoro.core.timer_engine import TimerEngine
+
+DAY = 8 * 3600
+
+
+def _tick_day() -> float:
+    engine = TimerEngine(25, 5, 20)
+    engine.start()
+    started = time.perf_counter()
+    for _ in range(DAY):
+        engine.tick()
+    return time.perf_counter() - started
+
+
+def _advance_day() -> float:
+    engine = TimerEngine(25, 5, 20)
+    engine.start()
+    started = time.perf_counter()
+    engine.advance(DAY)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--days", type=int, default=20)
+    args = parser.parse_args()
+
+    tick_seconds = _tick_day()
+    advance_seconds = min(_advance_day() for _ in range(20))
+
+    grid = dict(
+        work_minutes=range(15, 61, 5),
+        short_break_minutes=range(3, 11),
+        long_break_minutes=range(10, 31, 5),
+    )
+    variants = len(list(itertools.product(*grid.values())))
+    duration = args.days * DAY
+    started = time.perf_counter()
+    what_if(AppConfig(), duration=duration, processes=1, **grid)
+    serial_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    results = what_if(AppConfig(), duration=duration, processes=args.processes, **grid)
+    pool_seconds = time.perf_counter() - started
+    best = max(results, key=lambda item: item[1]["focus_seconds"])
+
+    _common.emit(
+        "simulator",
+        {
+            "tick_day_ms": round(tick_seconds * 1000, 2),
+            "advance_day_ms": round(advance_seconds * 1000, 4),
+            "speedup": round(tick_seconds / advance_seconds),
+            "variants": variants,
+            "simulated_days_per_variant": args.days,
+            "serial_seconds": round(serial_seconds, 3),
+            "process_pool_seconds": round(pool_seconds, 3),
+            "most_focus": {
+                "work_minutes": best[0].work_minutes,
+                "short_break_minutes": best[0].short_break_minutes,
+                "long_break_minutes": best[0].long_break_minutes,
+                "focus_hours": round(best[1]["focus_seconds"] / 3600, 1),
+            },
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
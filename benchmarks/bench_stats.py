@@ -0,0 +1,87 @@
+"""Focus analytics over ten years of synthetic sessions.
+
+Builds a history of about 20 sessions per working day for YEARS years, then
+times the bulk load and each SessionStats query on the array backend and,
+when NumPy is installed, the NumPy backend.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import _common
+from pypomodoro.core.history import SessionHistory, SessionRecord
+from pypomodoro.core.stats import SessionStats
+from pypomodoro.core.timer_engine import SessionState
+
+DAY = 86400.0
+
+
+def _populate(history: SessionHistory, years: int, end: float) -> None:
+    pattern = [SessionState.WORK, SessionState.SHORT_BREAK] * 4 + [SessionState.LONG_BREAK]
+    first_day = end - years * 365 * DAY
+    cycles = 0
+    for day in range(years * 365):
+        if day % 7 in (5, 6):
+            continue
+        start = first_day + day * DAY + 9 * 3600
+        for slot in range(20):
+            state = pattern[slot % len(pattern)]
+            planned = 1500 if state == SessionState.WORK else 300
+            actual = planned if slot % 7 else planned // 2
+            history.append(
+                SessionRecord(start, start + actual, state, planned, actual, cycles)
+            )
+            cycles += state == SessionState.WORK
+            start += actual + 30
+
+
+def _timed(function: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    function()
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+def _measure(history: SessionHistory, backend: str, now: float) -> Dict[str, Any]:
+    stats: Dict[str, SessionStats] = {}
+    load_ms = _timed(lambda: stats.setdefault("s", SessionStats.from_history(history, backend)))
+    s = stats["s"]
+    today = date.fromtimestamp(now)
+    return {
+        "rows": len(s),
+        "load_ms": load_ms,
+        "daily_focus_1y_ms": _timed(lambda: s.daily_focus(today - timedelta(days=365), today)),
+        "weekly_focus_10y_ms": _timed(lambda: s.weekly_focus(today - timedelta(days=3650), today)),
+        "focus_between_10y_ms": _timed(lambda: s.focus_between(0, now)),
+        "streaks_ms": _timed(lambda: s.streaks(today)),
+        "completion_rate_ms": _timed(s.completion_rate),
+        "break_overrun_ms": _timed(s.average_break_overrun),
+        "heatmap_ms": _timed(s.heatmap),
+        "completion_rate": round(s.completion_rate(), 4),
+        "average_break_overrun_s": round(s.average_break_overrun(), 2),
+        "focus_total_hours": s.focus_between(0, now) // 3600,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=10)
+    args = parser.parse_args()
+
+    now = time.time()
+    with tempfile.TemporaryDirectory() as tmp:
+        history = SessionHistory(Path(tmp))
+        _populate(history, args.years, now)
+        results = {"array": _measure(history, "array", now)}
+        if SessionStats().backend == "numpy":
+            results["numpy"] = _measure(history, "numpy", now)
+        history.close()
+    _common.emit("session_stats", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Theme switch time on a window with many widgets.
+
+Builds a main window padded with extra buttons and labels on the offscreen Qt
+platform, then times switching between light and dark and re-applying the
+current theme, once with the previous inline whole-window stylesheets and
+once through the theme registry.
+"""
+from __future__ import annotations
+
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import _common
+from PySide6.QtWidgets import QApplication, QLabel, QPushButton, QVBoxLayout, QWidget
+
+from pypomodoro.core.config import AppConfig
+from pypomodoro.ui.main_window import MainWindow
+
+EXTRA_WIDGETS = 400
+SWITCHES = 20
+
+_INLINE = {
+    "light": """
+        QWidget { background-color: #f6f6f6; color: #1b1b1b; }
+        QPushButton { background-color: #ffffff; border: 1px solid #d0d0d0;
+                      padding: 8px 12px; border-radius: 6px; }
+        QPushButton:disabled { background-color: #ededed; color: #9a9a9a; }
+    """,
+    "dark": """
+        QWidget { background-color: #1f1f1f; color: #f2f2f2; }
+        QPushButton { background-color: #2d2d2d; border: 1px solid #3a3a3a;
+                      padding: 8px 12px; border-radius: 6px; }
+        QPushButton:disabled { background-color: #242424; color: #7a7a7a; }
+    """,
+}
+
+
+def _pad(window: MainWindow) -> None:
+    extra = QWidget()
+    layout = QVBoxLayout(extra)
+    for index in range(EXTRA_WIDGETS):
+        widget = QPushButton(f"button {index}") if index % 2 else QLabel(f"label {index}")
+        layout.addWidget(widget)
+    window.centralWidget().layout().addWidget(extra)
+
+
+def _time(app: QApplication, apply, themes) -> float:
+    started = time.perf_counter()
+    for theme in themes:
+        apply(theme)
+        app.processEvents()
+    return round((time.perf_counter() - started) * 1000 / len(themes), 2)
+
+
+def main() -> None:
+    app = QApplication([])
+    window = MainWindow(AppConfig(sound_enabled=False))
+    window._timer.stop()
+    _pad(window)
+    window.show()
+    app.processEvents()
+
+    alternating = ["dark", "light"] * (SWITCHES // 2)
+    same = ["light"] * SWITCHES
+
+    inline = {
+        "switch_ms": _time(app, lambda theme: window.setStyleSheet(_INLINE[theme]), alternating),
+        "reapply_ms": _time(app, lambda theme: window.setStyleSheet(_INLINE[theme]), same),
+    }
+    window.setStyleSheet("")
+    window._theme = None
+    registry = {
+        "switch_ms": _time(app, window._apply_theme, alternating),
+        "reapply_ms": _time(app, window._apply_theme, same),
+    }
+    window.close()
+    _common.emit("theme_switch", {"widgets": EXTRA_WIDGETS, "inline_qss": inline, "registry": registry})
+
+
+if __name__ == "__main__":
+    main()
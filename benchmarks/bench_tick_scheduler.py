@@ -0,0 +1,50 @@
+"""Wakeups per hour of the Qt timer driving MainWindow.
+
+Replays one hour of a running 25/5/20 cycle against a simulated clock and
+counts how often the process would be woken with the old free-running 1 s
+QTimer and with TickScheduler in each display mode.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+import _common
+from pypomodoro.core.tick_scheduler import DEADLINE_ONLY, PER_MINUTE, PER_SECOND, TickScheduler
+from pypomodoro.core.timer_engine import TimerEngine
+
+HOUR = 3600.0
+
+
+def _wakeups(resolution: Optional[int], running: bool = True) -> int:
+    now = [0.0]
+    engine = TimerEngine(25, 5, 20, clock=lambda: now[0])
+    if running:
+        engine.start()
+    scheduler = TickScheduler(engine)
+    while True:
+        delay = scheduler.next_delay(resolution)
+        if delay is None or now[0] + delay > HOUR:
+            break
+        now[0] += delay
+        scheduler.woke()
+        engine.tick()
+    return scheduler.wakeups
+
+
+def main() -> None:
+    free_running = int(HOUR)
+    results = {
+        "free_running_1s": free_running,
+        "visible_per_second": _wakeups(PER_SECOND),
+        "tray_per_minute": _wakeups(PER_MINUTE),
+        "hidden_deadline_only": _wakeups(DEADLINE_ONLY),
+        "paused": _wakeups(PER_SECOND, running=False),
+    }
+    results["hidden_reduction_factor"] = round(
+        free_running / max(1, results["hidden_deadline_only"]), 1
+    )
+    _common.emit("tick_scheduler_wakeups_per_hour", results)
+
+
+if __name__ == "__main__":
+    main()
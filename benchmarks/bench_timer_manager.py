@@ -0,0 +1,84 @@
+"""TimerManager with many concurrent timers on a simulated clock.
+
+Starts TIMERS engines with staggered offsets and random 15-50 minute work
+sessions, then replays HOURS hours by jumping from deadline to deadline.
+Reports wakeups and wall time against the per-second tick() calls the same
+timers would need, plus the cost of add/reconfigure/remove.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import _common
+from pypomodoro.core.timer_manager import TimerManager
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--timers", type=int, default=10_000)
+    parser.add_argument("--hours", type=float, default=8.0)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    now = [0.0]
+    transitions = [0]
+
+    def on_transition(event) -> None:
+        transitions[0] += 1
+
+    manager = TimerManager(clock=lambda: now[0])
+    started = time.perf_counter()
+    for timer_id in range(args.timers):
+        now[0] = rng.uniform(0, 60)
+        manager.add(
+            timer_id,
+            work_minutes=rng.randint(15, 50),
+            short_break_minutes=5,
+            long_break_minutes=20,
+            on_transition=on_transition,
+        )
+        manager.start(timer_id)
+    add_us = (time.perf_counter() - started) / args.timers * 1e6
+
+    horizon = args.hours * 3600
+    wakeups = 0
+    started = time.perf_counter()
+    while True:
+        deadline = manager.next_deadline()
+        if deadline is None or deadline > horizon:
+            break
+        now[0] = deadline
+        manager.run_due()
+        wakeups += 1
+    run_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for timer_id in range(0, args.timers, 2):
+        manager.reconfigure(timer_id, work_minutes=30)
+    reconfigure_us = (time.perf_counter() - started) / (args.timers / 2) * 1e6
+    started = time.perf_counter()
+    for timer_id in range(args.timers):
+        manager.remove(timer_id)
+    remove_us = (time.perf_counter() - started) / args.timers * 1e6
+
+    _common.emit(
+        "timer_manager",
+        {
+            "timers": args.timers,
+            "simulated_hours": args.hours,
+            "transitions": transitions[0],
+            "wakeups": wakeups,
+            "per_second_tick_calls_avoided": int(args.timers * horizon),
+            "run_seconds": round(run_seconds, 3),
+            "us_per_transition": round(run_seconds / max(1, transitions[0]) * 1e6, 2),
+            "add_us": round(add_us, 2),
+            "reconfigure_us": round(reconfigure_us, 2),
+            "remove_us": round(remove_us, 2),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""CPU, wakeups and memory for a full day of tray-only operation.
+
+Runs 24 hours of back-to-back sessions on a simulated clock with the main
+window hidden, so only the tray icon is updated. The previous approach is
+modelled as waking every second and painting a fresh QIcon each time; the
+tray path wakes on PER_MINUTE boundaries and swaps cached glyphs only when
+the displayed minute changes. Memory is the RSS growth over the run plus
+the pixel bytes held by the glyph cache.
+"""
+from __future__ import annotations
+
+import os
+import resource
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import _common
+from PySide6.QtGui import QIcon
+from PySide6.QtWidgets import QApplication, QSystemTrayIcon
+
+from pypomodoro.core.i18n import get_strings
+from pypomodoro.core.tick_scheduler import PER_MINUTE, PER_SECOND, TickScheduler
+from pypomodoro.core.timer_engine import SessionState, TimerEngine
+from pypomodoro.ui.tray import TrayCountdown, TrayGlyphCache, display_minutes
+
+DAY = 24 * 3600
+
+
+def _rss_kib() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _engine(now: list) -> TimerEngine:
+    engine = TimerEngine(25, 5, 20, clock=lambda: now[0])
+    engine.start()
+    return engine
+
+
+def _naive_day() -> dict:
+    now = [0.0]
+    engine = _engine(now)
+    scheduler = TickScheduler(engine)
+    icon = QSystemTrayIcon()
+    painter = TrayGlyphCache()
+    rss_before = _rss_kib()
+    started = time.process_time()
+    while now[0] < DAY:
+        now[0] += scheduler.next_delay(PER_SECOND)
+        scheduler.woke()
+        engine.tick()
+        pixmap = painter._render(display_minutes(engine.time_remaining()), engine.state)
+        icon.setIcon(QIcon(pixmap))
+    return {
+        "cpu_ms": round((time.process_time() - started) * 1000, 1),
+        "wakeups": scheduler.wakeups,
+        "icon_renders": scheduler.wakeups,
+        "rss_growth_kib": _rss_kib() - rss_before,
+    }
+
+
+def _tray_day() -> dict:
+    now = [0.0]
+    engine = _engine(now)
+    scheduler = TickScheduler(engine)
+    noop = lambda: None
+    tray = TrayCountdown(get_strings("en"), noop, noop, noop, noop)
+    rss_before = _rss_kib()
+    started = time.process_time()
+    while now[0] < DAY:
+        now[0] += scheduler.next_delay(PER_MINUTE)
+        scheduler.woke()
+        engine.tick()
+        tray.update(engine)
+    glyph_bytes = len(tray.glyphs) * tray.glyphs.size * tray.glyphs.size * 4
+    return {
+        "cpu_ms": round((time.process_time() - started) * 1000, 1),
+        "wakeups": scheduler.wakeups,
+        "icon_swaps": tray.icon_swaps,
+        "icon_renders": tray.glyphs.renders,
+        "cached_glyphs": len(tray.glyphs),
+        "glyph_cache_kib": glyph_bytes // 1024,
+        "rss_growth_kib": _rss_kib() - rss_before,
+    }
+
+
+def main() -> None:
+    QApplication([])
+    # Load fonts and the paint engine before either run is measured; the tray
+    # run goes first so the naive run's RSS growth cannot hide it.
+    TrayGlyphCache().icon(0, SessionState.WORK)
+    tray = _tray_day()
+    naive = _naive_day()
+    _common.emit("tray", {"repaint_every_second": naive, "glyph_cache": tray})
+
+
+if __name__ == "__main__":
+    main()
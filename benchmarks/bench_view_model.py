@@ -0,0 +1,88 @@
+"""Widget updates, paint events and CPU for one hour of display refreshes.
+
+Replays 3600 one-second refreshes of a running session on the offscreen Qt
+platform, once pushing every property to every widget (the previous
+_update_display) and once through TimerViewModel. Paint events are counted
+with an application-wide event filter after each refresh is flushed.
+"""
+from __future__ import annotations
+
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import _common
+from PySide6.QtCore import QEvent, QObject
+from PySide6.QtWidgets import QApplication
+
+from pypomodoro.core.config import AppConfig
+from pypomodoro.core.i18n import format_time, state_text
+from pypomodoro.core.timer_engine import SessionState
+from pypomodoro.ui.main_window import MainWindow
+
+REFRESHES = 3600
+
+
+class _PaintCounter(QObject):
+    def __init__(self) -> None:
+        super().__init__()
+        self.count = 0
+
+    def eventFilter(self, watched, event) -> bool:
+        if event.type() == QEvent.Paint:
+            self.count += 1
+        return False
+
+
+def _full_update(window: MainWindow) -> None:
+    engine = window.engine
+    strings = window.strings
+    window.setWindowTitle(strings["app_title"])
+    window.state_label.setText(state_text(strings, engine.state))
+    window.timer_label.setText(format_time(engine.remaining_seconds))
+    window.cycle_label.setText(strings["cycles_completed"].format(count=engine.cycle_count))
+    window.start_pause_button.setText(strings["pause"] if engine.is_running else strings["start"])
+    window.reset_button.setText(strings["reset"])
+    window.skip_button.setText(strings["skip_break"])
+    window.start_break_button.setText(strings["start_break"])
+    window.settings_button.setText(strings["settings"])
+    window.skip_button.setEnabled(engine.state != SessionState.WORK)
+    window.start_break_button.setEnabled(engine.state == SessionState.WORK)
+
+
+def _replay(app: QApplication, window: MainWindow, counter: _PaintCounter, update) -> dict:
+    window.engine.reset()
+    window.engine.start()
+    app.processEvents()
+    counter.count = 0
+    cpu_started = time.process_time()
+    for _ in range(REFRESHES):
+        window.engine.remaining_seconds -= 1
+        update()
+        app.processEvents()
+    cpu = time.process_time() - cpu_started
+    return {"paint_events_per_hour": counter.count, "cpu_ms_per_hour": round(cpu * 1000, 1)}
+
+
+def main() -> None:
+    app = QApplication([])
+    counter = _PaintCounter()
+    app.installEventFilter(counter)
+    window = MainWindow(AppConfig(sound_enabled=False))
+    window._timer.stop()
+    window.show()
+    app.processEvents()
+
+    full = _replay(app, window, counter, lambda: _full_update(window))
+    model = window._view_model
+    pushed_before = model.pushed
+    diffed = _replay(app, window, counter, window._update_display)
+    full["properties_pushed_per_hour"] = REFRESHES * 11
+    diffed["properties_pushed_per_hour"] = model.pushed - pushed_before
+    window.close()
+    _common.emit("view_model", {"full_update": full, "view_model": diffed})
+
+
+if __name__ == "__main__":
+    main()
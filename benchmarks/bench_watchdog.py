@@ -0,0 +1,74 @@
+"""Cost of the stall watchdog and of the sampling profiler.
+
+Runs a fixed CPU-bound workload (engine ticks and transitions) on the main
+thread bare, with the watchdog thread polling, and with the profiler
+sampling at several rates, and reports the slowdown of each. Also times a
+single heartbeat() and a single stack sample.
+"""
+from __future__ import annotations
+
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+import _common
+
+from pypomodoro.core.timer_engine import SessionState, TimerEngine
+from pypomodoro.core.watchdog import SamplingProfiler, StallWatchdog
+
+WORK = 200_000
+RATES = (100, 1000)
+
+
+def _workload() -> float:
+    now = [0.0]
+    engine = TimerEngine(25, 5, 20, clock=lambda: now[0])
+    engine.start()
+    started = time.perf_counter()
+    for index in range(WORK):
+        now[0] += 1.0
+        engine.tick()
+        if index % 100 == 0:
+            engine._transition_to(SessionState.SHORT_BREAK, auto_start=True)
+    return time.perf_counter() - started
+
+
+def _best(runs: int = 3) -> float:
+    return min(_workload() for _ in range(runs))
+
+
+def main() -> None:
+    bare = _best()
+    results = {"workload_ms": round(bare * 1000, 1)}
+
+    watchdog = StallWatchdog(threshold=1.0)
+    watchdog.heartbeat()
+    watchdog.start()
+    results["watchdog_overhead_pct"] = round((_best() / bare - 1) * 100, 2)
+    watchdog.close()
+    results["heartbeat_ns"] = round(
+        min(timeit.repeat(watchdog.heartbeat, number=100_000, repeat=5)) / 100_000 * 1e9, 1
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        for rate in RATES:
+            profiler = SamplingProfiler(Path(directory) / f"{rate}.folded", rate=rate)
+            started = time.perf_counter()
+            profiler.start()
+            elapsed = _best()
+            profiler.stop()
+            wall = time.perf_counter() - started
+            results[f"profile_{rate}hz_overhead_pct"] = round((elapsed / bare - 1) * 100, 2)
+            # Under a busy main thread the sampler only runs when it gets the
+            # GIL (sys.getswitchinterval(), 5 ms by default).
+            results[f"profile_{rate}hz_samples_per_s"] = round(profiler.samples / wall, 1)
+        profiler = SamplingProfiler(Path(directory) / "single.folded")
+        results["sample_us"] = round(
+            min(timeit.repeat(profiler.sample, number=2_000, repeat=5)) / 2_000 * 1e6, 2
+        )
+    _common.emit("watchdog", results)
+
+
+if __name__ == "__main__":
+    main()
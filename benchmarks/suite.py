@@ -0,0 +1,242 @@
+"""Benchmark suite for the engine, config, i18n, UI refresh and startup.
+
+Runs every benchmark below, prints the results as JSON, optionally writes
+them to --output and compares them with a stored baseline. All metrics are
+"lower is better"; a metric more than --tolerance slower than the baseline,
+and slower by more than its absolute noise floor, is a regression and makes
+the run exit with status 1. Each metric is the median of --repeat runs.
+
+    python benchmarks/suite.py                       # run and compare
+    python benchmarks/suite.py --update-baseline     # store a new baseline
+
+Qt benchmarks run on the offscreen platform and are reported as skipped
+when PySide6 (or a multimedia backend) cannot be loaded.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import _common
+import bench_cold_start
+from pypomodoro.core.config import AppConfig, _sanitize_config, load_config, save_config
+from pypomodoro.core.i18n import get_strings
+from pypomodoro.core.timer_engine import SessionState, TimerEngine
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_REPEAT = 3
+
+# Differences below these, by metric unit suffix, are timer and scheduler
+# noise: a 0.1 us call measured at 0.13 us is not a 30% regression, and
+# process startup moves by tens of milliseconds between runs.
+NOISE_FLOOR = {"_us": 1.0, "_ms": 50.0}
+
+Metrics = Dict[str, float]
+
+
+def _per_call_us(function: Callable[[], Any], number: int, repeat: int = 5) -> float:
+    best = min(timeit.repeat(function, number=number, repeat=repeat))
+    return round(best / number * 1e6, 3)
+
+
+def bench_engine() -> Metrics:
+    legacy = TimerEngine(25, 5, 20)
+    legacy.start()
+    now = [0.0]
+    deadline = TimerEngine(25, 5, 20, clock=lambda: now[0])
+    deadline.start()
+
+    def tick_deadline() -> None:
+        now[0] += 1.0
+        deadline.tick()
+
+    transitions = TimerEngine(25, 5, 20)
+
+    def transition() -> None:
+        transitions._transition_to(SessionState.SHORT_BREAK, auto_start=True)
+
+    settings = TimerEngine(25, 5, 20)
+    return {
+        "tick_legacy_us": _per_call_us(legacy.tick, 100_000),
+        "tick_deadline_us": _per_call_us(tick_deadline, 100_000),
+        "transition_us": _per_call_us(transition, 50_000),
+        "update_settings_us": _per_call_us(
+            lambda: settings.update_settings(25, 5, 20, True, True), 50_000
+        ),
+    }
+
+
+def bench_config() -> Metrics:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "config.json"
+        config = AppConfig()
+        save_config(config, path)
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        return {
+            "save_config_us": _per_call_us(lambda: save_config(config, path), 500),
+            "load_config_us": _per_call_us(lambda: load_config(path), 2_000),
+            "sanitize_config_us": _per_call_us(lambda: _sanitize_config(raw), 20_000),
+        }
+
+
+def bench_i18n() -> Metrics:
+    return {
+        "get_strings_us": _per_call_us(lambda: get_strings("en")["start"], 200_000),
+        "get_strings_fallback_us": _per_call_us(lambda: get_strings("xx")["start"], 200_000),
+        "format_plural_us": _per_call_us(
+            lambda: get_strings("ru").format("cycles_completed", count=3), 200_000
+        ),
+    }
+
+
+_QT_PROBE = """
+import json, timeit
+from PySide6.QtWidgets import QApplication
+app = QApplication([])
+from pypomodoro.core.config import AppConfig
+from pypomodoro.core.sounds import SoundPlayer
+from pypomodoro.ui.main_window import MainWindow
+window = MainWindow(AppConfig(sound_enabled=False))
+window.show()
+app.processEvents()
+def refresh():
+    window.engine.remaining_seconds -= 1
+    window._update_display()
+    app.processEvents()
+number = 2000
+display = min(timeit.repeat(refresh, number=number, repeat=3)) / number
+player = SoundPlayer()
+configure = min(timeit.repeat(lambda: player.configure(True, "wood.mp3"), number=number, repeat=3)) / number
+print(json.dumps({
+    "update_display_us": round(display * 1e6, 3),
+    "sound_configure_us": round(configure * 1e6, 3),
+}))
+window.close()
+"""
+
+
+def bench_qt() -> Metrics:
+    # Runs in a subprocess so that a missing Qt or audio stack only skips
+    # these metrics instead of aborting the suite.
+    # The probe builds a real MainWindow, which loads and saves config and
+    # history, so it gets throwaway directories.
+    with tempfile.TemporaryDirectory(prefix="pypomodoro-bench-") as home:
+        completed = subprocess.run(
+            [sys.executable, "-c", _QT_PROBE],
+            capture_output=True,
+            text=True,
+            env=_common.isolated_env(home, QT_QPA_PLATFORM="offscreen"),
+            timeout=120,
+        )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def bench_startup() -> Metrics:
+    runs = [bench_cold_start._run_once() for _ in range(3)]
+    runs.sort(key=lambda run: run["first_paint_ms"])
+    return {
+        "gui_first_paint_ms": round(runs[1]["first_paint_ms"], 1),
+        "gui_exit_ms": round(runs[1]["exit_ms"], 1),
+    }
+
+
+BENCHMARKS: Dict[str, Callable[[], Metrics]] = {
+    "engine": bench_engine,
+    "config": bench_config,
+    "i18n": bench_i18n,
+    "qt": bench_qt,
+    "startup": bench_startup,
+}
+
+
+def run(selected: Optional[list] = None, repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    skipped: Dict[str, str] = {}
+    for name, function in BENCHMARKS.items():
+        if selected and name not in selected:
+            continue
+        try:
+            runs = [function() for _ in range(max(1, repeat))]
+        except Exception as exc:
+            skipped[name] = str(exc) or type(exc).__name__
+            continue
+        results[name] = {
+            metric: round(statistics.median(run[metric] for run in runs), 3)
+            for metric in runs[0]
+        }
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> list:
+    regressions = []
+    for group, metrics in current["results"].items():
+        for metric, value in metrics.items():
+            reference = baseline.get("results", {}).get(group, {}).get(metric)
+            if not reference:
+                continue
+            ratio = value / reference
+            if ratio > 1 + tolerance and value - reference > _noise_floor(metric):
+                regressions.append(
+                    {
+                        "metric": f"{group}.{metric}",
+                        "baseline": reference,
+                        "current": value,
+                        "ratio": round(ratio, 2),
+                    }
+                )
+    return regressions
+
+
+def _noise_floor(metric: str) -> float:
+    for suffix, floor in NOISE_FLOOR.items():
+        if metric.endswith(suffix):
+            return floor
+    return 0.0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS))
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    current = run(args.only, args.repeat)
+    if args.output:
+        args.output.write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+        _common.emit("suite", current)
+        return 0
+    regressions = []
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(current, baseline, args.tolerance)
+    current["regressions"] = regressions
+    _common.emit("suite", current)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    os.chdir(Path(__file__).resolve().parent)
+    raise SystemExit(main())
@@ -1,4 +1,285 @@
-from pypomodoro.app import main
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+
+CLIENT_COMMANDS = ["start", "pause", "reset", "skip-break", "start-break", "status"]
+COMMANDS = CLIENT_COMMANDS + ["export"]
+EXPORT_STATES = ["work", "short_break", "long_break"]
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    # The command is taken off argv before parsing (see main), so that a
+    # positional argument cannot swallow Qt options such as "-platform xcb".
+    parser = argparse.ArgumentParser(
+        prog="pypomodoro",
+        usage="%(prog)s [COMMAND] [options]",
+        epilog=(
+            f"COMMAND is one of {', '.join(CLIENT_COMMANDS)} (sent to the running "
+            "instance) or export (write the session history)."
+        ),
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help=(
+            "run the timer in the terminal without loading Qt; COMMANDs reach it as they "
+            "reach the window, and it keeps running while paused"
+        ),
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="headless, or with COMMAND: print JSON objects",
+    )
+    parser.add_argument(
+        "--status-interval",
+        type=int,
+        default=0,
+        metavar="SECONDS",
+        help="headless: also print the remaining time every SECONDS",
+    )
+    parser.add_argument(
+        "--no-notify",
+        action="store_true",
+        help="headless: do not show desktop notifications",
+    )
+    parser.add_argument(
+        "--serve",
+        type=int,
+        nargs="?",
+        const=8765,
+        metavar="PORT",
+        help="headless: serve state and commands over HTTP/WebSocket (default port 8765)",
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="headless: address for --serve (default 127.0.0.1)",
+    )
+    parser.add_argument(
+        "--tray",
+        action="store_true",
+        help="start hidden, with the countdown shown in the system tray",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["csv", "jsonl", "columnar"],
+        default="csv",
+        help="export: output format (default csv)",
+    )
+    parser.add_argument(
+        "--from",
+        dest="date_from",
+        type=date.fromisoformat,
+        metavar="YYYY-MM-DD",
+        help="export: first day to include (local time)",
+    )
+    parser.add_argument(
+        "--to",
+        dest="date_to",
+        type=date.fromisoformat,
+        metavar="YYYY-MM-DD",
+        help="export: last day to include (local time)",
+    )
+    parser.add_argument(
+        "--state",
+        dest="states",
+        action="append",
+        choices=EXPORT_STATES,
+        help="export: only sessions in STATE; repeat for several",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        metavar="PATH",
+        help="export: write to PATH instead of standard output",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="PORT",
+        help="serve timer metrics in the Prometheus text format on PORT",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=Path,
+        metavar="PATH",
+        help="rewrite timer metrics in the Prometheus text format to PATH every 10 s",
+    )
+    parser.add_argument(
+        "--watchdog",
+        type=float,
+        nargs="?",
+        const=1.0,
+        metavar="SECONDS",
+        help="report the main thread's stack when the UI, or the headless event loop, "
+        "stalls for SECONDS (default 1)",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="PATH",
+        help="sample the main thread's stack and write collapsed stacks to PATH on exit",
+    )
+    parser.add_argument(
+        "--profile-rate",
+        type=float,
+        default=100.0,
+        metavar="HZ",
+        help="samples per second for --profile (default 100)",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        metavar="PATH",
+        help="append trace records to PATH (rotated by size)",
+    )
+    parser.add_argument(
+        "--trace-buffer",
+        type=int,
+        default=4096,
+        metavar="N",
+        help="number of trace records kept in memory",
+    )
+    parser.add_argument(
+        "--dump-trace-on-crash",
+        nargs="?",
+        const="-",
+        metavar="PATH",
+        help="write the in-memory trace to PATH (default stderr) on an unhandled exception",
+    )
+    return parser
+
+
+def _configure_tracing(args: argparse.Namespace) -> None:
+    if args.trace is None and args.dump_trace_on_crash is None:
+        return
+    from pypomodoro.core.trace import configure_tracing, install_crash_dump
+
+    configure_tracing(args.trace, capacity=max(1, args.trace_buffer))
+    if args.dump_trace_on_crash is not None:
+        dump_path = args.dump_trace_on_crash
+        install_crash_dump(None if dump_path == "-" else Path(dump_path))
+
+
+def _configure_metrics(args: argparse.Namespace) -> None:
+    if args.metrics_port is None and args.metrics_file is None:
+        return
+    from pypomodoro.core.metrics import get_metrics
+
+    get_metrics().enable(port=args.metrics_port, path=args.metrics_file)
+
+
+def _configure_diagnostics(args: argparse.Namespace) -> None:
+    if args.watchdog is None and args.profile is None:
+        return
+    from pypomodoro.core.watchdog import start_profiler, start_watchdog
+
+    if args.watchdog is not None:
+        start_watchdog(max(0.1, args.watchdog))
+    if args.profile is not None:
+        start_profiler(args.profile, rate=args.profile_rate)
+
+
+def _run_client(args: argparse.Namespace) -> int:
+    # Must stay light: no PySide6, no plyer, only the stdlib socket client.
+    from pypomodoro.core.ipc import send_command
+
+    reply = send_command(args.command.replace("-", "_"))
+    if reply is None:
+        print("pypomodoro: no running instance", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(reply, ensure_ascii=False))
+    elif reply.get("ok"):
+        print(reply.get("message", ""))
+    else:
+        print(f"pypomodoro: {reply.get('error')}", file=sys.stderr)
+    return 0 if reply.get("ok") else 1
+
+
+def _local_midnight(day: date) -> float:
+    return time.mktime(day.timetuple())
+
+
+def _run_export(args: argparse.Namespace) -> int:
+    from pypomodoro.core.export import export_history
+    from pypomodoro.core.history import SessionHistory
+    from pypomodoro.core.timer_engine import SessionState
+
+    start = None if args.date_from is None else _local_midnight(args.date_from)
+    end = None if args.date_to is None else _local_midnight(args.date_to + timedelta(days=1))
+    states = None if not args.states else [SessionState(value) for value in args.states]
+    binary = args.format == "columnar"
+    history = SessionHistory()
+    try:
+        if args.output is None:
+            stream = sys.stdout.buffer if binary else sys.stdout
+            export_history(history, stream, args.format, start, end, states)
+            stream.flush()
+            return 0
+        if binary:
+            handle = args.output.open("wb")
+        else:
+            handle = args.output.open("w", encoding="utf-8", newline="")
+        with handle:
+            rows = export_history(history, handle, args.format, start, end, states)
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); stop quietly.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except OSError as exc:
+        print(f"pypomodoro: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        history.close()
+    print(f"pypomodoro: exported {rows} sessions to {args.output}", file=sys.stderr)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # Unknown arguments are left for QApplication.
+    if argv is None:
+        argv = sys.argv[1:]
+    command = argv[0] if argv and argv[0] in COMMANDS else None
+    args, _ = _build_parser().parse_known_args(argv[1:] if command else argv)
+    args.command = command
+    _configure_tracing(args)
+    if args.command == "export":
+        return _run_export(args)
+    if args.command:
+        return _run_client(args)
+    if args.headless or args.serve is not None:
+        _configure_metrics(args)
+        _configure_diagnostics(args)
+        from pypomodoro.headless import main as headless_main
+
+        return headless_main(args)
+
+    from pypomodoro.core.ipc import send_command
+
+    # Single instance: a second launch raises the running window and exits
+    # before Qt is loaded. A headless instance has no window to raise.
+    reply = send_command("show")
+    if reply is not None:
+        if not reply.get("ok"):
+            print(f"pypomodoro: {reply.get('error', 'instance already running')}", file=sys.stderr)
+            return 1
+        return 0
+    _configure_metrics(args)
+    _configure_diagnostics(args)
+    from pypomodoro.app import main as gui_main
+
+    return gui_main(tray=args.tray)
 
 
 if __name__ == "__main__":
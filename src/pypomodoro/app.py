@@ -1,14 +1,19 @@
 from __future__ import annotations
 
-import json
+import os
 import sys
 import time
 from pathlib import Path
+from typing import Optional
 
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QIcon
 
-from pypomodoro.core.config import load_config
+from pypomodoro.core.config_store import ConfigStore
+from pypomodoro.core.ipc import InstanceRunning, InstanceServer, send_command
+from pypomodoro.core.metrics import get_metrics
+from pypomodoro.core.trace import trace
 from pypomodoro.ui.main_window import MainWindow
 
 
@@ -16,41 +21,51 @@ def _icon_path() -> Path:
     return Path(__file__).resolve().parent.parent / "tomato.ico"
 
 
-def _debug_log(message: str, data: dict, hypothesis_id: str) -> None:
-    payload = {
-        "sessionId": "debug-session",
-        "runId": "pre-fix",
-        "hypothesisId": hypothesis_id,
-        "location": "app.py",
-        "message": message,
-        "data": data,
-        "timestamp": int(time.time() * 1000),
-    }
-    log_path = Path("/Users/valente/Documents/projects/pomodoro/.cursor/debug.log")
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-    log_path.write_text("", encoding="utf-8") if False else None
-    with log_path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(payload) + "\n")
-
-
-def main() -> int:
+# Set by benchmarks/bench_cold_start.py: report the first paint and quit.
+STARTUP_PROBE_ENV = "PYPOMODORO_STARTUP_PROBE"
+
+
+def _report_first_paint(app: QApplication) -> None:
+    sys.stderr.write(f"pypomodoro: first-paint {time.time():.6f}\n")
+    sys.stderr.flush()
+    QTimer.singleShot(0, app.quit)
+
+
+def main(tray: bool = False) -> int:
+    # Claim the instance lock and socket before building anything, so that
+    # of two launches racing each other only one gets a window.
+    instance_server: Optional[InstanceServer] = InstanceServer()
+    try:
+        instance_server.bind()
+    except InstanceRunning as exc:
+        trace("instance_running", error=str(exc))
+        send_command("show")
+        return 0
+    except OSError as exc:
+        # The socket cannot be created; run without remote control rather
+        # than not at all.
+        trace("instance_server_unavailable", error=repr(exc))
+        instance_server = None
     app = QApplication(sys.argv)
     app.setApplicationName("PyPomodoro")
     icon_path = _icon_path()
     if icon_path.exists():
         icon = QIcon(str(icon_path))
-        # #region agent log
-        _debug_log(
-            "app_icon_load",
-            {"path": str(icon_path), "exists": icon_path.exists(), "icon_is_null": icon.isNull()},
-            "H1",
-        )
-        # #endregion
+        trace("app_icon_load", path=str(icon_path), icon_is_null=icon.isNull())
         app.setWindowIcon(icon)
-    config = load_config()
-    window = MainWindow(config, icon_path if icon_path.exists() else None)
+    store = ConfigStore()
+    window = MainWindow(
+        store.config, icon_path if icon_path.exists() else None, store=store, tray=tray
+    )
+    if os.environ.get(STARTUP_PROBE_ENV):
+        window.first_painted.connect(lambda: _report_first_paint(app))
+    if instance_server is not None:
+        instance_server.start(window.dispatch_command)
+        app.aboutToQuit.connect(instance_server.close)
+    app.aboutToQuit.connect(get_metrics().close)
     window.resize(520, 360)
-    window.show()
+    if window.tray is None or os.environ.get(STARTUP_PROBE_ENV):
+        window.show()
     return app.exec()
 
 
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import mmap
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from pypomodoro.core.config import data_dir
+from pypomodoro.core.history import STATE_CODES, STATES_BY_CODE
+from pypomodoro.core.timer_engine import SessionState, TimerEngine, TimerEvent
+from pypomodoro.core.trace import trace
+
+MAGIC = b"PYPOMCK1"
+# seq, state, is_running, cycle_count, remaining_seconds, planned_seconds,
+# wall_deadline, session_started_at, saved_at; followed by a CRC32 of it.
+SLOT = struct.Struct("<QBB2xIIIddd")
+CRC = struct.Struct("<I")
+SLOT_SIZE = 64
+FILE_SIZE = len(MAGIC) + 2 * SLOT_SIZE
+# A running checkpoint older than this is not resumed: replaying a day of
+# sessions that ran while the app was not there helps nobody. Paused
+# checkpoints do not age, since nothing ran while the app was closed.
+MAX_RESUME_AGE = 12 * 3600
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    seq: int
+    state: SessionState
+    is_running: bool
+    cycle_count: int
+    remaining_seconds: int
+    planned_seconds: int
+    # Wall-clock time the running session ends; 0 when paused.
+    wall_deadline: float
+    session_started_at: float
+    saved_at: float
+
+    def is_stale(self, now: float) -> bool:
+        return self.is_running and now - self.saved_at > MAX_RESUME_AGE
+
+    def apply(self, engine: TimerEngine, now: Optional[float] = None) -> None:
+        now = engine.wall_clock() if now is None else now
+        remaining: float = self.remaining_seconds
+        if self.is_running and self.wall_deadline:
+            remaining = self.wall_deadline - now
+        engine.restore(
+            state=self.state,
+            cycle_count=self.cycle_count,
+            remaining_seconds=remaining,
+            is_running=self.is_running,
+            planned_seconds=self.planned_seconds,
+            session_started_at=self.session_started_at or None,
+        )
+
+
+# The engine state in a fixed 136-byte file, memory-mapped so that saving is
+# a 64-byte in-place write. Two slots are written alternately, each with a
+# sequence number and a CRC, so a write torn by a crash leaves the previous
+# slot intact; load() returns the newest slot that checks out.
+class EngineCheckpoint:
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or data_dir() / "checkpoint.bin"
+        self._map: Optional[mmap.mmap] = None
+        self._seq = 0
+        self.writes = 0
+
+    def load(self) -> Optional[Checkpoint]:
+        self._open()
+        best: Optional[Checkpoint] = None
+        for slot in range(2):
+            checkpoint = self._read_slot(slot)
+            if checkpoint is not None and (best is None or checkpoint.seq > best.seq):
+                best = checkpoint
+        if best is not None:
+            self._seq = best.seq
+        return best
+
+    def save(self, engine: TimerEngine) -> None:
+        mapped = self._open()
+        self._seq += 1
+        now = engine.wall_clock()
+        wall_deadline = now + engine.time_remaining() if engine.is_running else 0.0
+        body = SLOT.pack(
+            self._seq,
+            STATE_CODES[engine.state],
+            engine.is_running,
+            engine.cycle_count,
+            max(0, engine.remaining_seconds),
+            max(0, engine.session_planned),
+            wall_deadline,
+            engine.session_started_at or 0.0,
+            now,
+        )
+        offset = len(MAGIC) + (self._seq % 2) * SLOT_SIZE
+        mapped[offset : offset + SLOT.size + CRC.size] = body + CRC.pack(zlib.crc32(body))
+        self.writes += 1
+
+    def restore(self, engine: TimerEngine) -> Optional[Checkpoint]:
+        # Loads the last checkpoint into engine unless it is missing,
+        # unreadable or stale; returns what was applied.
+        try:
+            checkpoint = self.load()
+        except (OSError, ValueError) as exc:
+            trace("checkpoint_load_failed", error=repr(exc))
+            return None
+        if checkpoint is None or checkpoint.is_stale(engine.wall_clock()):
+            return None
+        checkpoint.apply(engine)
+        trace(
+            "checkpoint_restored",
+            state=checkpoint.state.value,
+            cycle_count=checkpoint.cycle_count,
+            is_running=checkpoint.is_running,
+        )
+        return checkpoint
+
+    def subscriber(self, engine: TimerEngine):
+        # A bus callback that saves the engine after every published event.
+        def on_event(event: TimerEvent) -> None:
+            try:
+                self.save(engine)
+            except (OSError, ValueError) as exc:
+                trace("checkpoint_save_failed", error=repr(exc))
+
+        return on_event
+
+    def flush(self) -> None:
+        if self._map is not None:
+            self._map.flush()
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._map = None
+
+    def _open(self) -> mmap.mmap:
+        if self._map is not None:
+            return self._map
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a+b") as handle:
+            handle.seek(0)
+            if handle.read(len(MAGIC)) != MAGIC or self.path.stat().st_size != FILE_SIZE:
+                handle.truncate(0)
+                handle.write(MAGIC + bytes(2 * SLOT_SIZE))
+                handle.flush()
+            self._map = mmap.mmap(handle.fileno(), FILE_SIZE)
+        return self._map
+
+    def _read_slot(self, slot: int) -> Optional[Checkpoint]:
+        offset = len(MAGIC) + slot * SLOT_SIZE
+        raw = self._map[offset : offset + SLOT.size + CRC.size]
+        body, (crc,) = raw[: SLOT.size], CRC.unpack(raw[SLOT.size :])
+        if zlib.crc32(body) != crc:
+            return None
+        seq, code, running, cycles, remaining, planned, deadline, started, saved = SLOT.unpack(body)
+        if seq == 0 or code not in STATES_BY_CODE:
+            return None
+        return Checkpoint(
+            seq=seq,
+            state=STATES_BY_CODE[code],
+            is_running=bool(running),
+            cycle_count=cycles,
+            remaining_seconds=remaining,
+            planned_seconds=planned,
+            wall_deadline=deadline,
+            session_started_at=started,
+            saved_at=saved,
+        )
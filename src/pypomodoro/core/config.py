@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import json
+import os
+import tempfile
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from platformdirs import user_config_dir
+from platformdirs import user_config_dir, user_data_dir
+
+from pypomodoro.core.metrics import timed
+from pypomodoro.core.schedule import DEFAULT_SCHEDULE, parse_schedule
 
 
 APP_NAME = "PyPomodoro"
@@ -23,32 +28,66 @@ class AppConfig:
     sound_file: str = "wood.mp3"
     auto_start_break: bool = True
     auto_start_work: bool = True
+    tray_mode: bool = False
+    # Order of work sessions and breaks; see core/schedule.py for the syntax.
+    schedule: str = DEFAULT_SCHEDULE
 
 
 def _config_dir() -> Path:
     return Path(user_config_dir(APP_NAME, APP_AUTHOR))
 
 
+def data_dir() -> Path:
+    return Path(user_data_dir(APP_NAME, APP_AUTHOR))
+
+
 def config_path() -> Path:
     return _config_dir() / "config.json"
 
 
-def load_config() -> AppConfig:
-    path = config_path()
+def load_config(path: Optional[Path] = None) -> AppConfig:
+    path = path or config_path()
     if not path.exists():
         return AppConfig()
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-        return AppConfig(**_sanitize_config(data))
+        return parse_config(path.read_text(encoding="utf-8"))
     except Exception:
         return AppConfig()
 
 
-def save_config(config: AppConfig) -> None:
-    path = config_path()
+@timed("config_save_ms")
+def save_config(config: AppConfig, path: Optional[Path] = None) -> None:
+    atomic_write_text(path or config_path(), dump_config(config))
+
+
+def dump_config(config: AppConfig) -> str:
+    return json.dumps(asdict(config), indent=2)
+
+
+def parse_config(text: str) -> AppConfig:
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("config root must be an object")
+    return AppConfig(**_sanitize_config(data))
+
+
+# Write to a temporary file in the same directory, fsync it and rename it over
+# the target, so readers and crashes only ever see the old or the new file.
+def atomic_write_text(path: Path, text: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    payload = json.dumps(asdict(config), indent=2)
-    path.write_text(payload, encoding="utf-8")
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
 
 
 def _sanitize_config(data: Dict[str, Any]) -> Dict[str, Any]:
@@ -70,4 +109,8 @@ def _sanitize_config(data: Dict[str, Any]) -> Dict[str, Any]:
             sanitized[key] = str(value)
         else:
             sanitized[key] = value
+    try:
+        parse_schedule(sanitized["schedule"])
+    except ValueError:
+        sanitized["schedule"] = DEFAULT_SCHEDULE
     return sanitized
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from pypomodoro.core.config import (
+    AppConfig,
+    atomic_write_text,
+    config_path,
+    dump_config,
+    load_config,
+    parse_config,
+)
+from pypomodoro.core.metrics import timed
+from pypomodoro.core.trace import trace
+
+
+# Owns the parsed configuration. Changes update the in-memory copy at once and
+# are written behind on a background timer, so a burst of edits becomes a
+# single atomic write. reload() picks up edits made by other processes or by
+# hand and returns only the fields that changed.
+#
+# _write_lock is held from taking the payload until it is on disk, so two
+# flushes (the debounce timer and close(), say) write in order and an older
+# payload never lands over a newer one; reload() takes it too, so it never
+# mistakes the file a flush is still replacing for an outside edit.
+class ConfigStore:
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        config: Optional[AppConfig] = None,
+        debounce: float = 0.5,
+    ) -> None:
+        self.path = path or config_path()
+        self.debounce = debounce
+        self._config = config if config is not None else load_config(self.path)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._dirty = False
+        self._written: Optional[str] = None
+        self.writes = 0
+
+    @property
+    def config(self) -> AppConfig:
+        return self._config
+
+    def update(self, config: Optional[AppConfig] = None, **changes: Any) -> Dict[str, Any]:
+        with self._lock:
+            new_config = replace(config or self._config, **changes)
+            diff = _diff(self._config, new_config)
+            self._config = new_config
+            if diff:
+                self._dirty = True
+                self._schedule()
+        return diff
+
+    def flush(self) -> None:
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+                payload = dump_config(self._config)
+                self._written = payload
+            try:
+                self._write(payload)
+            except OSError as exc:
+                trace("config_write_failed", path=str(self.path), error=str(exc))
+
+    def reload(self) -> Dict[str, Any]:
+        with self._write_lock:
+            try:
+                text = self.path.read_text(encoding="utf-8")
+            except OSError:
+                return {}
+            with self._lock:
+                if text == self._written or self._dirty:
+                    # Our own write, or a local change still waiting to be
+                    # written which would overwrite the file anyway.
+                    return {}
+                try:
+                    new_config = parse_config(text)
+                except ValueError as exc:
+                    trace("config_reload_invalid", path=str(self.path), error=str(exc))
+                    return {}
+                diff = _diff(self._config, new_config)
+                self._config = new_config
+                self._written = text
+        if diff:
+            trace("config_reloaded", **diff)
+        return diff
+
+    def close(self) -> None:
+        self.flush()
+
+    @timed("config_save_ms")
+    def _write(self, payload: str) -> None:
+        atomic_write_text(self.path, payload)
+        self.writes += 1
+
+    def _schedule(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.debounce, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+
+def _diff(old: AppConfig, new: AppConfig) -> Dict[str, Any]:
+    old_values = asdict(old)
+    return {key: value for key, value in asdict(new).items() if old_values[key] != value}
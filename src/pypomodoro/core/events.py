@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, FrozenSet, Iterable, List, Optional
+
+from pypomodoro.core.timer_engine import TimerEvent, TimerEventType
+from pypomodoro.core.trace import trace
+
+SYNC = "sync"
+THREAD = "thread"
+ASYNC = "async"
+BATCH = "batch"
+
+# A sync subscriber that takes longer than this for one event is traced,
+# counted as slow and, unless it subscribed with offload_when_slow=False,
+# moved onto its own worker thread so it cannot keep stalling the publisher.
+DEFAULT_SLOW_THRESHOLD = 0.05
+
+
+@dataclass(eq=False)
+class Subscription:
+    callback: Callable[..., Any]
+    event_types: Optional[FrozenSet[TimerEventType]]
+    priority: int
+    mode: str
+    loop: Optional[asyncio.AbstractEventLoop] = None
+    batch_size: int = 32
+    batch_interval: float = 0.5
+    queue_size: int = 256
+    offload_when_slow: bool = True
+    delivered: int = 0
+    dropped: int = 0
+    errors: int = 0
+    slow: int = 0
+    worker: Optional["_Worker"] = field(default=None, repr=False)
+
+    def wants(self, event: TimerEvent) -> bool:
+        return self.event_types is None or event.event_type in self.event_types
+
+
+# Feeds one THREAD or BATCH subscription from a bounded queue. Events that do
+# not fit are dropped and counted rather than blocking the publisher.
+class _Worker:
+    def __init__(self, subscription: Subscription) -> None:
+        self.subscription = subscription
+        self.queue: "queue.Queue[Optional[TimerEvent]]" = queue.Queue(
+            maxsize=subscription.queue_size
+        )
+        self.thread = threading.Thread(
+            target=self._run, name="pypomodoro-event-subscriber", daemon=True
+        )
+        self.thread.start()
+
+    def offer(self, event: TimerEvent) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.subscription.dropped += 1
+
+    def stop(self, timeout: float = 1.0) -> None:
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self.thread.join(timeout)
+
+    def _run(self) -> None:
+        subscription = self.subscription
+        while True:
+            event = self.queue.get()
+            if event is None:
+                return
+            if subscription.mode != BATCH:
+                _invoke(subscription, event)
+                continue
+            batch = [event]
+            deadline = time.monotonic() + subscription.batch_interval
+            stopping = False
+            while len(batch) < subscription.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            _invoke(subscription, batch)
+            if stopping:
+                return
+
+
+def _invoke(subscription: Subscription, payload: Any) -> None:
+    try:
+        subscription.callback(payload)
+    except Exception as exc:
+        subscription.errors += 1
+        trace("event_subscriber_failed", callback=repr(subscription.callback), error=repr(exc))
+        return
+    subscription.delivered += 1
+
+
+# In-process publish/subscribe for TimerEvents. Subscribers run in priority
+# order (lower first, then subscription order) and may filter by event type:
+#   SYNC   called inline; exceptions are contained, and after a call that
+#          exceeds slow_threshold (traced and counted) the subscriber is
+#          moved to THREAD delivery. Subscribers that must stay on the
+#          publisher's thread (Qt widgets, reading the engine) pass
+#          offload_when_slow=False and are only traced and counted.
+#   THREAD called on a dedicated worker thread through a bounded queue
+#   BATCH  like THREAD, but receives lists of up to batch_size events
+#   ASYNC  a coroutine function scheduled on the given (or running) loop
+class EventBus:
+    def __init__(self, slow_threshold: float = DEFAULT_SLOW_THRESHOLD) -> None:
+        self.slow_threshold = slow_threshold
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+
+    def subscribe(
+        self,
+        callback: Callable[..., Any],
+        event_types: Optional[Iterable[TimerEventType]] = None,
+        priority: int = 0,
+        mode: Optional[str] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        batch_size: int = 32,
+        batch_interval: float = 0.5,
+        queue_size: int = 256,
+        offload_when_slow: bool = True,
+    ) -> Subscription:
+        if mode is None:
+            mode = ASYNC if asyncio.iscoroutinefunction(callback) else SYNC
+        if mode not in (SYNC, THREAD, ASYNC, BATCH):
+            raise ValueError(f"unknown subscriber mode {mode!r}")
+        if mode == ASYNC and loop is None:
+            loop = asyncio.get_running_loop()
+        subscription = Subscription(
+            callback=callback,
+            event_types=None if event_types is None else frozenset(event_types),
+            priority=priority,
+            mode=mode,
+            loop=loop,
+            batch_size=max(1, batch_size),
+            batch_interval=batch_interval,
+            queue_size=queue_size,
+            offload_when_slow=offload_when_slow,
+        )
+        if mode in (THREAD, BATCH):
+            subscription.worker = _Worker(subscription)
+        with self._lock:
+            # Copy-on-write so publish() can iterate without holding the lock.
+            subscriptions = self._subscriptions + [subscription]
+            subscriptions.sort(key=lambda item: item.priority)
+            self._subscriptions = subscriptions
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions = [item for item in self._subscriptions if item is not subscription]
+        if subscription.worker is not None:
+            subscription.worker.stop()
+            subscription.worker = None
+
+    def publish(self, event: TimerEvent) -> None:
+        for subscription in self._subscriptions:
+            if not subscription.wants(event):
+                continue
+            if subscription.worker is not None:
+                subscription.worker.offer(event)
+            elif subscription.mode == ASYNC:
+                self._schedule(subscription, event)
+            else:
+                self._call_sync(subscription, event)
+
+    def close(self) -> None:
+        for subscription in list(self._subscriptions):
+            self.unsubscribe(subscription)
+
+    def _call_sync(self, subscription: Subscription, event: TimerEvent) -> None:
+        started = time.perf_counter()
+        _invoke(subscription, event)
+        elapsed = time.perf_counter() - started
+        if elapsed > self.slow_threshold:
+            subscription.slow += 1
+            trace("event_subscriber_slow", callback=repr(subscription.callback), seconds=elapsed)
+            if not subscription.offload_when_slow or subscription.worker is not None:
+                return
+            subscription.mode = THREAD
+            subscription.worker = _Worker(subscription)
+
+    def _schedule(self, subscription: Subscription, event: TimerEvent) -> None:
+        loop = subscription.loop
+        if loop is None or loop.is_closed():
+            subscription.dropped += 1
+            return
+
+        def run() -> None:
+            task = loop.create_task(subscription.callback(event))
+            task.add_done_callback(lambda done: _finish_async(subscription, done))
+
+        loop.call_soon_threadsafe(run)
+
+
+def _finish_async(subscription: Subscription, task: "asyncio.Task[Any]") -> None:
+    if task.cancelled():
+        subscription.dropped += 1
+        return
+    error = task.exception()
+    if error is not None:
+        subscription.errors += 1
+        trace("event_subscriber_failed", callback=repr(subscription.callback), error=repr(error))
+        return
+    subscription.delivered += 1
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from typing import IO, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from pypomodoro.core.history import RECORD, STATE_CODES, SessionHistory
+from pypomodoro.core.timer_engine import SessionState
+
+FORMATS = ("csv", "jsonl", "columnar")
+
+# start and end are epoch seconds, state is the SessionState value.
+COLUMNS = ("start", "end", "state", "planned_seconds", "actual_seconds", "cycle_count")
+
+Row = Tuple[float, float, int, int, int, int]
+
+_STATE_NAMES = tuple(
+    state.value for state, _ in sorted(STATE_CODES.items(), key=lambda item: item[1])
+)
+# Offset of the state byte inside a packed record.
+_STATE_OFFSET = 16
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+# Columnar layout. After MAGIC come row groups: a GROUP header with the row
+# count, then each column as one little-endian array in COLUMN_TYPES order.
+# A footer lists (offset, rows) per group, followed by TAIL, so a reader can
+# seek straight to a group and skip the columns it does not need.
+MAGIC = b"PYPOMCL1"
+COLUMN_TYPES = (
+    ("start", "d"),
+    ("end", "d"),
+    ("state", "B"),
+    ("planned_seconds", "I"),
+    ("actual_seconds", "I"),
+    ("cycle_count", "I"),
+)
+GROUP = struct.Struct("<I")
+GROUP_ENTRY = struct.Struct("<QI")
+TAIL = struct.Struct("<IQ8s")
+DEFAULT_ROW_GROUP = 65536
+
+
+def iter_blocks(
+    history: SessionHistory,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    states: Optional[Iterable[SessionState]] = None,
+) -> Iterator[bytes]:
+    # Packed records matching the filters, a chunk at a time. The day index
+    # picks the chunks; inside a chunk the start times and the raw state
+    # bytes are compared without decoding any record.
+    codes = None if states is None else bytes(sorted({STATE_CODES[state] for state in states}))
+    if codes is not None and not codes:
+        return
+    if codes == bytes(range(len(STATE_CODES))):
+        codes = None
+    for block in history.blocks(start, end):
+        if start is not None or end is not None:
+            block = _filter_time(block, start, end)
+        if codes is not None and block:
+            block = _filter_states(block, codes)
+        if block:
+            yield block
+
+
+def iter_rows(
+    history: SessionHistory,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    states: Optional[Iterable[SessionState]] = None,
+) -> Iterator[Row]:
+    for block in iter_blocks(history, start, end, states):
+        yield from RECORD.iter_unpack(block)
+
+
+# Both text formats are formatted by hand: every value is a finite float,
+# an int or a fixed state name, so there is nothing for csv quoting or
+# json.dumps to escape, and skipping them is much faster.
+def write_csv(blocks: Iterable[bytes], stream: TextIO) -> int:
+    stream.write(",".join(COLUMNS) + "\n")
+    names = _STATE_NAMES
+    rows = 0
+    for block in blocks:
+        stream.write(
+            "".join(
+                f"{start!r},{end!r},{names[code]},{planned},{actual},{cycles}\n"
+                for start, end, code, planned, actual, cycles in RECORD.iter_unpack(block)
+            )
+        )
+        rows += len(block) // RECORD.size
+    return rows
+
+
+def write_jsonl(blocks: Iterable[bytes], stream: TextIO) -> int:
+    names = _STATE_NAMES
+    rows = 0
+    for block in blocks:
+        stream.write(
+            "".join(
+                f'{{"start": {start!r}, "end": {end!r}, "state": "{names[code]}", '
+                f'"planned_seconds": {planned}, "actual_seconds": {actual}, '
+                f'"cycle_count": {cycles}}}\n'
+                for start, end, code, planned, actual, cycles in RECORD.iter_unpack(block)
+            )
+        )
+        rows += len(block) // RECORD.size
+    return rows
+
+
+def write_columnar(
+    blocks: Iterable[bytes], stream: BinaryIO, row_group: int = DEFAULT_ROW_GROUP
+) -> int:
+    # Columns are sliced straight out of the packed records, so no record is
+    # unpacked; at most one row group is held in memory.
+    stream.write(MAGIC)
+    offset = len(MAGIC)
+    groups: List[Tuple[int, int]] = []
+    pending: List[bytes] = []
+    pending_rows = 0
+    rows = 0
+    for block in blocks:
+        pending.append(block)
+        pending_rows += len(block) // RECORD.size
+        if pending_rows >= row_group:
+            offset = _write_group(stream, b"".join(pending), offset, groups)
+            rows += pending_rows
+            pending, pending_rows = [], 0
+    if pending_rows:
+        offset = _write_group(stream, b"".join(pending), offset, groups)
+        rows += pending_rows
+    for entry in groups:
+        stream.write(GROUP_ENTRY.pack(*entry))
+    stream.write(TAIL.pack(len(groups), rows, MAGIC))
+    return rows
+
+
+def read_columnar(
+    stream: BinaryIO, columns: Optional[Sequence[str]] = None
+) -> Iterator[Dict[str, array]]:
+    # Yields each row group as {column: array}; columns not asked for are
+    # seeked over, not read. stream must be seekable.
+    wanted = set(columns or COLUMNS)
+    unknown = wanted - set(COLUMNS)
+    if unknown:
+        raise ValueError(f"unknown columns: {', '.join(sorted(unknown))}")
+    stream.seek(0)
+    if stream.read(len(MAGIC)) != MAGIC:
+        raise ValueError("not a pypomodoro columnar export")
+    stream.seek(-TAIL.size, 2)
+    count, _, magic = TAIL.unpack(stream.read(TAIL.size))
+    if magic != MAGIC:
+        raise ValueError("truncated columnar export")
+    stream.seek(-TAIL.size - count * GROUP_ENTRY.size, 2)
+    entries = [GROUP_ENTRY.unpack(stream.read(GROUP_ENTRY.size)) for _ in range(count)]
+    for group_offset, group_rows in entries:
+        stream.seek(group_offset + GROUP.size)
+        group: Dict[str, array] = {}
+        for name, typecode in COLUMN_TYPES:
+            column = array(typecode)
+            size = group_rows * column.itemsize
+            if name not in wanted:
+                stream.seek(size, 1)
+                continue
+            column.frombytes(stream.read(size))
+            if not _LITTLE_ENDIAN:
+                column.byteswap()
+            group[name] = column
+        yield group
+
+
+def export_history(
+    history: SessionHistory,
+    stream: IO,
+    format: str = "csv",
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    states: Optional[Iterable[SessionState]] = None,
+) -> int:
+    # Streams the matching sessions to stream (text for csv and jsonl,
+    # binary for columnar) and returns how many were written.
+    blocks = iter_blocks(history, start, end, states)
+    if format == "csv":
+        return write_csv(blocks, stream)
+    if format == "jsonl":
+        return write_jsonl(blocks, stream)
+    if format == "columnar":
+        return write_columnar(blocks, stream)
+    raise ValueError(f"unknown export format {format!r}")
+
+
+def _filter_time(block: bytes, start: Optional[float], end: Optional[float]) -> bytes:
+    starts = array("d")
+    starts.frombytes(block)
+    if not _LITTLE_ENDIAN:
+        starts.byteswap()
+    starts = starts[0::4]
+    low, high = min(starts), max(starts)
+    low_ok = start is None or low >= start
+    high_ok = end is None or high < end
+    if low_ok and high_ok:
+        return block
+    if (start is not None and high < start) or (end is not None and low >= end):
+        return b""
+    size = RECORD.size
+    return b"".join(
+        block[index * size:(index + 1) * size]
+        for index, value in enumerate(starts)
+        if (start is None or value >= start) and (end is None or value < end)
+    )
+
+
+def _filter_states(block: bytes, codes: bytes) -> bytes:
+    states = block[_STATE_OFFSET::RECORD.size]
+    others = states.translate(None, codes)
+    if not others:
+        return block
+    if len(others) == len(states):
+        return b""
+    size = RECORD.size
+    return b"".join(
+        block[index * size:(index + 1) * size]
+        for index, code in enumerate(states)
+        if code in codes
+    )
+
+
+def _write_group(
+    stream: BinaryIO, block: bytes, offset: int, groups: List[Tuple[int, int]]
+) -> int:
+    rows = len(block) // RECORD.size
+    doubles = array("d")
+    doubles.frombytes(block)
+    words = array("I")
+    words.frombytes(block)
+    if not _LITTLE_ENDIAN:
+        doubles.byteswap()
+        words.byteswap()
+    columns = [
+        doubles[0::4],
+        doubles[1::4],
+        array("B", block[_STATE_OFFSET::RECORD.size]),
+        words[5::8],
+        words[6::8],
+        words[7::8],
+    ]
+    stream.write(GROUP.pack(rows))
+    written = GROUP.size
+    for column in columns:
+        if not _LITTLE_ENDIAN:
+            column.byteswap()
+        data = column.tobytes()
+        stream.write(data)
+        written += len(data)
+    groups.append((offset, rows))
+    return offset + written
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import struct
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+from pypomodoro.core.config import data_dir
+from pypomodoro.core.timer_engine import SessionState, TimerEvent
+
+# Each session is one fixed-size little-endian record:
+# start, end (epoch seconds), state code, planned, actual, cycle count.
+RECORD = struct.Struct("<ddB3xIII")
+
+STATE_CODES: Dict[SessionState, int] = {
+    SessionState.WORK: 0,
+    SessionState.SHORT_BREAK: 1,
+    SessionState.LONG_BREAK: 2,
+}
+STATES_BY_CODE: Dict[int, SessionState] = {code: state for state, code in STATE_CODES.items()}
+
+_SESSIONS_FILE = "sessions.bin"
+_DAY_INDEX_FILE = "days.idx"
+# Day index entry: local date ordinal, number of the first record that day.
+_DAY_ENTRY = struct.Struct("<iI")
+_STATE_ENTRY = struct.Struct("<I")
+_READ_CHUNK_RECORDS = 4096
+
+
+@dataclass(frozen=True)
+class SessionRecord:
+    start: float
+    end: float
+    state: SessionState
+    planned_seconds: int
+    actual_seconds: int
+    cycle_count: int
+
+    @classmethod
+    def from_event(cls, event: TimerEvent) -> "SessionRecord":
+        return cls(
+            start=event.started_at,
+            end=event.ended_at,
+            state=event.from_state,
+            planned_seconds=event.planned_seconds,
+            actual_seconds=event.actual_seconds,
+            cycle_count=event.cycle_count,
+        )
+
+    def pack(self) -> bytes:
+        return RECORD.pack(
+            self.start,
+            self.end,
+            STATE_CODES[self.state],
+            max(0, self.planned_seconds),
+            max(0, self.actual_seconds),
+            max(0, self.cycle_count),
+        )
+
+    @classmethod
+    def unpack(cls, fields: Tuple[float, float, int, int, int, int]) -> "SessionRecord":
+        start, end, code, planned, actual, cycles = fields
+        return cls(start, end, STATES_BY_CODE[code], planned, actual, cycles)
+
+
+def history_dir() -> Path:
+    return data_dir() / "history"
+
+
+def day_ordinal(timestamp: float) -> int:
+    return date.fromtimestamp(timestamp).toordinal()
+
+
+# Append-only session log. Records are written in completion order, so the
+# day index only needs an entry when the local day changes, and each state
+# index is the list of record numbers in that state. Appends are O(1);
+# range queries bisect the day index and read just the matching slice. If
+# the clock was ever set back across midnight the index is out of order;
+# queries then read the span of every run of records on a matching day.
+class SessionHistory:
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        self.directory = directory or history_dir()
+        self._sessions: Optional[BinaryIO] = None
+        self._day_index: Optional[BinaryIO] = None
+        self._state_indexes: Dict[SessionState, BinaryIO] = {}
+        self._count = 0
+        self._days = array("i")
+        self._day_starts = array("I")
+        self._days_sorted = True
+
+    def __len__(self) -> int:
+        self._open()
+        return self._count
+
+    def append(self, record: SessionRecord) -> None:
+        self._open()
+        number = self._count
+        self._sessions.write(record.pack())
+        self._sessions.flush()
+        day = day_ordinal(record.start)
+        if not self._days or day != self._days[-1]:
+            if self._days and day < self._days[-1]:
+                self._days_sorted = False
+            self._days.append(day)
+            self._day_starts.append(number)
+            self._day_index.write(_DAY_ENTRY.pack(day, number))
+            self._day_index.flush()
+        state_index = self._state_indexes[record.state]
+        state_index.write(_STATE_ENTRY.pack(number))
+        state_index.flush()
+        self._count += 1
+
+    def append_event(self, event: TimerEvent) -> None:
+        self.append(SessionRecord.from_event(event))
+
+    def records(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        state: Optional[SessionState] = None,
+    ) -> Iterator[SessionRecord]:
+        for fields in self._scan(start, end, state):
+            yield SessionRecord.unpack(fields)
+
+    def blocks(self, start: Optional[float] = None, end: Optional[float] = None) -> Iterator[bytes]:
+        # Packed records in chunks, narrowed to whole days by the day index;
+        # callers filter within the first and last day themselves.
+        self._open()
+        first, last = self._record_range(start, end)
+        if first >= last:
+            return
+        with (self.directory / _SESSIONS_FILE).open("rb") as handle:
+            yield from self._read_blocks(handle, first, last)
+
+    def total_seconds(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        state: SessionState = SessionState.WORK,
+    ) -> int:
+        return sum(fields[4] for fields in self._scan(start, end, state))
+
+    def focus_seconds(self, start: Optional[float] = None, end: Optional[float] = None) -> int:
+        return self.total_seconds(start, end, SessionState.WORK)
+
+    def record_numbers(self, state: SessionState) -> array:
+        self._open()
+        numbers = array("I")
+        numbers.frombytes(self._read_file(self._state_path(state)))
+        return numbers
+
+    def close(self) -> None:
+        handles = [self._sessions, self._day_index, *self._state_indexes.values()]
+        for handle in handles:
+            if handle is not None:
+                handle.close()
+        self._sessions = None
+        self._day_index = None
+        self._state_indexes = {}
+
+    def rebuild_indexes(self) -> None:
+        self.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        days = array("i")
+        day_starts = array("I")
+        by_state: Dict[SessionState, array] = {state: array("I") for state in STATE_CODES}
+        data = self._read_file(self.directory / _SESSIONS_FILE)
+        count = len(data) // RECORD.size
+        for number, fields in enumerate(RECORD.iter_unpack(data[: count * RECORD.size])):
+            day = day_ordinal(fields[0])
+            if not days or day != days[-1]:
+                days.append(day)
+                day_starts.append(number)
+            by_state[STATES_BY_CODE[fields[2]]].append(number)
+        with (self.directory / _DAY_INDEX_FILE).open("wb") as handle:
+            for day, first in zip(days, day_starts):
+                handle.write(_DAY_ENTRY.pack(day, first))
+        for state, numbers in by_state.items():
+            self._state_path(state).write_bytes(numbers.tobytes())
+
+    def _scan(
+        self,
+        start: Optional[float],
+        end: Optional[float],
+        state: Optional[SessionState],
+    ) -> Iterator[Tuple[float, float, int, int, int, int]]:
+        self._open()
+        first, last = self._record_range(start, end)
+        if first >= last:
+            return
+        code = None if state is None else STATE_CODES[state]
+        with (self.directory / _SESSIONS_FILE).open("rb") as handle:
+            if code is not None and start is None and end is None:
+                numbers = self.record_numbers(state)
+                # Seeking per record only beats a sequential scan for rare states.
+                if len(numbers) * 8 < self._count:
+                    yield from self._read_numbers(handle, numbers)
+                    return
+            for block in self._read_blocks(handle, first, last):
+                for fields in RECORD.iter_unpack(block):
+                    if code is not None and fields[2] != code:
+                        continue
+                    if start is not None and fields[0] < start:
+                        continue
+                    if end is not None and fields[0] >= end:
+                        continue
+                    yield fields
+
+    def _read_blocks(self, handle: BinaryIO, first: int, last: int) -> Iterator[bytes]:
+        handle.seek(first * RECORD.size)
+        position = first
+        while position < last:
+            count = min(_READ_CHUNK_RECORDS, last - position)
+            block = handle.read(count * RECORD.size)
+            if len(block) < count * RECORD.size:
+                return
+            yield block
+            position += count
+
+    def _read_numbers(
+        self, handle: BinaryIO, numbers: array
+    ) -> Iterator[Tuple[float, float, int, int, int, int]]:
+        for number in numbers:
+            if number >= self._count:
+                break
+            handle.seek(number * RECORD.size)
+            yield RECORD.unpack(handle.read(RECORD.size))
+
+    def _record_range(self, start: Optional[float], end: Optional[float]) -> Tuple[int, int]:
+        first = 0
+        last = self._count
+        if not self._days_sorted and (start is not None or end is not None):
+            return self._unsorted_range(start, end)
+        if start is not None:
+            position = bisect_left(self._days, day_ordinal(start))
+            if position >= len(self._days):
+                return last, last
+            first = self._day_starts[position]
+        if end is not None:
+            position = bisect_left(self._days, day_ordinal(end) + 1)
+            if position < len(self._days):
+                last = self._day_starts[position]
+        return first, last
+
+    def _unsorted_range(self, start: Optional[float], end: Optional[float]) -> Tuple[int, int]:
+        low = None if start is None else day_ordinal(start)
+        high = None if end is None else day_ordinal(end)
+        first, last = self._count, 0
+        runs = len(self._days)
+        for position, day in enumerate(self._days):
+            if (low is None or day >= low) and (high is None or day <= high):
+                first = min(first, self._day_starts[position])
+                following = position + 1
+                last = max(last, self._day_starts[following] if following < runs else self._count)
+        return (first, last) if first < last else (self._count, self._count)
+
+    def _open(self) -> None:
+        if self._sessions is not None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        sessions_path = self.directory / _SESSIONS_FILE
+        size = sessions_path.stat().st_size if sessions_path.exists() else 0
+        self._count = size // RECORD.size
+        if size % RECORD.size:
+            # Drop a record torn by a crash mid-write.
+            with sessions_path.open("r+b") as handle:
+                handle.truncate(self._count * RECORD.size)
+        if not self._load_indexes():
+            self.rebuild_indexes()
+            self._load_indexes()
+        self._sessions = sessions_path.open("ab")
+        self._day_index = (self.directory / _DAY_INDEX_FILE).open("ab")
+        self._state_indexes = {
+            state: self._state_path(state).open("ab") for state in STATE_CODES
+        }
+
+    def _load_indexes(self) -> bool:
+        data = self._read_file(self.directory / _DAY_INDEX_FILE)
+        days = array("i")
+        day_starts = array("I")
+        for day, first in _DAY_ENTRY.iter_unpack(data[: len(data) - len(data) % _DAY_ENTRY.size]):
+            days.append(day)
+            day_starts.append(first)
+        self._days = days
+        self._day_starts = day_starts
+        self._days_sorted = all(days[index] < days[index + 1] for index in range(len(days) - 1))
+        sizes = [
+            self._state_path(state).stat().st_size
+            for state in STATE_CODES
+            if self._state_path(state).exists()
+        ]
+        if any(size % _STATE_ENTRY.size for size in sizes):
+            return False
+        if sum(sizes) // _STATE_ENTRY.size != self._count:
+            return False
+        if not self._count:
+            return not days
+        if not day_starts or day_starts[-1] >= self._count:
+            return False
+        # Every day change has an entry, so the last one is the last record's day.
+        return day_ordinal(self._last_record_start()) == days[-1]
+
+    def _last_record_start(self) -> float:
+        with (self.directory / _SESSIONS_FILE).open("rb") as handle:
+            handle.seek((self._count - 1) * RECORD.size)
+            return RECORD.unpack(handle.read(RECORD.size))[0]
+
+    def _state_path(self, state: SessionState) -> Path:
+        return self.directory / f"state_{state.value}.idx"
+
+    @staticmethod
+    def _read_file(path: Path) -> bytes:
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            return b""
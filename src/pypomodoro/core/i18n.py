@@ -1,83 +1,177 @@
 from __future__ import annotations
 
-from typing import Dict
-
-
-_STRINGS: Dict[str, Dict[str, str]] = {
-    "pt-BR": {
-        "app_title": "PyPomodoro",
-        "settings_title": "Configurações",
-        "work_label": "Trabalho (min)",
-        "short_break_label": "Pausa curta (min)",
-        "long_break_label": "Pausa longa (min)",
-        "theme_label": "Tema",
-        "sound_enabled_label": "Som ativado",
-        "sound_label": "Som",
-        "sound_placeholder": "Arquivo de som",
-        "select_sound": "Selecionar",
-        "auto_start_break": "Auto iniciar pausas",
-        "auto_start_work": "Auto iniciar trabalho",
-        "save": "Salvar",
-        "cancel": "Cancelar",
-        "state_focus": "Foco",
-        "state_short_break": "Pausa curta",
-        "state_long_break": "Pausa longa",
-        "cycles_completed": "Ciclos completos: {count}",
-        "start": "Iniciar",
-        "pause": "Pausar",
-        "reset": "Resetar",
-        "skip_break": "Pular pausa",
-        "start_break": "Iniciar pausa",
-        "settings": "Configurações",
-        "notification_break_over": "Pausa finalizada. Hora de focar.",
-        "notification_short_break": "Ciclo completo. Pausa curta.",
-        "notification_long_break": "Ciclo completo. Pausa longa.",
-        "notification_transition": "Transição de ciclo.",
-        "audio_filter": "Arquivos de Áudio (*.mp3)",
-        "all_files": "Todos os arquivos (*)",
-        "language_label": "Idioma",
-        "language_pt": "Portugues (Brasil)",
-        "language_en": "Inglês",
-    },
-    "en": {
-        "app_title": "PyPomodoro",
-        "settings_title": "Settings",
-        "work_label": "Work (minutes)",
-        "short_break_label": "Short break (minutes)",
-        "long_break_label": "Long break (minutes)",
-        "theme_label": "Theme",
-        "sound_enabled_label": "Sound enabled",
-        "sound_label": "Sound",
-        "sound_placeholder": "Sound file",
-        "select_sound": "Browse",
-        "auto_start_break": "Auto start breaks",
-        "auto_start_work": "Auto start work",
-        "save": "Save",
-        "cancel": "Cancel",
-        "state_focus": "Focus",
-        "state_short_break": "Short break",
-        "state_long_break": "Long break",
-        "cycles_completed": "Completed cycles: {count}",
-        "start": "Start",
-        "pause": "Pause",
-        "reset": "Reset",
-        "skip_break": "Skip break",
-        "start_break": "Start break",
-        "settings": "Settings",
-        "notification_break_over": "Break finished. Time to focus.",
-        "notification_short_break": "Cycle complete. Short break.",
-        "notification_long_break": "Cycle complete. Long break.",
-        "notification_transition": "Cycle transition.",
-        "audio_filter": "Audio Files (*.mp3)",
-        "all_files": "All files (*)",
-        "language_label": "Language",
-        "language_pt": "Portuguese (Brazil)",
-        "language_en": "English",
-    },
+import json
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pypomodoro.core.timer_engine import SessionState, TimerEvent
+
+
+DEFAULT_LANGUAGE = "pt-BR"
+ROOT_LANGUAGE = "en"
+
+
+def locales_dir() -> Path:
+    base_path = getattr(sys, "_MEIPASS", None)
+    if base_path:
+        return Path(base_path) / "locales"
+    return Path(__file__).resolve().parent / "locales"
+
+
+_PLURAL_RULES: Dict[str, Callable[[int], str]] = {
+    "one": lambda n: "one" if n == 1 else "other",
+    "zero_one": lambda n: "one" if n in (0, 1) else "other",
+    "east_slavic": lambda n: (
+        "one"
+        if n % 10 == 1 and n % 100 != 11
+        else "few"
+        if 2 <= n % 10 <= 4 and not 12 <= n % 100 <= 14
+        else "many"
+    ),
+    "polish": lambda n: (
+        "one"
+        if n == 1
+        else "few"
+        if 2 <= n % 10 <= 4 and not 12 <= n % 100 <= 14
+        else "many"
+    ),
+    "none": lambda n: "other",
 }
 
 
-def get_strings(language: str) -> Dict[str, str]:
-    if language not in _STRINGS:
-        return _STRINGS["pt-BR"]
-    return _STRINGS[language]
+# The strings table for one language, with everything missing filled in from
+# its fallback chain. Plain keys read like a dict; plural keys map to the
+# "other" form there and are selected by count through format().
+class Strings(dict):
+    def __init__(
+        self,
+        language: str,
+        strings: Dict[str, str],
+        plurals: Dict[str, Dict[str, str]],
+        plural_rule: str,
+    ) -> None:
+        super().__init__(strings)
+        self.language = language
+        self.plurals = plurals
+        self.plural_form = _PLURAL_RULES.get(plural_rule, _PLURAL_RULES["one"])
+
+    def format(self, key: str, **values: Any) -> str:
+        template = self[key]
+        forms = self.plurals.get(key)
+        if forms and "count" in values:
+            category = self.plural_form(int(values["count"]))
+            template = forms.get(category) or forms.get("other") or template
+        try:
+            return _render(template, tuple(sorted(values.items())))
+        except TypeError:
+            return template.format_map(values)
+
+
+_CATALOGS: Dict[str, Optional[Dict[str, Any]]] = {}
+_STRINGS: Dict[str, Strings] = {}
+
+
+def available_languages() -> Dict[str, str]:
+    # Language code -> native name, read from the index so that listing the
+    # choices does not load every catalog.
+    directory = locales_dir()
+    try:
+        names = json.loads((directory / "index.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        names = {}
+    codes = sorted(path.stem for path in directory.glob("*.json") if path.stem != "index")
+    return {code: names.get(code, code) for code in codes}
+
+
+def get_strings(language: str) -> Strings:
+    cached = _STRINGS.get(language)
+    if cached is not None:
+        return cached
+    chain = fallback_chain(language)
+    if not chain and language != DEFAULT_LANGUAGE:
+        strings = get_strings(DEFAULT_LANGUAGE)
+        _STRINGS[language] = strings
+        return strings
+    chain = chain or fallback_chain(ROOT_LANGUAGE)
+    merged: Dict[str, str] = {}
+    plurals: Dict[str, Dict[str, str]] = {}
+    for code in reversed(chain):
+        catalog = _load_catalog(code) or {}
+        for key, value in catalog.get("strings", {}).items():
+            if isinstance(value, dict):
+                plurals[key] = value
+                merged[key] = value.get("other", "")
+            else:
+                plurals.pop(key, None)
+                merged[key] = str(value)
+    head = _load_catalog(chain[0]) if chain else None
+    head = head or {}
+    strings = Strings(chain[0] if chain else language, merged, plurals, head.get("plural", "one"))
+    _STRINGS[language] = strings
+    return strings
+
+
+def fallback_chain(language: str) -> List[str]:
+    # pt-PT -> pt-BR -> en: each catalog may name its own fallback, otherwise
+    # a regional variant falls back to its base language when one exists,
+    # and every chain ends at the root language.
+    chain: List[str] = []
+    code: Optional[str] = language
+    while code and code not in chain:
+        catalog = _load_catalog(code)
+        if catalog is None:
+            base = code.split("-")[0]
+            code = base if base != code else None
+            continue
+        chain.append(code)
+        code = catalog.get("fallback")
+        if code is None and "-" in chain[-1]:
+            code = chain[-1].split("-")[0]
+    if chain and ROOT_LANGUAGE not in chain and _load_catalog(ROOT_LANGUAGE) is not None:
+        chain.append(ROOT_LANGUAGE)
+    return chain
+
+
+def _load_catalog(code: str) -> Optional[Dict[str, Any]]:
+    if code in _CATALOGS:
+        return _CATALOGS[code]
+    path = locales_dir() / f"{code}.json"
+    catalog: Optional[Dict[str, Any]] = None
+    if code != "index" and path.exists():
+        try:
+            catalog = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            catalog = None
+    _CATALOGS[code] = catalog
+    return catalog
+
+
+@lru_cache(maxsize=512)
+def _render(template: str, values: Tuple[Tuple[str, Any], ...]) -> str:
+    return template.format_map(dict(values))
+
+
+def state_text(strings: Dict[str, str], state: SessionState) -> str:
+    if state == SessionState.WORK:
+        return strings["state_focus"]
+    if state == SessionState.SHORT_BREAK:
+        return strings["state_short_break"]
+    return strings["state_long_break"]
+
+
+def transition_message(strings: Dict[str, str], event: TimerEvent) -> str:
+    if event.to_state == SessionState.WORK:
+        return strings["notification_break_over"]
+    if event.to_state == SessionState.SHORT_BREAK:
+        return strings["notification_short_break"]
+    if event.to_state == SessionState.LONG_BREAK:
+        return strings["notification_long_break"]
+    return strings["notification_transition"]
+
+
+def format_time(total_seconds: int) -> str:
+    minutes = max(0, total_seconds) // 60
+    seconds = max(0, total_seconds) % 60
+    return f"{minutes:02d}:{seconds:02d}"
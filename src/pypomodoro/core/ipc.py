@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+import threading
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Optional, Tuple, Union
+
+# The client side is imported by every `pypomodoro <command>` run, so config
+# (dataclasses, platformdirs) and trace are only imported where needed.
+
+COMMANDS = ("start", "pause", "reset", "skip_break", "start_break", "status", "show")
+
+_MAX_REQUEST_BYTES = 4096
+# How long the server waits for a client's request line, how long it waits
+# for the main thread to run the command, and how long a client waits for
+# the reply. Every connection has its own thread, so the client only has to
+# outlast one request: a busy instance still answers with an error instead
+# of a timeout.
+READ_TIMEOUT = 1.0
+DISPATCH_TIMEOUT = 2.0
+CLIENT_TIMEOUT = READ_TIMEOUT + DISPATCH_TIMEOUT + 2.0
+# Connections served at once; more are answered with an error right away.
+MAX_CONNECTIONS = 8
+
+Address = Union[str, Tuple[str, int]]
+
+
+class InstanceRunning(RuntimeError):
+    pass
+
+
+def _use_unix_socket() -> bool:
+    return hasattr(socket, "AF_UNIX") and sys.platform != "win32"
+
+
+def socket_path() -> Path:
+    # Unix socket paths are limited to about 100 bytes, so prefer the short
+    # per-user runtime directory over the data directory.
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime and Path(runtime).is_dir():
+        return Path(runtime) / "pypomodoro.sock"
+    from pypomodoro.core.config import data_dir
+
+    return data_dir() / "instance.sock"
+
+
+def port_path() -> Path:
+    # Where a TCP fallback server records the port it is listening on.
+    from pypomodoro.core.config import data_dir
+
+    return data_dir() / "instance.port"
+
+
+def lock_path() -> Path:
+    # Held by the running server; whoever holds it owns the socket path.
+    return (socket_path() if _use_unix_socket() else port_path()).with_suffix(".lock")
+
+
+def _lock_instance(path: Path) -> IO[bytes]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle = path.open("a+b")
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        raise InstanceRunning(str(path)) from None
+    return handle
+
+
+def _client_address() -> Optional[Address]:
+    if _use_unix_socket():
+        path = socket_path()
+        return str(path) if path.exists() else None
+    try:
+        return ("127.0.0.1", int(port_path().read_text(encoding="ascii").strip()))
+    except (OSError, ValueError):
+        return None
+
+
+def _connect(address: Address, timeout: float) -> socket.socket:
+    family = socket.AF_INET if isinstance(address, tuple) else socket.AF_UNIX
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(address)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def send_command(command: str, timeout: float = CLIENT_TIMEOUT) -> Optional[Dict[str, Any]]:
+    # Returns the running instance's reply, or None when there is none. An
+    # instance that accepts the connection but fails to answer properly
+    # yields an error reply rather than an exception.
+    address = _client_address()
+    if address is None:
+        return None
+    try:
+        sock = _connect(address, timeout)
+    except OSError:
+        return None
+    try:
+        with sock:
+            try:
+                sock.sendall(json.dumps({"command": command}).encode("utf-8") + b"\n")
+            except OSError:
+                # A server at its connection limit answers and closes
+                # without reading the request; its reply is still there.
+                pass
+            line = _read_line(sock)
+        if not line:
+            return {"ok": False, "error": "the running instance closed the connection"}
+        reply = json.loads(line)
+    except socket.timeout:
+        return {"ok": False, "error": "the running instance did not answer"}
+    except (OSError, ValueError) as exc:
+        return {"ok": False, "error": f"bad reply from the running instance: {exc}"}
+    if not isinstance(reply, dict):
+        return {"ok": False, "error": "bad reply from the running instance"}
+    return reply
+
+
+def _read_line(sock: socket.socket) -> bytes:
+    data = b""
+    while b"\n" not in data and len(data) < _MAX_REQUEST_BYTES:
+        chunk = sock.recv(1024)
+        if not chunk:
+            break
+        data += chunk
+    return data.split(b"\n", 1)[0]
+
+
+# Accepts one JSON line per connection ({"command": "pause"}) on a Unix
+# socket, or on a localhost TCP port where those are unavailable, and replies
+# with one JSON line. The accept loop runs on a background thread and hands
+# each connection to a thread of its own, so a client that is slow to send
+# its request cannot hold up the next one; handler is called there, possibly
+# from several threads at once, and must hand the command over to the thread
+# that owns the timer.
+#
+# bind() takes an exclusive lock before touching the socket path, so of two
+# launches racing each other exactly one binds and the other gets
+# InstanceRunning. Binding can happen before the handler exists; clients
+# then wait in the listen backlog until start().
+class InstanceServer:
+    def __init__(self, handler: Optional[Callable[[str], Dict[str, Any]]] = None) -> None:
+        from pypomodoro.core.trace import trace
+
+        self._trace = trace
+        self.handler = handler
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._path: Optional[Path] = None
+        self._lock: Optional[IO[bytes]] = None
+        self._slots = threading.BoundedSemaphore(MAX_CONNECTIONS)
+        self._closed = False
+
+    def bind(self) -> None:
+        if self._sock is not None:
+            return
+        self._lock = _lock_instance(lock_path())
+        try:
+            if _use_unix_socket():
+                self._sock = self._bind_unix(socket_path())
+            else:
+                self._sock = self._bind_tcp()
+            self._sock.listen(8)
+        except BaseException:
+            self._lock.close()
+            self._lock = None
+            raise
+
+    def start(self, handler: Optional[Callable[[str], Dict[str, Any]]] = None) -> None:
+        if handler is not None:
+            self.handler = handler
+        self.bind()
+        self._thread = threading.Thread(
+            target=self._serve, name="pypomodoro-ipc", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        self._closed = True
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+        if self._path is not None:
+            try:
+                self._path.unlink()
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        if self._lock is not None:
+            self._lock.close()
+            self._lock = None
+
+    def _bind_unix(self, path: Path) -> socket.socket:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            # We hold the lock, so this was left behind by an instance that
+            # did not shut down cleanly.
+            path.unlink()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(str(path))
+        os.chmod(path, 0o600)
+        self._path = path
+        return sock
+
+    def _bind_tcp(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        path = port_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(str(sock.getsockname()[1]), encoding="ascii")
+        self._path = path
+        return sock
+
+    def _serve(self) -> None:
+        while not self._closed:
+            try:
+                connection, _ = self._sock.accept()
+            except OSError:
+                return
+            if not self._slots.acquire(blocking=False):
+                with connection:
+                    self._send(connection, {"ok": False, "error": "too many connections"})
+                continue
+            threading.Thread(
+                target=self._handle, args=(connection,), name="pypomodoro-ipc-conn", daemon=True
+            ).start()
+
+    def _handle(self, connection: socket.socket) -> None:
+        try:
+            with connection:
+                connection.settimeout(READ_TIMEOUT)
+                try:
+                    line = _read_line(connection)
+                except OSError as exc:
+                    self._trace("ipc_connection_failed", error=str(exc))
+                    return
+                self._send(connection, self._reply(line))
+        finally:
+            self._slots.release()
+
+    def _send(self, connection: socket.socket, reply: Dict[str, Any]) -> None:
+        try:
+            connection.settimeout(READ_TIMEOUT)
+            connection.sendall(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+        except OSError as exc:
+            self._trace("ipc_connection_failed", error=str(exc))
+
+    def _reply(self, line: bytes) -> Dict[str, Any]:
+        try:
+            command = json.loads(line)["command"]
+        except (ValueError, KeyError, TypeError):
+            return {"ok": False, "error": "bad request"}
+        if command not in COMMANDS:
+            return {"ok": False, "error": f"unknown command: {command}"}
+        self._trace("ipc_command", command=command)
+        try:
+            return {"ok": True, **self.handler(command)}
+        except Exception as exc:
+            return {"ok": False, "error": str(exc) or type(exc).__name__}
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar
+
+# Upper bucket bounds in milliseconds, shared by every histogram.
+# The buckets around 1000 ms resolve the jitter of one-second ticks.
+DEFAULT_BUCKETS = (
+    0.1, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500,
+    1000, 1005, 1010, 1025, 1050, 1100, 2500, 5000,
+)
+
+HISTOGRAMS = {
+    "tick_interval_ms": "Time between consecutive timer ticks",
+    "tick_lateness_ms": "How late a tick fired relative to when it was scheduled",
+    "event_loop_lag_ms": "Delay of a periodic probe timer in the Qt event loop",
+    "update_display_ms": "Time spent in MainWindow._update_display",
+    "notification_send_ms": "Duration of one send_notification call",
+    "sound_play_ms": "Time for SoundPlayer.play to return",
+    "config_save_ms": "Time to write the config file",
+}
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.counts[bisect_left(self.buckets, value)] += 1
+            self.total += value
+            self.count += 1
+            if value > self.max:
+                self.max = value
+
+    def render(self, prefix: str) -> List[str]:
+        name = f"{prefix}_{self.name}"
+        with self._lock:
+            counts, total, count, maximum = list(self.counts), self.total, self.count, self.max
+        lines = [f"# HELP {name} {self.help_text}", f"# TYPE {name} histogram"]
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{{le="{bound:g}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {count}')
+        lines.append(f"{name}_sum {total:.3f}")
+        lines.append(f"{name}_count {count}")
+        lines.append(f"# TYPE {name}_max gauge")
+        lines.append(f"{name}_max {maximum:.3f}")
+        return lines
+
+
+# Histograms of timer accuracy and of the slow calls around it. Disabled by
+# default; observe() and @timed functions then cost one attribute check.
+# enable() starts an HTTP endpoint serving the Prometheus text format, a
+# thread rewriting a metrics file periodically, or both.
+class Metrics:
+    def __init__(self, prefix: str = "pypomodoro") -> None:
+        self.prefix = prefix
+        self.enabled = False
+        self.histograms: Dict[str, Histogram] = {
+            name: Histogram(name, help_text) for name, help_text in HISTOGRAMS.items()
+        }
+        self._server: Any = None
+        self._writer: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def observe(self, name: str, value_ms: float) -> None:
+        if self.enabled:
+            self.histograms[name].observe(value_ms)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for histogram in self.histograms.values():
+            lines.extend(histogram.render(self.prefix))
+        return "\n".join(lines) + "\n"
+
+    def enable(
+        self,
+        port: Optional[int] = None,
+        path: Optional[Path] = None,
+        interval: float = 10.0,
+        host: str = "127.0.0.1",
+    ) -> None:
+        self.enabled = True
+        if port is not None:
+            self._serve(host, port)
+        if path is not None:
+            self._stop.clear()
+            self._writer = threading.Thread(
+                target=self._write_loop, args=(path, interval), name="pypomodoro-metrics", daemon=True
+            )
+            self._writer.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._writer is not None:
+            self._writer.join(timeout=1.0)
+            self._writer = None
+
+    def write(self, path: Path) -> None:
+        from pypomodoro.core.config import atomic_write_text
+
+        atomic_write_text(path, self.render())
+
+    def _write_loop(self, path: Path, interval: float) -> None:
+        while True:
+            stopped = self._stop.wait(interval)
+            try:
+                self.write(path)
+            except OSError:
+                pass
+            if stopped:
+                return
+
+    def _serve(self, host: str, port: int) -> None:
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(
+            target=self._server.serve_forever, name="pypomodoro-metrics-http", daemon=True
+        ).start()
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    return _metrics
+
+
+def observe(name: str, value_ms: float) -> None:
+    if _metrics.enabled:
+        _metrics.histograms[name].observe(value_ms)
+
+
+def enabled() -> bool:
+    return _metrics.enabled
+
+
+def timed(name: str) -> Callable[[F], F]:
+    # Records the wrapped call's duration into histogram name.
+    def decorator(function: F) -> F:
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _metrics.enabled:
+                return function(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                _metrics.histograms[name].observe((time.perf_counter() - started) * 1000)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -1,19 +1,38 @@
 from __future__ import annotations
 
 import platform
+import queue
 import subprocess
-from typing import Optional
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
 
-from plyer import notification
+from pypomodoro.core.metrics import timed
 
+_notifier: Any = None
 
+_OSASCRIPT_TIMEOUT = 5.0
+
+
+@timed("notification_send_ms")
 def send_notification(title: str, message: str) -> None:
     try:
-        notification.notify(title=title, message=message, app_name="PyPomodoro")
+        _backend().notify(title=title, message=message, app_name="PyPomodoro")
     except Exception:
         _fallback_notification(title, message)
 
 
+def _backend() -> Any:
+    # plyer probes platform backends on import, so resolve it on first use.
+    global _notifier
+    if _notifier is None:
+        from plyer import notification
+
+        _notifier = notification
+    return _notifier
+
+
 def _fallback_notification(title: str, message: str) -> None:
     if platform.system().lower() == "darwin":
         _macos_notification(title, message)
@@ -22,10 +41,172 @@ def _fallback_notification(title: str, message: str) -> None:
 def _macos_notification(title: str, message: str) -> None:
     script = f'display notification "{_escape(message)}" with title "{_escape(title)}"'
     try:
-        subprocess.run(["osascript", "-e", script], check=False)
+        subprocess.run(
+            ["osascript", "-e", script], check=False, timeout=_OSASCRIPT_TIMEOUT
+        )
     except Exception:
         return
 
 
 def _escape(value: Optional[str]) -> str:
     return (value or "").replace('"', '\\"')
+
+
+@dataclass
+class DeliveryStats:
+    submitted: int = 0
+    delivered: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+    timed_out: int = 0
+    latency_total: float = 0.0
+    latency_max: float = 0.0
+    latency_last: float = 0.0
+
+    @property
+    def latency_mean(self) -> float:
+        if not self.delivered:
+            return 0.0
+        return self.latency_total / self.delivered
+
+
+@dataclass
+class _Pending:
+    title: str
+    message: str
+    submitted_at: float
+
+
+# Delivers notifications from a background thread so that a slow backend
+# (D-Bus, osascript) never blocks the caller. Notifications submitted within
+# coalesce_window of each other are merged into one. Backend calls run one
+# at a time on a second long-lived thread; a call that does not return
+# within timeout is abandoned, and until it does return, new notifications
+# are dropped rather than piling up threads behind a hung backend.
+class NotificationDispatcher:
+    def __init__(
+        self,
+        backend: Callable[[str, str], None] = send_notification,
+        max_pending: int = 16,
+        timeout: float = 5.0,
+        coalesce_window: float = 0.1,
+    ) -> None:
+        self._backend = backend
+        self._timeout = timeout
+        self._coalesce_window = coalesce_window
+        self._queue: "queue.Queue[Optional[_Pending]]" = queue.Queue(maxsize=max_pending)
+        self._calls: "queue.Queue[Optional[Tuple[str, str, threading.Event]]]" = queue.Queue(
+            maxsize=1
+        )
+        self._backend_busy = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._backend_thread: Optional[threading.Thread] = None
+        self.stats = DeliveryStats()
+
+    def submit(self, title: str, message: str) -> bool:
+        self._ensure_worker()
+        with self._lock:
+            self.stats.submitted += 1
+        try:
+            self._queue.put_nowait(_Pending(title, message, time.monotonic()))
+        except queue.Full:
+            with self._lock:
+                self.stats.dropped += 1
+            return False
+        return True
+
+    def close(self, timeout: float = 1.0) -> None:
+        with self._lock:
+            thread, backend_thread = self._thread, self._backend_thread
+            self._thread = self._backend_thread = None
+        if thread is None:
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+        try:
+            self._calls.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        if backend_thread is not None:
+            backend_thread.join(timeout)
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._backend_thread = threading.Thread(
+                target=self._run_backend, name="pypomodoro-notify-backend", daemon=True
+            )
+            self._backend_thread.start()
+            self._thread = threading.Thread(
+                target=self._run, name="pypomodoro-notifications", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            closing = self._collect_burst(batch)
+            self._deliver(batch)
+            if closing:
+                return
+
+    def _collect_burst(self, batch: List[_Pending]) -> bool:
+        deadline = time.monotonic() + self._coalesce_window
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=max(0.0, remaining))
+            except queue.Empty:
+                return False
+            if item is None:
+                return True
+            batch.append(item)
+
+    def _deliver(self, batch: List[_Pending]) -> None:
+        messages: List[str] = []
+        for item in batch:
+            if item.message not in messages:
+                messages.append(item.message)
+        if self._backend_busy.is_set():
+            # The previous call is still stuck in the backend.
+            with self._lock:
+                self.stats.dropped += len(batch)
+            return
+        done = threading.Event()
+        self._backend_busy.set()
+        self._calls.put((batch[-1].title, "\n".join(messages), done))
+        finished = done.wait(self._timeout)
+        now = time.monotonic()
+        with self._lock:
+            self.stats.coalesced += len(batch) - 1
+            if not finished:
+                self.stats.timed_out += 1
+                return
+            latency = now - batch[0].submitted_at
+            self.stats.delivered += 1
+            self.stats.latency_total += latency
+            self.stats.latency_last = latency
+            self.stats.latency_max = max(self.stats.latency_max, latency)
+
+    def _run_backend(self) -> None:
+        while True:
+            call = self._calls.get()
+            if call is None:
+                return
+            title, message, done = call
+            try:
+                self._backend(title, message)
+            except Exception:
+                pass
+            self._backend_busy.clear()
+            done.set()
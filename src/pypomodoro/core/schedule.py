@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+
+class SessionState(str, Enum):
+    WORK = "work"
+    SHORT_BREAK = "short_break"
+    LONG_BREAK = "long_break"
+
+
+# The cycle the engine ran before schedules were configurable: a short break
+# after every 5th work session and a long one after every 10th, with work
+# sessions following each other directly in between.
+DEFAULT_SCHEDULE = "work*5, short, work*5, long"
+
+# Upper bound on the expanded length, so "work*100000" is rejected instead
+# of compiled.
+MAX_SLOTS = 1000
+
+_STATE_NAMES = {
+    "work": SessionState.WORK,
+    "short": SessionState.SHORT_BREAK,
+    "short_break": SessionState.SHORT_BREAK,
+    "long": SessionState.LONG_BREAK,
+    "long_break": SessionState.LONG_BREAK,
+}
+
+_TOKEN = re.compile(r"\s*(?:(?P<name>[a-z_]+)|(?P<number>\d+)|(?P<symbol>[(),*:]))", re.I)
+
+Slot = Tuple[SessionState, Optional[int]]
+
+
+# A schedule compiled for one set of default durations. Slot i runs states[i]
+# for durations[i] seconds and is followed by slot next_slot[i]; the last
+# slot wraps around to the first, which is always a work session.
+@dataclass(frozen=True)
+class Schedule:
+    spec: str
+    states: Tuple[SessionState, ...]
+    durations: Tuple[int, ...]
+    next_slot: Tuple[int, ...]
+    work_slots: Tuple[int, ...]
+
+    def slot_for(self, state: SessionState, cycle_count: int) -> int:
+        # The slot an engine with cycle_count completed work sessions is in,
+        # for sessions restored without one. A break that does not follow
+        # the last completed work slot was started by hand and belongs to
+        # the work slot it interrupted.
+        work_slots = self.work_slots
+        current_work = work_slots[cycle_count % len(work_slots)]
+        if state == SessionState.WORK or cycle_count <= 0:
+            return current_work
+        after = self.next_slot[work_slots[(cycle_count - 1) % len(work_slots)]]
+        return after if self.states[after] == state else current_work
+
+
+@lru_cache(maxsize=32)
+def parse_schedule(spec: str) -> Tuple[Slot, ...]:
+    # "item, item, ..." where an item is a state (work, short, long) with an
+    # optional ":minutes", or a parenthesised list, either one optionally
+    # repeated with "*count": "(work, short)*3, work, long:30".
+    tokens = _tokenize(spec)
+    slots, position = _parse_items(tokens, 0)
+    if position != len(tokens):
+        raise ValueError(f"unexpected {tokens[position][1]!r} in schedule")
+    if not slots:
+        raise ValueError("schedule is empty")
+    if slots[0][0] != SessionState.WORK:
+        raise ValueError("schedule must start with a work session")
+    for (state, _), (following, _) in zip(slots, slots[1:]):
+        if state != SessionState.WORK and following != SessionState.WORK:
+            raise ValueError("two breaks in a row in schedule")
+    return tuple(slots)
+
+
+@lru_cache(maxsize=32)
+def compile_schedule(
+    spec: str, work_minutes: int, short_break_minutes: int, long_break_minutes: int
+) -> Schedule:
+    defaults = {
+        SessionState.WORK: work_minutes,
+        SessionState.SHORT_BREAK: short_break_minutes,
+        SessionState.LONG_BREAK: long_break_minutes,
+    }
+    slots = parse_schedule(spec)
+    count = len(slots)
+    return Schedule(
+        spec=spec,
+        states=tuple(state for state, _ in slots),
+        durations=tuple(
+            max(1, int(defaults[state] if minutes is None else minutes)) * 60
+            for state, minutes in slots
+        ),
+        next_slot=tuple((index + 1) % count for index in range(count)),
+        work_slots=tuple(
+            index for index, (state, _) in enumerate(slots) if state == SessionState.WORK
+        ),
+    )
+
+
+def _tokenize(spec: str) -> List[Tuple[str, str]]:
+    tokens: List[Tuple[str, str]] = []
+    position = 0
+    text = spec.strip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None:
+            raise ValueError(f"unexpected {text[position]!r} in schedule")
+        kind = match.lastgroup or "symbol"
+        tokens.append((kind, match.group(kind).lower()))
+        position = match.end()
+    return tokens
+
+
+def _parse_items(tokens: List[Tuple[str, str]], position: int) -> Tuple[List[Slot], int]:
+    slots: List[Slot] = []
+    while position < len(tokens):
+        kind, value = tokens[position]
+        if value == "(":
+            group, position = _parse_items(tokens, position + 1)
+            if position >= len(tokens) or tokens[position][1] != ")":
+                raise ValueError("unclosed '(' in schedule")
+            item, position = group, position + 1
+        elif kind == "name":
+            if value not in _STATE_NAMES:
+                raise ValueError(f"unknown session {value!r} in schedule")
+            minutes: Optional[int] = None
+            position += 1
+            if _peek(tokens, position) == ":":
+                minutes, position = _number(tokens, position + 1)
+            item = [(_STATE_NAMES[value], minutes)]
+        else:
+            break
+        if _peek(tokens, position) == "*":
+            repeat, position = _number(tokens, position + 1)
+            if len(slots) + len(item) * repeat > MAX_SLOTS:
+                raise ValueError(f"schedule longer than {MAX_SLOTS} sessions")
+            item = item * repeat
+        slots.extend(item)
+        if len(slots) > MAX_SLOTS:
+            raise ValueError(f"schedule longer than {MAX_SLOTS} sessions")
+        if _peek(tokens, position) != ",":
+            break
+        position += 1
+    return slots, position
+
+
+def _peek(tokens: List[Tuple[str, str]], position: int) -> Optional[str]:
+    return tokens[position][1] if position < len(tokens) else None
+
+
+def _number(tokens: List[Tuple[str, str]], position: int) -> Tuple[int, int]:
+    if position >= len(tokens) or tokens[position][0] != "number":
+        raise ValueError("expected a number in schedule")
+    value = int(tokens[position][1])
+    if value < 1:
+        raise ValueError("numbers in schedule must be at least 1")
+    return value, position + 1
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pypomodoro.core.config import AppConfig
+from pypomodoro.core.timer_engine import SessionState, TimerEngine, TimerEvent
+
+
+@dataclass(frozen=True)
+class SessionSpan:
+    state: SessionState
+    start: float
+    end: float
+    cycle_count: int
+    completed: bool = True
+
+
+def simulate(
+    config: AppConfig, duration: float, resume_delay: Optional[float] = 0.0
+) -> List[SessionSpan]:
+    # Timeline of the sessions a config produces over duration seconds,
+    # starting at 0. When auto start is off, the user is assumed to press
+    # start resume_delay seconds after each transition; None ends the run.
+    now = [0.0]
+    events: List[TimerEvent] = []
+    engine = TimerEngine(
+        work_minutes=config.work_minutes,
+        short_break_minutes=config.short_break_minutes,
+        long_break_minutes=config.long_break_minutes,
+        auto_start_break=config.auto_start_break,
+        auto_start_work=config.auto_start_work,
+        schedule=config.schedule,
+        on_transition=events.append,
+        wall_clock=lambda: now[0],
+    )
+    engine.start()
+    while now[0] < duration:
+        engine.advance(duration - now[0])
+        if engine.is_running:
+            now[0] = duration
+            break
+        now[0] = events[-1].ended_at if events else duration
+        if resume_delay is None:
+            break
+        now[0] += resume_delay
+        if now[0] >= duration:
+            break
+        engine.start()
+    spans = [
+        SessionSpan(event.from_state, event.started_at, event.ended_at, event.cycle_count)
+        for event in events
+    ]
+    started = engine.session_started_at
+    if engine.is_running and started is not None and started < now[0]:
+        spans.append(SessionSpan(engine.state, started, now[0], engine.cycle_count, False))
+    return spans
+
+
+def summarize(timeline: Sequence[SessionSpan]) -> Dict[str, float]:
+    totals = {"focus_seconds": 0.0, "break_seconds": 0.0, "completed_work_sessions": 0}
+    for span in timeline:
+        length = span.end - span.start
+        if span.state == SessionState.WORK:
+            totals["focus_seconds"] += length
+            totals["completed_work_sessions"] += span.completed
+        else:
+            totals["break_seconds"] += length
+    return totals
+
+
+_Job = Tuple[AppConfig, float, Optional[float]]
+
+
+def _simulate_one(job: _Job) -> List[SessionSpan]:
+    return simulate(*job)
+
+
+def _summarize_one(job: _Job) -> Dict[str, float]:
+    return summarize(simulate(*job))
+
+
+def _run_jobs(function, jobs: List[_Job], processes: Optional[int]) -> list:
+    if processes == 1 or len(jobs) < 2:
+        return [function(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        chunksize = max(1, len(jobs) // ((processes or 4) * 8))
+        return list(pool.map(function, jobs, chunksize=chunksize))
+
+
+def simulate_many(
+    configs: Iterable[AppConfig],
+    duration: float,
+    resume_delay: Optional[float] = 0.0,
+    processes: Optional[int] = None,
+) -> List[List[SessionSpan]]:
+    jobs = [(config, duration, resume_delay) for config in configs]
+    return _run_jobs(_simulate_one, jobs, processes)
+
+
+def what_if(
+    base: AppConfig,
+    work_minutes: Iterable[int],
+    short_break_minutes: Iterable[int],
+    long_break_minutes: Iterable[int],
+    duration: float,
+    processes: Optional[int] = None,
+) -> List[Tuple[AppConfig, Dict[str, float]]]:
+    configs = [
+        replace(base, work_minutes=work, short_break_minutes=short, long_break_minutes=long)
+        for work, short, long in itertools.product(
+            work_minutes, short_break_minutes, long_break_minutes
+        )
+    ]
+    # Workers return only the summaries, which are far cheaper to pickle
+    # than full timelines.
+    jobs = [(config, duration, 0.0) for config in configs]
+    summaries = _run_jobs(_summarize_one, jobs, processes)
+    return list(zip(configs, summaries))
@@ -1,11 +1,28 @@
 from __future__ import annotations
 
+import hashlib
+import os
 import sys
+import tempfile
+import wave
 from pathlib import Path
-from typing import Optional
+from typing import Any, List, Optional, Tuple
 
-from PySide6.QtCore import QUrl
-from PySide6.QtMultimedia import QAudioOutput, QMediaPlayer
+from platformdirs import user_cache_dir
+
+from pypomodoro.core.config import APP_AUTHOR, APP_NAME
+from pypomodoro.core.metrics import timed
+from pypomodoro.core.trace import trace
+
+# Format every alert is decoded to; bump CACHE_VERSION when it changes so
+# stale cache entries are not picked up.
+SAMPLE_RATE = 44100
+CHANNELS = 2
+SAMPLE_WIDTH = 2
+CACHE_VERSION = 2
+# A decode that has neither finished nor failed by then is given up on, so
+# a backend that never answers cannot keep the fallback from being used.
+DECODE_TIMEOUT_MS = 10_000
 
 
 def _resource_path(filename: str) -> Path:
@@ -15,11 +32,62 @@ def _resource_path(filename: str) -> Path:
     return Path(__file__).resolve().parents[2] / filename
 
 
+def sound_cache_dir() -> Path:
+    return Path(user_cache_dir(APP_NAME, APP_AUTHOR)) / "sounds"
+
+
+def cache_key(path: Path) -> str:
+    # Path, size and modification time: a stat instead of reading the whole
+    # file on every prepare(). Replacing the file changes size or mtime.
+    info = path.stat()
+    identity = f"v{CACHE_VERSION}:{path.resolve()}:{info.st_size}:{info.st_mtime_ns}"
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+def write_wav(
+    path: Path, frames: bytes, sample_rate: int = SAMPLE_RATE, channels: int = CHANNELS
+) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(suffix=".tmp", dir=path.parent)
+    os.close(fd)
+    try:
+        with wave.open(tmp_name, "wb") as output:
+            output.setnchannels(channels)
+            output.setsampwidth(SAMPLE_WIDTH)
+            output.setframerate(sample_rate)
+            output.writeframes(frames)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+# Alerts play through QSoundEffect from a PCM WAV in the cache directory,
+# decoded once per distinct file by prepare(). Until the decoded copy is
+# ready, and whenever decoding or loading it fails (no decoder backend, a
+# decoder that ignores the requested sample format, no audio device for
+# QSoundEffect), play() falls back to QMediaPlayer.
+# QtMultimedia is only imported by prepare() or the first play(); if it is
+# missing, sound is disabled instead of failing the caller.
 class SoundPlayer:
-    def __init__(self) -> None:
-        self._player = QMediaPlayer()
-        self._audio_output = QAudioOutput()
-        self._player.setAudioOutput(self._audio_output)
+    def __init__(self, cache_dir: Optional[Path] = None) -> None:
+        self.cache_dir = cache_dir or sound_cache_dir()
+        self._player: Any = None
+        self._audio_output: Any = None
+        self._loaded_file: Optional[Path] = None
+        self._effect: Any = None
+        self._effect_file: Optional[Path] = None
+        self._decoder: Any = None
+        self._decoding: Optional[Path] = None
+        self._decode_timer: Any = None
+        self._chunks: List[bytes] = []
+        self._decoded_format: Optional[Tuple[int, int]] = None
+        self._failed: Optional[Path] = None
+        self._multimedia: Any = None
+        self._unavailable = False
         self._enabled = False
         self._sound_file: Optional[Path] = None
 
@@ -29,14 +97,181 @@ class SoundPlayer:
         if not path.is_absolute():
             path = _resource_path(str(path))
         self._sound_file = path if path.exists() else None
-        if self._sound_file:
-            self._player.setSource(QUrl.fromLocalFile(str(self._sound_file)))
+
+    def prepare(self) -> None:
+        source = self._sound_file
+        if not self._enabled or source is None:
+            return
+        if source in (self._effect_file, self._decoding, self._failed):
+            return
+        multimedia = self._load_multimedia()
+        if multimedia is None:
+            return
+        try:
+            target = self.cache_dir / f"{cache_key(source)}.wav"
+        except OSError as exc:
+            trace("sound_cache_failed", path=str(source), error=str(exc))
+            return
+        if target.exists():
+            self._load_effect(source, target)
         else:
-            self._player.setSource(QUrl())
+            self._decode(source, target)
 
+    @timed("sound_play_ms")
     def play(self) -> None:
-        if not self._enabled:
+        if not self._enabled or not self._sound_file:
+            return
+        if self._effect is not None and self._effect_file == self._sound_file:
+            status = self._effect.status()
+            if status == self._multimedia.QSoundEffect.Status.Ready:
+                self._effect.play()
+                return
+            if status == self._multimedia.QSoundEffect.Status.Error:
+                trace("sound_effect_failed", path=str(self._sound_file))
+                self._failed = self._sound_file
+                self._effect_file = None
+        self.prepare()
+        player = self._ensure_player()
+        if player is None:
             return
-        if not self._player.source().isEmpty():
-            self._player.stop()
-            self._player.play()
+        if self._loaded_file != self._sound_file:
+            from PySide6.QtCore import QUrl
+
+            player.setSource(QUrl.fromLocalFile(str(self._sound_file)))
+            self._loaded_file = self._sound_file
+        player.stop()
+        player.play()
+
+    def _load_multimedia(self) -> Any:
+        if self._multimedia is None and not self._unavailable:
+            try:
+                from PySide6 import QtMultimedia
+            except ImportError as exc:
+                trace("sound_unavailable", error=str(exc))
+                self._unavailable = True
+                return None
+            self._multimedia = QtMultimedia
+        return self._multimedia
+
+    def _ensure_player(self) -> Any:
+        if self._player is None:
+            multimedia = self._load_multimedia()
+            if multimedia is None:
+                return None
+            self._player = multimedia.QMediaPlayer()
+            self._audio_output = multimedia.QAudioOutput()
+            self._player.setAudioOutput(self._audio_output)
+        return self._player
+
+    def _load_effect(self, source: Path, wav: Path) -> None:
+        from PySide6.QtCore import QUrl
+
+        if self._effect is None:
+            self._effect = self._multimedia.QSoundEffect()
+        self._effect.setSource(QUrl.fromLocalFile(str(wav)))
+        self._effect_file = source
+
+    def _decode(self, source: Path, target: Path) -> None:
+        from PySide6.QtCore import QTimer, QUrl
+
+        # Only one decode at a time: drop one still running for a previous
+        # sound file before its callbacks can touch this one's state.
+        self._finish_decode()
+        multimedia = self._multimedia
+        audio_format = multimedia.QAudioFormat()
+        audio_format.setSampleRate(SAMPLE_RATE)
+        audio_format.setChannelCount(CHANNELS)
+        audio_format.setSampleFormat(multimedia.QAudioFormat.SampleFormat.Int16)
+        decoder = multimedia.QAudioDecoder()
+        if not decoder.isSupported():
+            # Without a decoder backend it never reports finished or error.
+            trace("sound_decode_failed", path=str(source), error="no decoder backend")
+            decoder.deleteLater()
+            self._failed = source
+            return
+        decoder.setAudioFormat(audio_format)
+        decoder.setSource(QUrl.fromLocalFile(str(source)))
+        # Every callback gets the decoder it came from and ignores it unless
+        # that is still the current one.
+        decoder.bufferReady.connect(lambda: self._on_buffer(decoder))
+        decoder.finished.connect(lambda: self._on_decoded(decoder, target))
+        decoder.error.connect(lambda _error: self._on_decode_error(decoder))
+        self._decoder = decoder
+        self._decoding = source
+        self._chunks = []
+        self._decoded_format = None
+        self._decode_timer = QTimer()
+        self._decode_timer.setSingleShot(True)
+        self._decode_timer.timeout.connect(lambda: self._on_decode_timeout(decoder))
+        self._decode_timer.start(DECODE_TIMEOUT_MS)
+        trace("sound_decode_started", path=str(source))
+        decoder.start()
+
+    def _on_buffer(self, decoder: Any) -> None:
+        if decoder is not self._decoder:
+            return
+        buffer = decoder.read()
+        audio_format = buffer.format()
+        if audio_format.sampleFormat() != self._multimedia.QAudioFormat.SampleFormat.Int16:
+            # The WAV header would not match the samples.
+            trace("sound_decode_failed", path=str(self._decoding), error="not 16-bit PCM")
+            self._failed = self._decoding
+            self._finish_decode()
+            return
+        received = (audio_format.sampleRate(), audio_format.channelCount())
+        if self._decoded_format is None:
+            self._decoded_format = received
+        elif received != self._decoded_format:
+            trace("sound_decode_failed", path=str(self._decoding), error="format changed")
+            self._failed = self._decoding
+            self._finish_decode()
+            return
+        self._chunks.append(bytes(buffer.constData()))
+
+    def _on_decoded(self, decoder: Any, target: Path) -> None:
+        if decoder is not self._decoder:
+            return
+        source = self._decoding
+        frames = b"".join(self._chunks)
+        sample_rate, channels = self._decoded_format or (SAMPLE_RATE, CHANNELS)
+        self._finish_decode()
+        if not frames:
+            self._failed = source
+            return
+        try:
+            write_wav(target, frames, sample_rate, channels)
+        except OSError as exc:
+            trace("sound_cache_failed", path=str(target), error=str(exc))
+            return
+        trace("sound_decoded", path=str(source), cache=str(target), size=len(frames))
+        if source == self._sound_file:
+            self._load_effect(source, target)
+
+    def _on_decode_error(self, decoder: Any) -> None:
+        if decoder is not self._decoder:
+            return
+        trace("sound_decode_failed", path=str(self._decoding), error=decoder.errorString())
+        self._failed = self._decoding
+        self._finish_decode()
+
+    def _on_decode_timeout(self, decoder: Any) -> None:
+        if decoder is not self._decoder:
+            return
+        trace("sound_decode_failed", path=str(self._decoding), error="timed out")
+        self._failed = self._decoding
+        self._finish_decode()
+
+    def _finish_decode(self) -> None:
+        if self._decoder is not None:
+            # Signals already queued for it must not reach the next decode.
+            self._decoder.blockSignals(True)
+            self._decoder.stop()
+            self._decoder.deleteLater()
+        if self._decode_timer is not None:
+            self._decode_timer.stop()
+            self._decode_timer.deleteLater()
+        self._decoder = None
+        self._decode_timer = None
+        self._decoding = None
+        self._chunks = []
+        self._decoded_format = None
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import time
+from array import array
+from bisect import bisect_left
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pypomodoro.core.history import RECORD, STATE_CODES, SessionHistory, SessionRecord
+from pypomodoro.core.timer_engine import SessionState, TimerEvent
+
+_WORK = STATE_CODES[SessionState.WORK]
+
+# Idle time after a break longer than this is treated as the end of a working
+# block (lunch, end of day) rather than a break that ran over.
+MAX_BREAK_OVERRUN = 3600.0
+
+
+def _local_day_and_slot(timestamp: float) -> Tuple[int, int]:
+    local = time.localtime(timestamp)
+    ordinal = date(local.tm_year, local.tm_mon, local.tm_mday).toordinal()
+    return ordinal, local.tm_wday * 24 + local.tm_hour
+
+
+def _load_numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+# Focus analytics over recorded sessions. Sessions are kept as column arrays
+# and every aggregate is updated in add(), so queries read the aggregates
+# instead of rescanning history. Records normally arrive in start order; one
+# that does not (the clock was set back) makes focus_between() scan instead
+# of bisecting and the streaks get recounted from the completed days. from_history() bulk-loads a store, using
+# NumPy for the columns and aggregates when it is installed (backend="auto").
+class SessionStats:
+    def __init__(self, backend: str = "auto") -> None:
+        self._numpy = _load_numpy() if backend in ("auto", "numpy") else None
+        if backend == "numpy" and self._numpy is None:
+            raise RuntimeError("NumPy backend requested but numpy is not installed")
+        self.starts = array("d")
+        self.ends = array("d")
+        self.states = array("B")
+        self.planned = array("I")
+        self.actual = array("I")
+        self._daily_focus: Dict[int, int] = {}
+        self._heatmap = array("d", [0.0] * (7 * 24))
+        self._work_sessions = 0
+        self._work_completed = 0
+        self._overrun_total = 0.0
+        self._overrun_count = 0
+        self._last_break_end: Optional[float] = None
+        self._sorted = True
+        self._streak_days: Set[int] = set()
+        self._last_streak_day: Optional[int] = None
+        self._streak = 0
+        self._longest_streak = 0
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def backend(self) -> str:
+        return "numpy" if self._numpy is not None else "array"
+
+    @classmethod
+    def from_history(cls, history: SessionHistory, backend: str = "auto") -> "SessionStats":
+        # The store's own reader, so only records it has committed are read,
+        # whatever its file layout.
+        stats = cls(backend)
+        if stats._numpy is not None:
+            stats._load_numpy_columns(b"".join(history.blocks()))
+        else:
+            for block in history.blocks():
+                for fields in RECORD.iter_unpack(block):
+                    stats._add_fields(*fields[:5])
+        return stats
+
+    def add(self, record: SessionRecord) -> None:
+        self._add_fields(
+            record.start,
+            record.end,
+            STATE_CODES[record.state],
+            record.planned_seconds,
+            record.actual_seconds,
+        )
+
+    def add_event(self, event: TimerEvent) -> None:
+        self.add(SessionRecord.from_event(event))
+
+    def daily_focus(self, first: date, last: date) -> Dict[date, int]:
+        totals: Dict[date, int] = {}
+        day = first
+        while day <= last:
+            totals[day] = self._daily_focus.get(day.toordinal(), 0)
+            day += timedelta(days=1)
+        return totals
+
+    def weekly_focus(self, first: date, last: date) -> Dict[date, int]:
+        totals: Dict[date, int] = {}
+        for day, seconds in self.daily_focus(first, last).items():
+            monday = day - timedelta(days=day.weekday())
+            totals[monday] = totals.get(monday, 0) + seconds
+        return totals
+
+    def focus_between(self, start: float, end: float) -> int:
+        if self._sorted:
+            first = bisect_left(self.starts, start)
+            last = bisect_left(self.starts, end)
+        else:
+            first, last = 0, len(self.starts)
+        if self._numpy is not None:
+            np = self._numpy
+            states = np.frombuffer(self.states, dtype=np.uint8)[first:last]
+            actual = np.frombuffer(self.actual, dtype=np.uint32)[first:last]
+            work = states == _WORK
+            if not self._sorted:
+                starts = np.frombuffer(self.starts, dtype=np.float64)
+                work &= (starts >= start) & (starts < end)
+            return int(actual[work].sum(dtype=np.int64))
+        starts = self.starts
+        return sum(
+            self.actual[index]
+            for index in range(first, last)
+            if self.states[index] == _WORK and start <= starts[index] < end
+        )
+
+    def streaks(self, today: Optional[date] = None) -> Tuple[int, int]:
+        today = today or date.today()
+        current = self._streak
+        if self._last_streak_day is None or today.toordinal() - self._last_streak_day > 1:
+            current = 0
+        return current, self._longest_streak
+
+    def completion_rate(self) -> float:
+        if not self._work_sessions:
+            return 0.0
+        return self._work_completed / self._work_sessions
+
+    def average_break_overrun(self) -> float:
+        if not self._overrun_count:
+            return 0.0
+        return self._overrun_total / self._overrun_count
+
+    def heatmap(self) -> List[List[float]]:
+        # Focus seconds by local weekday (Monday first) and hour of day.
+        return [list(self._heatmap[day * 24 : day * 24 + 24]) for day in range(7)]
+
+    def _add_fields(self, start: float, end: float, code: int, planned: int, actual: int) -> None:
+        if self.starts and start < self.starts[-1]:
+            self._sorted = False
+        self.starts.append(start)
+        self.ends.append(end)
+        self.states.append(code)
+        self.planned.append(planned)
+        self.actual.append(actual)
+        if self._last_break_end is not None:
+            gap = start - self._last_break_end
+            if 0 <= gap <= MAX_BREAK_OVERRUN:
+                self._overrun_total += gap
+                self._overrun_count += 1
+        if code != _WORK:
+            self._last_break_end = end
+            return
+        self._last_break_end = None
+        day, slot = _local_day_and_slot(start)
+        self._daily_focus[day] = self._daily_focus.get(day, 0) + actual
+        self._heatmap[slot] += actual
+        self._work_sessions += 1
+        if actual >= planned:
+            self._work_completed += 1
+            self._extend_streak(day)
+
+    def _extend_streak(self, day: int) -> None:
+        if day in self._streak_days:
+            return
+        self._streak_days.add(day)
+        if self._last_streak_day is not None and day < self._last_streak_day:
+            self._recount_streaks()
+            return
+        if self._last_streak_day is not None and day == self._last_streak_day + 1:
+            self._streak += 1
+        else:
+            self._streak = 1
+        self._last_streak_day = day
+        self._longest_streak = max(self._longest_streak, self._streak)
+
+    def _recount_streaks(self) -> None:
+        previous = None
+        self._streak = self._longest_streak = 0
+        for day in sorted(self._streak_days):
+            self._streak = self._streak + 1 if previous == day - 1 else 1
+            self._longest_streak = max(self._longest_streak, self._streak)
+            previous = day
+        self._last_streak_day = previous
+
+    def _load_numpy_columns(self, data: bytes) -> None:
+        np = self._numpy
+        dtype = np.dtype(
+            [
+                ("start", "<f8"),
+                ("end", "<f8"),
+                ("state", "u1"),
+                ("pad", "V3"),
+                ("planned", "<u4"),
+                ("actual", "<u4"),
+                ("cycles", "<u4"),
+            ]
+        )
+        rows = np.frombuffer(data, dtype=dtype)
+        if not len(rows):
+            return
+        starts = rows["start"]
+        ends = rows["end"]
+        states = rows["state"]
+        actual = rows["actual"]
+        self.starts.frombytes(np.ascontiguousarray(starts).tobytes())
+        self.ends.frombytes(np.ascontiguousarray(ends).tobytes())
+        self.states.frombytes(np.ascontiguousarray(states).tobytes())
+        self.planned.frombytes(rows["planned"].astype(np.uint32).tobytes())
+        self.actual.frombytes(actual.astype(np.uint32).tobytes())
+
+        # Local time via the UTC offset of each UTC day, so localtime() is
+        # called per day rather than per row. Rows on a day the offset
+        # changes (a DST switch) go through _local_day_and_slot() like the
+        # array backend, so both agree on which day and hour they fall in.
+        self._sorted = bool(np.all(starts[1:] >= starts[:-1]))
+        utc_days = np.floor_divide(starts, 86400).astype(np.int64)
+        unique_days, inverse = np.unique(utc_days, return_inverse=True)
+        day_starts = [time.localtime(day * 86400).tm_gmtoff for day in unique_days.tolist()]
+        day_ends = [time.localtime(day * 86400 + 86399).tm_gmtoff for day in unique_days.tolist()]
+        offsets = np.array(day_starts, dtype=np.float64)
+        local = starts + offsets[inverse]
+        local_days = np.floor_divide(local, 86400).astype(np.int64)
+        hours = (np.floor_divide(local, 3600) % 24).astype(np.int64)
+        # 1970-01-01 was a Thursday (weekday 3) and has ordinal 719163.
+        weekdays = (local_days + 3) % 7
+        ordinals = local_days + 719163
+        switched = np.nonzero(offsets != np.array(day_ends, dtype=np.float64))[0]
+        if len(switched):
+            for index in np.nonzero(np.isin(inverse, switched))[0].tolist():
+                ordinal, slot = _local_day_and_slot(float(starts[index]))
+                ordinals[index] = ordinal
+                weekdays[index], hours[index] = divmod(slot, 24)
+
+        work = states == _WORK
+        work_ordinals = ordinals[work]
+        work_actual = actual[work].astype(np.int64)
+        if len(work_ordinals):
+            base = int(work_ordinals.min())
+            per_day = np.bincount(work_ordinals - base, weights=work_actual)
+            for offset in np.nonzero(per_day)[0].tolist():
+                self._daily_focus[base + offset] = int(per_day[offset])
+        slots = (weekdays * 24 + hours)[work]
+        heat = np.bincount(slots, weights=work_actual, minlength=7 * 24)
+        self._heatmap = array("d", heat.tolist())
+
+        self._work_sessions = int(work.sum())
+        completed = work & (actual >= rows["planned"])
+        self._work_completed = int(completed.sum())
+        for day in np.unique(ordinals[completed]).tolist():
+            self._extend_streak(day)
+
+        breaks = ~work[:-1]
+        gaps = starts[1:] - ends[:-1]
+        overruns = gaps[breaks & (gaps >= 0) & (gaps <= MAX_BREAK_OVERRUN)]
+        self._overrun_total = float(overruns.sum())
+        self._overrun_count = int(len(overruns))
+        self._last_break_end = None if work[-1] else float(ends[-1])
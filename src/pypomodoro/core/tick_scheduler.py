@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import math
+from typing import Optional
+
+from pypomodoro.core.timer_engine import TimerEngine
+
+
+# Display resolutions, in seconds, for TickScheduler.next_delay.
+PER_SECOND = 1
+PER_MINUTE = 60
+DEADLINE_ONLY = None
+
+# Wake slightly after a boundary so that the engine already reports the new
+# value and a timer that fires a little early does not cause a second wakeup.
+_BOUNDARY_SLACK = 0.005
+
+
+# Picks when the display timer should fire next. wakeups counts timer
+# expiries, reported by the driver through woke(); schedules counts calls
+# to next_delay, which also happen on every button press and settings change.
+class TickScheduler:
+    def __init__(self, engine: TimerEngine) -> None:
+        self.engine = engine
+        self.wakeups = 0
+        self.schedules = 0
+
+    def woke(self) -> None:
+        self.wakeups += 1
+
+    def next_delay(self, resolution: Optional[int] = PER_SECOND) -> Optional[float]:
+        if not self.engine.is_running:
+            return None
+        self.schedules += 1
+        if self.engine.clock is None:
+            # Without a deadline the engine only advances one second per tick.
+            return 1.0
+        remaining = self.engine.time_remaining()
+        if resolution is None or remaining <= 0:
+            return remaining + _BOUNDARY_SLACK
+        boundary = (math.ceil(remaining / resolution) - 1) * resolution
+        return remaining - max(0.0, boundary) + _BOUNDARY_SLACK
+
+    def next_delay_ms(self, resolution: Optional[int] = PER_SECOND) -> Optional[int]:
+        delay = self.next_delay(resolution)
+        if delay is None:
+            return None
+        return max(1, math.ceil(delay * 1000))
@@ -1,22 +1,63 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import math
+import time
+from dataclasses import dataclass, replace
 from enum import Enum
-from typing import Callable, Optional
+from typing import TYPE_CHECKING, Callable, List, Optional
 
+from pypomodoro.core.schedule import DEFAULT_SCHEDULE, SessionState, compile_schedule
 
-class SessionState(str, Enum):
-    WORK = "work"
-    SHORT_BREAK = "short_break"
-    LONG_BREAK = "long_break"
+if TYPE_CHECKING:
+    from pypomodoro.core.events import EventBus
 
 
-@dataclass
+class TimerEventType(str, Enum):
+    TRANSITION = "transition"
+    START = "start"
+    PAUSE = "pause"
+    RESET = "reset"
+    SETTINGS_CHANGED = "settings_changed"
+
+
+@dataclass(frozen=True, slots=True)
 class TimerEvent:
-    event_type: str
+    event_type: TimerEventType
     from_state: SessionState
     to_state: SessionState
     cycle_count: int
+    catch_up: bool = False
+    # Wall-clock bounds and running time of the session that just ended.
+    started_at: float = 0.0
+    ended_at: float = 0.0
+    planned_seconds: int = 0
+    actual_seconds: int = 0
+
+
+# Monotonic seconds that keep counting while the machine is suspended. Linux
+# exposes CLOCK_BOOTTIME for this; elsewhere time.monotonic may stop during
+# sleep, so a forward wall-clock jump beyond the threshold counts as suspend.
+class SuspendAwareClock:
+    def __init__(self, suspend_threshold: float = 2.0) -> None:
+        self._suspend_threshold = suspend_threshold
+        self._boottime = getattr(time, "CLOCK_BOOTTIME", None)
+        self._last_monotonic = time.monotonic()
+        self._last_wall = time.time()
+        self._elapsed = 0.0
+
+    def __call__(self) -> float:
+        if self._boottime is not None:
+            return time.clock_gettime(self._boottime)
+        monotonic_now = time.monotonic()
+        wall_now = time.time()
+        delta = monotonic_now - self._last_monotonic
+        wall_delta = wall_now - self._last_wall
+        if wall_delta - delta > self._suspend_threshold:
+            delta = wall_delta
+        self._last_monotonic = monotonic_now
+        self._last_wall = wall_now
+        self._elapsed += delta
+        return self._elapsed
 
 
 class TimerEngine:
@@ -28,6 +69,11 @@ class TimerEngine:
         auto_start_break: bool = True,
         auto_start_work: bool = True,
         on_transition: Optional[Callable[[TimerEvent], None]] = None,
+        clock: Optional[Callable[[], float]] = None,
+        on_catch_up: Optional[Callable[[List[TimerEvent]], None]] = None,
+        wall_clock: Callable[[], float] = time.time,
+        bus: Optional[EventBus] = None,
+        schedule: str = DEFAULT_SCHEDULE,
     ) -> None:
         self.work_minutes = work_minutes
         self.short_break_minutes = short_break_minutes
@@ -35,28 +81,64 @@ class TimerEngine:
         self.auto_start_break = auto_start_break
         self.auto_start_work = auto_start_work
         self.on_transition = on_transition
+        # With a clock the engine keeps an absolute deadline and derives
+        # remaining_seconds from it; without one every tick() is one second.
+        self.clock = clock
+        self.on_catch_up = on_catch_up
+        self.wall_clock = wall_clock
+        # Receives every TimerEvent, including start/pause/reset/settings.
+        self.bus = bus
+        # The compiled schedule and the slot of the current session in it.
+        self.schedule = schedule
+        self._table = compile_schedule(
+            schedule, work_minutes, short_break_minutes, long_break_minutes
+        )
+        self._slot = 0
 
         self.state = SessionState.WORK
         self.is_running = False
         self.cycle_count = 0
-        self.remaining_seconds = self._minutes_to_seconds(self.work_minutes)
+        self.remaining_seconds = self._table.durations[0]
+        self._deadline: Optional[float] = None
+        self._session_started_at: Optional[float] = None
+        self._session_planned = self.remaining_seconds
 
     def start(self) -> None:
+        # Already running: re-arming from the cached remaining_seconds would
+        # move the deadline back to when it was last synced.
+        if self.is_running:
+            return
         self.is_running = True
+        if self._session_started_at is None:
+            self._session_started_at = self.wall_clock()
+        self._arm_deadline()
+        self._publish(TimerEventType.START)
 
     def pause(self) -> None:
+        self._sync_remaining()
         self.is_running = False
+        self._deadline = None
+        self._publish(TimerEventType.PAUSE)
 
     def reset(self) -> None:
         self.state = SessionState.WORK
         self.is_running = False
         self.cycle_count = 0
-        self.remaining_seconds = self._minutes_to_seconds(self.work_minutes)
+        self._slot = 0
+        self.remaining_seconds = self._table.durations[0]
+        self._deadline = None
+        self._session_started_at = None
+        self._session_planned = self.remaining_seconds
+        self._publish(TimerEventType.RESET)
 
     def skip_break(self) -> Optional[TimerEvent]:
         if self.state not in (SessionState.SHORT_BREAK, SessionState.LONG_BREAK):
             return None
-        return self._transition_to(SessionState.WORK, auto_start=self.auto_start_work)
+        # The slot after a scheduled break is always a work session.
+        slot = self._next_slot()
+        return self._transition_to(
+            self._table.states[slot], auto_start=self.auto_start_work, slot=slot
+        )
 
     def start_break(self) -> Optional[TimerEvent]:
         if self.state != SessionState.WORK:
@@ -66,12 +148,73 @@ class TimerEngine:
     def tick(self) -> Optional[TimerEvent]:
         if not self.is_running:
             return None
+        if self.clock is not None:
+            return self._catch_up()
         if self.remaining_seconds > 0:
             self.remaining_seconds -= 1
         if self.remaining_seconds <= 0:
             return self._handle_session_complete()
         return None
 
+    def advance(self, seconds: float) -> List[TimerEvent]:
+        # Moves a clock-less engine forward by jumping from one session
+        # boundary to the next instead of ticking once per second.
+        if self.clock is not None:
+            raise RuntimeError("advance() needs an engine without a clock")
+        events: List[TimerEvent] = []
+        started_at = self.wall_clock()
+        elapsed = 0
+        budget = int(seconds)
+        while self.is_running and budget > 0:
+            step = min(budget, max(0, self.remaining_seconds))
+            self.remaining_seconds -= step
+            budget -= step
+            elapsed += step
+            if self.remaining_seconds <= 0:
+                events.append(self._handle_session_complete(ended_at=started_at + elapsed))
+        return events
+
+    @property
+    def session_started_at(self) -> Optional[float]:
+        return self._session_started_at
+
+    @property
+    def deadline(self) -> Optional[float]:
+        return self._deadline
+
+    @property
+    def session_planned(self) -> int:
+        return self._session_planned
+
+    def restore(
+        self,
+        state: SessionState,
+        cycle_count: int,
+        remaining_seconds: float,
+        is_running: bool,
+        planned_seconds: int,
+        session_started_at: Optional[float] = None,
+    ) -> None:
+        # Puts back a saved session without publishing anything. A running
+        # session whose time already ran out keeps a past deadline, so the
+        # next tick() replays what was missed through the catch-up path.
+        self.state = state
+        self.cycle_count = cycle_count
+        self._slot = self._table.slot_for(state, cycle_count)
+        self.is_running = is_running
+        self.remaining_seconds = max(0, math.ceil(remaining_seconds))
+        self._session_planned = planned_seconds
+        self._session_started_at = session_started_at
+        if self.clock is not None and is_running:
+            self._deadline = self.clock() + remaining_seconds
+        else:
+            self._deadline = None
+
+    def time_remaining(self) -> float:
+        if self._deadline is None:
+            return float(self.remaining_seconds)
+        return max(0.0, self._deadline - self.clock())
+
     def update_settings(
         self,
         work_minutes: int,
@@ -79,52 +222,157 @@ class TimerEngine:
         long_break_minutes: int,
         auto_start_break: bool,
         auto_start_work: bool,
+        schedule: Optional[str] = None,
     ) -> None:
+        schedule = self.schedule if schedule is None else schedule
+        # Recompile only when something the table depends on changed; a new
+        # schedule string also moves the current session to its slot there.
+        if (schedule, work_minutes, short_break_minutes, long_break_minutes) != (
+            self.schedule,
+            self.work_minutes,
+            self.short_break_minutes,
+            self.long_break_minutes,
+        ):
+            self._table = compile_schedule(
+                schedule, work_minutes, short_break_minutes, long_break_minutes
+            )
+            if schedule != self.schedule:
+                self._slot = self._table.slot_for(self.state, self.cycle_count)
+        self.schedule = schedule
         self.work_minutes = work_minutes
         self.short_break_minutes = short_break_minutes
         self.long_break_minutes = long_break_minutes
         self.auto_start_break = auto_start_break
         self.auto_start_work = auto_start_work
-        if self.state == SessionState.WORK:
-            self.remaining_seconds = self._minutes_to_seconds(self.work_minutes)
-        elif self.state == SessionState.SHORT_BREAK:
-            self.remaining_seconds = self._minutes_to_seconds(self.short_break_minutes)
-        elif self.state == SessionState.LONG_BREAK:
-            self.remaining_seconds = self._minutes_to_seconds(self.long_break_minutes)
+        self.remaining_seconds = self._duration_for_state(self.state)
+        self._session_planned = self.remaining_seconds
+        self._arm_deadline()
+        self._publish(TimerEventType.SETTINGS_CHANGED)
+
+    def _catch_up(self) -> Optional[TimerEvent]:
+        now = self.clock()
+        wall_now = self.wall_clock()
+        events: List[TimerEvent] = []
+        # Chain each new session onto the previous deadline rather than "now"
+        # so that several sessions missed during a stall or suspend are
+        # replayed with their real boundaries.
+        while self.is_running and self._deadline is not None and now >= self._deadline:
+            deadline = self._deadline
+            ended_at = wall_now - (now - deadline)
+            events.append(self._handle_session_complete(emit=False, ended_at=ended_at))
+            if self.is_running:
+                self._deadline = deadline + self.remaining_seconds
+        self._sync_remaining(now)
+        if not events:
+            return None
+        if len(events) == 1:
+            self._emit(events[0])
+            return events[0]
+        events = [replace(event, catch_up=True) for event in events]
+        for event in events:
+            self._emit(event)
+        if self.on_catch_up:
+            self.on_catch_up(events)
+        return events[-1]
+
+    def _arm_deadline(self) -> None:
+        if self.clock is None or not self.is_running:
+            self._deadline = None
+            return
+        self._deadline = self.clock() + self.remaining_seconds
+
+    def _sync_remaining(self, now: Optional[float] = None) -> None:
+        if self._deadline is None:
+            return
+        if now is None:
+            now = self.clock()
+        self.remaining_seconds = max(0, math.ceil(self._deadline - now))
 
-    def _handle_session_complete(self) -> Optional[TimerEvent]:
+    def _handle_session_complete(
+        self, emit: bool = True, ended_at: Optional[float] = None
+    ) -> TimerEvent:
         if self.state == SessionState.WORK:
             self.cycle_count += 1
-            next_state = self._next_break_state()
             auto_start = self.auto_start_break
         else:
-            next_state = SessionState.WORK
             auto_start = self.auto_start_work
-        return self._transition_to(next_state, auto_start=auto_start)
+        slot = self._next_slot()
+        return self._transition_to(
+            self._table.states[slot],
+            auto_start=auto_start,
+            emit=emit,
+            ended_at=ended_at,
+            slot=slot,
+        )
 
-    def _next_break_state(self) -> SessionState:
-        if self.cycle_count % 10 == 0:
-            return SessionState.LONG_BREAK
-        if self.cycle_count % 5 == 0:
-            return SessionState.SHORT_BREAK
-        return SessionState.WORK
+    def _next_slot(self) -> int:
+        # A session that is not the one its slot schedules (a break started
+        # by hand) returns to the slot it interrupted.
+        if self._table.states[self._slot] != self.state:
+            return self._slot
+        return self._table.next_slot[self._slot]
 
-    def _transition_to(self, next_state: SessionState, auto_start: bool) -> TimerEvent:
+    def _transition_to(
+        self,
+        next_state: SessionState,
+        auto_start: bool,
+        emit: bool = True,
+        ended_at: Optional[float] = None,
+        slot: Optional[int] = None,
+    ) -> TimerEvent:
+        self._sync_remaining()
+        if ended_at is None:
+            ended_at = self.wall_clock()
         previous_state = self.state
+        started_at = self._session_started_at
+        planned = self._session_planned
+        actual = max(0, planned - self.remaining_seconds)
         self.state = next_state
+        if slot is not None:
+            self._slot = slot
         self.is_running = auto_start
         self.remaining_seconds = self._duration_for_state(next_state)
+        self._session_planned = self.remaining_seconds
+        self._session_started_at = ended_at if auto_start else None
+        self._arm_deadline()
         event = TimerEvent(
-            event_type="transition",
+            event_type=TimerEventType.TRANSITION,
             from_state=previous_state,
             to_state=next_state,
             cycle_count=self.cycle_count,
+            started_at=ended_at - actual if started_at is None else started_at,
+            ended_at=ended_at,
+            planned_seconds=planned,
+            actual_seconds=actual,
         )
+        if emit:
+            self._emit(event)
+        return event
+
+    def _emit(self, event: TimerEvent) -> None:
         if self.on_transition:
             self.on_transition(event)
-        return event
+        if self.bus is not None:
+            self.bus.publish(event)
+
+    def _publish(self, event_type: TimerEventType) -> None:
+        if self.bus is None:
+            return
+        self.bus.publish(
+            TimerEvent(
+                event_type=event_type,
+                from_state=self.state,
+                to_state=self.state,
+                cycle_count=self.cycle_count,
+                started_at=self._session_started_at or 0.0,
+                planned_seconds=self._session_planned,
+                actual_seconds=max(0, self._session_planned - self.remaining_seconds),
+            )
+        )
 
     def _duration_for_state(self, state: SessionState) -> int:
+        if self._table.states[self._slot] == state:
+            return self._table.durations[self._slot]
         if state == SessionState.WORK:
             return self._minutes_to_seconds(self.work_minutes)
         if state == SessionState.SHORT_BREAK:
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from pypomodoro.core.timer_engine import SuspendAwareClock, TimerEngine
+
+# Rebuild the heap once stale entries outnumber live timers by this factor.
+_COMPACT_FACTOR = 2
+
+
+# Hosts many TimerEngine instances on one shared clock. Every running engine
+# has one live (deadline, sequence, timer_id) entry in a min-heap; entries
+# replaced by a later add/reconfigure/start/pause are skipped when popped.
+# Nothing is ticked until the earliest deadline passes, so the cost is per
+# transition rather than per timer per second.
+class TimerManager:
+    def __init__(self, clock: Optional[Callable[[], float]] = None) -> None:
+        self.clock = clock or SuspendAwareClock()
+        self._engines: Dict[Hashable, TimerEngine] = {}
+        self._live: Dict[Hashable, int] = {}
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._sequence = itertools.count()
+        self._changed: Optional[asyncio.Event] = None
+        self.wakeups = 0
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+    def __contains__(self, timer_id: Hashable) -> bool:
+        return timer_id in self._engines
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._engines)
+
+    def get(self, timer_id: Hashable) -> TimerEngine:
+        return self._engines[timer_id]
+
+    def add(self, timer_id: Hashable, **settings: Any) -> TimerEngine:
+        if timer_id in self._engines:
+            raise KeyError(f"timer {timer_id!r} already exists")
+        engine = TimerEngine(clock=self.clock, **settings)
+        self._engines[timer_id] = engine
+        self._reschedule(timer_id)
+        return engine
+
+    def remove(self, timer_id: Hashable) -> TimerEngine:
+        engine = self._engines.pop(timer_id)
+        self._live.pop(timer_id, None)
+        self._compact_if_needed()
+        return engine
+
+    def reconfigure(self, timer_id: Hashable, **settings: Any) -> None:
+        engine = self._engines[timer_id]
+        current = {
+            "work_minutes": engine.work_minutes,
+            "short_break_minutes": engine.short_break_minutes,
+            "long_break_minutes": engine.long_break_minutes,
+            "auto_start_break": engine.auto_start_break,
+            "auto_start_work": engine.auto_start_work,
+            "schedule": engine.schedule,
+        }
+        current.update(settings)
+        engine.update_settings(**current)
+        self._reschedule(timer_id)
+
+    def start(self, timer_id: Hashable) -> None:
+        self._engines[timer_id].start()
+        self._reschedule(timer_id)
+
+    def pause(self, timer_id: Hashable) -> None:
+        self._engines[timer_id].pause()
+        self._reschedule(timer_id)
+
+    def reset(self, timer_id: Hashable) -> None:
+        self._engines[timer_id].reset()
+        self._reschedule(timer_id)
+
+    def skip_break(self, timer_id: Hashable) -> None:
+        self._engines[timer_id].skip_break()
+        self._reschedule(timer_id)
+
+    def start_break(self, timer_id: Hashable) -> None:
+        self._engines[timer_id].start_break()
+        self._reschedule(timer_id)
+
+    def next_deadline(self) -> Optional[float]:
+        heap = self._heap
+        while heap and self._live.get(heap[0][2]) != heap[0][1]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def run_due(self, now: Optional[float] = None) -> int:
+        if now is None:
+            now = self.clock()
+        heap = self._heap
+        fired = 0
+        while heap and heap[0][0] <= now:
+            _, sequence, timer_id = heapq.heappop(heap)
+            if self._live.get(timer_id) != sequence:
+                continue
+            del self._live[timer_id]
+            self._engines[timer_id].tick()
+            self._reschedule(timer_id)
+            fired += 1
+        return fired
+
+    async def run(self) -> None:
+        self._changed = asyncio.Event()
+        while True:
+            deadline = self.next_deadline()
+            timeout = None if deadline is None else max(0.0, deadline - self.clock())
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeups += 1
+            self.run_due()
+            # Reschedules made by run_due itself are already in the heap.
+            self._changed.clear()
+
+    def _reschedule(self, timer_id: Hashable) -> None:
+        deadline = self._engines[timer_id].deadline
+        if deadline is None:
+            self._live.pop(timer_id, None)
+        else:
+            sequence = next(self._sequence)
+            self._live[timer_id] = sequence
+            heapq.heappush(self._heap, (deadline, sequence, timer_id))
+        self._compact_if_needed()
+        if self._changed is not None:
+            self._changed.set()
+
+    def _compact_if_needed(self) -> None:
+        if len(self._heap) <= _COMPACT_FACTOR * len(self._live) + 64:
+            return
+        self._heap = [entry for entry in self._heap if self._live.get(entry[2]) == entry[1]]
+        heapq.heapify(self._heap)
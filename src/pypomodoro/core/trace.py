@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import atexit
+import json
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, TextIO
+
+DEFAULT_CAPACITY = 4096
+DEFAULT_MAX_BYTES = 1024 * 1024
+DEFAULT_BACKUPS = 3
+
+
+# Trace records go to an in-memory ring buffer. When a path is configured, a
+# background thread appends them to it in batches and rotates the file once
+# it grows past max_bytes. Disabled by default; trace() then returns after a
+# single attribute check.
+class Tracer:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self.enabled = False
+        self._ring: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._pending: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._path: Optional[Path] = None
+        self._max_bytes = DEFAULT_MAX_BYTES
+        self._backups = DEFAULT_BACKUPS
+        self._flush_interval = 1.0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._atexit_registered = False
+
+    def configure(
+        self,
+        path: Optional[Path] = None,
+        capacity: int = DEFAULT_CAPACITY,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backups: int = DEFAULT_BACKUPS,
+        flush_interval: float = 1.0,
+    ) -> None:
+        self.close()
+        self._ring = deque(self._ring, maxlen=capacity)
+        self._pending = deque(maxlen=capacity)
+        self._path = path
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._flush_interval = flush_interval
+        self.enabled = True
+        if path is not None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="pypomodoro-trace", daemon=True
+            )
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.close)
+                self._atexit_registered = True
+
+    def record(self, message: str, data: Dict[str, Any], source: str) -> None:
+        entry = {
+            "timestamp": time.time(),
+            "thread": threading.current_thread().name,
+            "source": source,
+            "message": message,
+            "data": data,
+        }
+        self._ring.append(entry)
+        if self._path is not None:
+            self._pending.append(entry)
+
+    def dump(self, stream: TextIO) -> None:
+        for entry in list(self._ring):
+            stream.write(json.dumps(entry, default=str) + "\n")
+        stream.flush()
+
+    def flush(self) -> None:
+        if self._path is None or not self._pending:
+            return
+        lines = []
+        while self._pending:
+            try:
+                lines.append(json.dumps(self._pending.popleft(), default=str))
+            except IndexError:
+                break
+        payload = ("\n".join(lines) + "\n").encode("utf-8")
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._rotate_if_needed(len(payload))
+            with self._path.open("ab") as handle:
+                handle.write(payload)
+        except OSError:
+            return
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=2.0)
+        self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _rotate_if_needed(self, incoming: int) -> None:
+        try:
+            size = self._path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size + incoming <= self._max_bytes:
+            return
+        if self._backups <= 0:
+            self._path.unlink()
+            return
+        for index in range(self._backups - 1, 0, -1):
+            older = self._path.with_name(f"{self._path.name}.{index}")
+            if older.exists():
+                older.replace(self._path.with_name(f"{self._path.name}.{index + 1}"))
+        self._path.replace(self._path.with_name(f"{self._path.name}.1"))
+
+
+_tracer = Tracer()
+
+
+def trace(message: str, **data: Any) -> None:
+    if not _tracer.enabled:
+        return
+    _tracer.record(message, data, sys._getframe(1).f_globals.get("__name__", "?"))
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def configure_tracing(path: Optional[Path] = None, **options: Any) -> Tracer:
+    _tracer.configure(path, **options)
+    return _tracer
+
+
+def install_crash_dump(path: Optional[Path] = None) -> None:
+    # Writes the ring buffer to path (or stderr) when an exception escapes
+    # the main thread or any other thread, then defers to the previous hook.
+    if not _tracer.enabled:
+        _tracer.configure()
+    previous_hook = sys.excepthook
+    previous_thread_hook = threading.excepthook
+
+    def dump() -> None:
+        if path is None:
+            sys.stderr.write("pypomodoro: trace buffer at crash\n")
+            _tracer.dump(sys.stderr)
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("w", encoding="utf-8") as handle:
+                _tracer.dump(handle)
+        except OSError:
+            _tracer.dump(sys.stderr)
+
+    def excepthook(exc_type, exc_value, exc_traceback) -> None:
+        trace("crash", error=repr(exc_value))
+        dump()
+        previous_hook(exc_type, exc_value, exc_traceback)
+
+    def thread_excepthook(args) -> None:
+        trace(
+            "thread_crash",
+            thread=getattr(args.thread, "name", None),
+            error=repr(args.exc_value),
+        )
+        dump()
+        previous_thread_hook(args)
+
+    sys.excepthook = excepthook
+    threading.excepthook = thread_excepthook
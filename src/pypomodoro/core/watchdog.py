@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import atexit
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Callable, Dict, List, Optional, TextIO
+
+from pypomodoro.core.trace import trace
+
+DEFAULT_STALL_SECONDS = 1.0
+DEFAULT_PROFILE_RATE = 100.0
+HEARTBEAT_MS = 250
+
+
+def collapse_stack(frame: Optional[FrameType]) -> str:
+    # Root first, ";"-separated: the folded format read by flamegraph.pl and
+    # speedscope.
+    names: List[str] = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+
+def _main_thread_id() -> int:
+    return threading.main_thread().ident or 0
+
+
+# Notices when the main thread stops calling heartbeat() for longer than
+# threshold seconds and reports where it is stuck. The main window calls
+# heartbeat() from a timer, so a stall is anything that keeps the Qt event
+# loop from running: a blocking call, a long slot, a deadlock.
+class StallWatchdog:
+    def __init__(
+        self,
+        threshold: float = DEFAULT_STALL_SECONDS,
+        stream: Optional[TextIO] = None,
+        on_stall: Optional[Callable[[float, FrameType], None]] = None,
+    ) -> None:
+        self.threshold = threshold
+        self.stalls = 0
+        self._stream = stream
+        self._on_stall = on_stall
+        self._thread_id = _main_thread_id()
+        self._last_beat: Optional[float] = None
+        self._stalled_since: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def heartbeat(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            stalled_since, self._stalled_since = self._stalled_since, None
+            self._last_beat = now
+        if stalled_since is not None:
+            duration = now - stalled_since
+            trace("ui_stall_end", seconds=round(duration, 3))
+            self._write(f"pypomodoro: main thread resumed after {duration:.1f} s\n")
+
+    def start(self) -> None:
+        self._thread_id = _main_thread_id()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="pypomodoro-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def check(self, now: Optional[float] = None) -> bool:
+        # The first heartbeat arms the watchdog, so startup is not a stall.
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            last = self._last_beat
+            if last is None or self._stalled_since is not None:
+                return False
+            if now - last < self.threshold:
+                return False
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                return False
+            self._stalled_since = last
+            self.stalls += 1
+        self._report(now - last, frame)
+        return True
+
+    def _run(self) -> None:
+        interval = min(self.threshold / 4, HEARTBEAT_MS / 1000)
+        while not self._stop.wait(interval):
+            self.check()
+
+    def _report(self, seconds: float, frame: FrameType) -> None:
+        stack = traceback.format_stack(frame)
+        trace("ui_stall", seconds=round(seconds, 3), stack=collapse_stack(frame))
+        self._write(
+            f"pypomodoro: main thread stalled for {seconds:.1f} s at:\n" + "".join(stack)
+        )
+        if self._on_stall is not None:
+            self._on_stall(seconds, frame)
+
+    def _write(self, text: str) -> None:
+        stream = self._stream or sys.stderr
+        try:
+            stream.write(text)
+            stream.flush()
+        except (OSError, ValueError):
+            pass
+
+
+# Samples the Python stacks of running threads rate times per second, with
+# no tracing hooks installed, and writes them as collapsed stacks ("a;b;c N"
+# per line) for flamegraph.pl, speedscope or inferno.
+class SamplingProfiler:
+    def __init__(
+        self,
+        path: Path,
+        rate: float = DEFAULT_PROFILE_RATE,
+        all_threads: bool = False,
+    ) -> None:
+        self.path = path
+        self.interval = 1.0 / max(1.0, rate)
+        self.all_threads = all_threads
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._names: Dict[int, str] = {}
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="pypomodoro-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+        self.write()
+
+    def sample(self) -> None:
+        frames = sys._current_frames()
+        own = threading.get_ident()
+        if self.all_threads:
+            if len(self._names) != len(frames):
+                self._names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident != own:
+                    name = self._names.get(ident, str(ident))
+                    self.stacks[f"{name};{collapse_stack(frame)}"] += 1
+        else:
+            frame = frames.get(_main_thread_id())
+            if frame is not None:
+                self.stacks[collapse_stack(frame)] += 1
+        self.samples += 1
+
+    def write(self) -> None:
+        from pypomodoro.core.config import atomic_write_text
+
+        lines = [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+        atomic_write_text(self.path, "\n".join(lines) + "\n" if lines else "")
+
+    def _run(self) -> None:
+        # Sleeps until the next slot on a fixed grid, so slow samples do not
+        # lower the rate.
+        next_sample = time.monotonic()
+        while True:
+            next_sample += self.interval
+            delay = next_sample - time.monotonic()
+            if delay < 0:
+                next_sample = time.monotonic()
+                delay = 0
+            if self._stop.wait(delay):
+                return
+            self.sample()
+
+
+_watchdog: Optional[StallWatchdog] = None
+
+
+def get_watchdog() -> Optional[StallWatchdog]:
+    return _watchdog
+
+
+def start_watchdog(threshold: float = DEFAULT_STALL_SECONDS) -> StallWatchdog:
+    global _watchdog
+    if _watchdog is None:
+        _watchdog = StallWatchdog(threshold)
+        _watchdog.start()
+    return _watchdog
+
+
+def start_profiler(
+    path: Path, rate: float = DEFAULT_PROFILE_RATE, all_threads: bool = False
+) -> SamplingProfiler:
+    profiler = SamplingProfiler(path, rate, all_threads)
+    profiler.start()
+    atexit.register(profiler.stop)
+    return profiler
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+from pypomodoro.core.checkpoint import EngineCheckpoint
+from pypomodoro.core.config import AppConfig, data_dir, load_config
+from pypomodoro.core.events import THREAD, EventBus
+from pypomodoro.core.history import SessionHistory
+from pypomodoro.core.ipc import DISPATCH_TIMEOUT, InstanceRunning, InstanceServer
+from pypomodoro.core.i18n import format_time, get_strings, state_text, transition_message
+from pypomodoro.core.metrics import get_metrics
+from pypomodoro.core.notifications import NotificationDispatcher
+from pypomodoro.core.tick_scheduler import DEADLINE_ONLY, TickScheduler
+from pypomodoro.core.timer_engine import (
+    SuspendAwareClock,
+    TimerEngine,
+    TimerEvent,
+    TimerEventType,
+)
+from pypomodoro.core.trace import trace
+from pypomodoro.core.watchdog import HEARTBEAT_MS, StallWatchdog, get_watchdog
+
+
+# Drives TimerEngine from an asyncio loop without Qt. Only the modules
+# imported above are loaded, so this must never pull in PySide6.
+class HeadlessRunner:
+    def __init__(
+        self,
+        config: AppConfig,
+        output: Optional[TextIO] = sys.stdout,
+        as_json: bool = False,
+        status_interval: int = 0,
+        notify: bool = True,
+        instance_server: Optional[InstanceServer] = None,
+    ) -> None:
+        self.config = config
+        self.strings = get_strings(config.language)
+        self.output = output
+        self.as_json = as_json
+        self.status_interval = status_interval
+        self.notify = notify
+        self.bus = EventBus()
+        self.engine = TimerEngine(
+            work_minutes=config.work_minutes,
+            short_break_minutes=config.short_break_minutes,
+            long_break_minutes=config.long_break_minutes,
+            auto_start_break=config.auto_start_break,
+            auto_start_work=config.auto_start_work,
+            schedule=config.schedule,
+            on_transition=self._on_transition,
+            clock=SuspendAwareClock(),
+            on_catch_up=self._on_catch_up,
+            bus=self.bus,
+        )
+        # Separate from the GUI's checkpoint, so the window and headless runs
+        # each resume their own session.
+        self._checkpoint = EngineCheckpoint(data_dir() / "checkpoint-headless.bin")
+        self._restored = self._checkpoint.restore(self.engine)
+        # Saves read the engine, so they must stay on the engine's thread.
+        self.bus.subscribe(self._checkpoint.subscriber(self.engine), offload_when_slow=False)
+        self._scheduler = TickScheduler(self.engine)
+        self._notifications = NotificationDispatcher()
+        self._history = SessionHistory()
+        self.bus.subscribe(
+            self._record_session, event_types=[TimerEventType.TRANSITION], mode=THREAD
+        )
+        self._subscribers: List[Callable[[Dict[str, Any]], None]] = []
+        self._changed: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Commands from `pypomodoro <command>`, served while run() runs.
+        self.instance_server = instance_server
+        # Keep running while paused so that commands can resume the timer.
+        self.keep_alive = instance_server is not None
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        self._subscribers.append(callback)
+
+    def snapshot(self) -> Dict[str, Any]:
+        self.engine.tick()
+        return self._payload("status", self._status_message(), **self._status_data())
+
+    def handle_command(self, command: str) -> Dict[str, Any]:
+        actions = {
+            "start": self.engine.start,
+            "pause": self.engine.pause,
+            "reset": self.engine.reset,
+            "skip_break": self.engine.skip_break,
+            "start_break": self.engine.start_break,
+        }
+        if command != "status":
+            if command not in actions:
+                raise KeyError(command)
+            actions[command]()
+            self._write_status()
+            if self._changed is not None:
+                self._changed.set()
+        return self.snapshot()
+
+    def dispatch_command(self, command: str, timeout: float = DISPATCH_TIMEOUT) -> Dict[str, Any]:
+        # Called on an instance server thread; blocks until the event loop
+        # has run the command, like MainWindow.dispatch_command.
+        if command == "show":
+            raise RuntimeError("the running instance is headless and has no window")
+        if self._loop is None:
+            raise RuntimeError("the timer is not running yet")
+        future = asyncio.run_coroutine_threadsafe(self._run_command(command), self._loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"the timer is busy and did not run {command!r}") from None
+
+    async def _run_command(self, command: str) -> Dict[str, Any]:
+        return self.handle_command(command)
+
+    async def run(self) -> None:
+        watchdog = get_watchdog()
+        heartbeat = asyncio.ensure_future(_heartbeat(watchdog)) if watchdog else None
+        self._loop = asyncio.get_running_loop()
+        if self.instance_server is not None:
+            self.instance_server.start(self.dispatch_command)
+        try:
+            await self._run()
+        finally:
+            if self.instance_server is not None:
+                self.instance_server.close()
+            if heartbeat is not None:
+                heartbeat.cancel()
+            self._notifications.close()
+            self.bus.close()
+            self._history.close()
+            self._checkpoint.close()
+
+    async def _run(self) -> None:
+        self._changed = asyncio.Event()
+        # A restored paused session stays paused when commands can resume
+        # it; a plain terminal run has no other way to, so launching it is
+        # taken as the request to carry on.
+        if self._restored is None or not self.keep_alive:
+            if not self.engine.is_running:
+                self.engine.start()
+        self._write_status()
+        resolution = self.status_interval or DEADLINE_ONLY
+        while True:
+            delay = self._scheduler.next_delay(resolution)
+            if delay is None and not self.keep_alive:
+                break
+            try:
+                await asyncio.wait_for(self._changed.wait(), delay)
+            except asyncio.TimeoutError:
+                self._scheduler.woke()
+            self._changed.clear()
+            self.engine.tick()
+            if self.status_interval:
+                self._write_status()
+        self._write_status()
+
+    def _record_session(self, event: TimerEvent) -> None:
+        try:
+            self._history.append_event(event)
+        except OSError as exc:
+            trace("history_append_failed", error=repr(exc))
+
+    def _on_transition(self, event: TimerEvent) -> None:
+        message = transition_message(self.strings, event)
+        self._write(
+            "transition",
+            message,
+            from_state=event.from_state.value,
+            to_state=event.to_state.value,
+            cycle_count=event.cycle_count,
+            catch_up=event.catch_up,
+        )
+        if not event.catch_up:
+            self._notify(message)
+
+    def _on_catch_up(self, events: List[TimerEvent]) -> None:
+        message = self.strings.format(
+            "notification_catch_up",
+            count=len(events), message=transition_message(self.strings, events[-1])
+        )
+        self._write("catch_up", message, count=len(events))
+        self._notify(message)
+
+    def _notify(self, message: str) -> None:
+        if self.notify:
+            self._notifications.submit("PyPomodoro", message)
+
+    def _write_status(self) -> None:
+        self._write("status", self._status_message(), **self._status_data())
+
+    def _status_message(self) -> str:
+        return (
+            f"{state_text(self.strings, self.engine.state)} "
+            f"{format_time(self.engine.remaining_seconds)}"
+        )
+
+    def _status_data(self) -> Dict[str, Any]:
+        return {
+            "state": self.engine.state.value,
+            "remaining_seconds": self.engine.remaining_seconds,
+            "is_running": self.engine.is_running,
+            "cycle_count": self.engine.cycle_count,
+        }
+
+    def _payload(self, event: str, message: str, **data: Any) -> Dict[str, Any]:
+        return {"event": event, "time": time.time(), "message": message, **data}
+
+    def _write(self, event: str, message: str, **data: Any) -> None:
+        payload = self._payload(event, message, **data)
+        for callback in self._subscribers:
+            callback(payload)
+        if self.output is None:
+            return
+        if self.as_json:
+            line = json.dumps(payload, ensure_ascii=False)
+        else:
+            line = message
+        self.output.write(line + "\n")
+        self.output.flush()
+
+
+# The headless counterpart of the main window's heartbeat timer: --watchdog
+# then reports anything that keeps the asyncio loop from running.
+async def _heartbeat(watchdog: StallWatchdog) -> None:
+    while True:
+        watchdog.heartbeat()
+        await asyncio.sleep(HEARTBEAT_MS / 1000)
+
+
+def _bind_instance_server() -> Optional[InstanceServer]:
+    # Claimed before anything is built, as the window does, so `pypomodoro
+    # start` and friends reach this run. If a window holds the socket, this
+    # run goes on without taking commands.
+    server = InstanceServer()
+    try:
+        server.bind()
+    except InstanceRunning as exc:
+        trace("instance_running", error=str(exc))
+        return None
+    except OSError as exc:
+        trace("instance_server_unavailable", error=repr(exc))
+        return None
+    return server
+
+
+def main(args: argparse.Namespace) -> int:
+    runner = HeadlessRunner(
+        load_config(),
+        as_json=args.json,
+        status_interval=max(0, args.status_interval),
+        notify=not args.no_notify,
+        instance_server=_bind_instance_server(),
+    )
+    if args.serve is not None:
+        from pypomodoro.server import serve
+
+        coroutine = serve(runner, args.host, args.serve)
+    else:
+        coroutine = runner.run()
+    try:
+        asyncio.run(coroutine)
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        get_metrics().close()
+    return 0
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+from typing import Any, Dict, Optional, Set, Tuple
+
+from pypomodoro.headless import HeadlessRunner
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC11B65"
+_COMMANDS = {"start", "pause", "reset", "skip_break", "start_break"}
+_MAX_REQUEST_BYTES = 16 * 1024
+# Host names that always mean this machine. Anything else in a Host header
+# is only accepted when it is the address the server was bound to, so a
+# page on another site cannot reach the server through DNS rebinding.
+_LOOPBACK_NAMES = {"localhost", "127.0.0.1", "::1"}
+_WILDCARD_HOSTS = {"", "0.0.0.0", "::"}
+
+
+def _ws_frame(payload: bytes, opcode: int = 0x1) -> bytes:
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+def _split_host(value: str) -> Tuple[str, Optional[int]]:
+    # "name", "name:port", "[v6]" or "[v6]:port" -> (name, port).
+    if value.startswith("["):
+        name, _, rest = value[1:].partition("]")
+        port = rest[1:] if rest.startswith(":") else ""
+    else:
+        name, _, port = value.rpartition(":") if value.count(":") == 1 else (value, "", "")
+    return name.lower(), int(port) if port.isdigit() else None
+
+
+def _http_response(status: str, body: bytes, content_type: str = "application/json") -> bytes:
+    head = (
+        f"HTTP/1.1 {status}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Cache-Control: no-store\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    return head.encode("ascii") + body
+
+
+# One WebSocket client. Frames are queued and written by a dedicated task so
+# that a slow reader never blocks broadcast(); when its queue is full the
+# oldest frame is dropped, and a client that keeps falling behind is closed.
+class _Subscriber:
+    def __init__(self, writer: asyncio.StreamWriter, queue_size: int, max_drops: int) -> None:
+        self.writer = writer
+        self.queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(maxsize=queue_size)
+        self.max_drops = max_drops
+        self.dropped = 0
+
+    def offer(self, frame: bytes) -> bool:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            if self.dropped > self.max_drops:
+                return False
+        self.queue.put_nowait(frame)
+        return True
+
+    async def pump(self) -> None:
+        while True:
+            frame = await self.queue.get()
+            if frame is None:
+                return
+            self.writer.write(frame)
+            await self.writer.drain()
+
+    def close(self) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+# Serves the headless runner over HTTP and WebSocket on localhost:
+#   GET  /state                    current snapshot
+#   POST /start, /pause, /reset,
+#        /skip_break, /start_break run a command, return the snapshot
+#   GET  /ws                       WebSocket stream of every runner event
+# Each event is serialized and framed once and the same bytes are queued
+# for every subscriber. Requests must name the server in Host, and a
+# browser Origin, when sent, must be the server's own; anything else gets
+# 403 so that other web pages cannot drive the timer.
+class TimerServer:
+    def __init__(
+        self,
+        runner: HeadlessRunner,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        queue_size: int = 32,
+        max_drops: int = 256,
+    ) -> None:
+        self.runner = runner
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.max_drops = max_drops
+        self.broadcasts = 0
+        self.disconnected_slow = 0
+        self._subscribers: Set[_Subscriber] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        runner.subscribe(self.broadcast)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(
+            self._handle_client, self.host, self.port, backlog=4096
+        )
+        sockets = self._server.sockets or []
+        if sockets:
+            self.port = sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        for subscriber in list(self._subscribers):
+            subscriber.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def broadcast(self, payload: Dict[str, Any]) -> None:
+        if not self._subscribers:
+            return
+        frame = _ws_frame(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+        self.broadcasts += 1
+        for subscriber in list(self._subscribers):
+            if not subscriber.offer(frame):
+                self._subscribers.discard(subscriber)
+                self.disconnected_slow += 1
+                subscriber.writer.close()
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            try:
+                request = await self._read_request(reader)
+            except ValueError:
+                writer.write(_http_response("400 Bad Request", b'{"error": "bad request"}'))
+                await writer.drain()
+                return
+            if request is None:
+                return
+            method, path, headers = request
+            if not self._allowed(headers):
+                writer.write(_http_response("403 Forbidden", b'{"error": "forbidden origin"}'))
+                await writer.drain()
+                return
+            if path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                await self._serve_websocket(reader, writer, headers)
+                return
+            writer.write(self._route(method, path))
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _allowed(self, headers: Dict[str, str]) -> bool:
+        host = headers.get("host")
+        if not host:
+            return False
+        name, port = _split_host(host)
+        if port is not None and port != self.port:
+            return False
+        bound = self.host.lower()
+        if name not in _LOOPBACK_NAMES and bound not in _WILDCARD_HOSTS and name != bound:
+            return False
+        origin = headers.get("origin")
+        # Clients other than browsers send no Origin; a browser sends its
+        # page's origin, which must then be this server.
+        return origin is None or origin.lower() == f"http://{host.lower()}"
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader
+    ) -> Optional[Tuple[str, str, Dict[str, str]]]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.LimitOverrunError, asyncio.IncompleteReadError):
+            return None
+        if len(head) > _MAX_REQUEST_BYTES:
+            return None
+        lines = head.decode("latin-1").split("\r\n")
+        parts = lines[0].split(" ")
+        if len(parts) != 3:
+            return None
+        headers: Dict[str, str] = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        # A malformed Content-Length raises ValueError, answered with 400.
+        body_length = int(headers.get("content-length", "0") or 0)
+        if body_length < 0:
+            raise ValueError("negative content-length")
+        if 0 < body_length <= _MAX_REQUEST_BYTES:
+            await reader.readexactly(body_length)
+        return parts[0].upper(), parts[1].split("?", 1)[0], headers
+
+    def _route(self, method: str, path: str) -> bytes:
+        name = path.strip("/")
+        if name == "state":
+            if method != "GET":
+                return _http_response("405 Method Not Allowed", b'{"error": "use GET"}')
+            return self._json_response(self.runner.snapshot())
+        if name in _COMMANDS:
+            if method != "POST":
+                return _http_response("405 Method Not Allowed", b'{"error": "use POST"}')
+            return self._json_response(self.runner.handle_command(name))
+        return _http_response("404 Not Found", b'{"error": "not found"}')
+
+    @staticmethod
+    def _json_response(payload: Dict[str, Any]) -> bytes:
+        return _http_response("200 OK", json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+    async def _serve_websocket(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        headers: Dict[str, str],
+    ) -> None:
+        key = headers.get("sec-websocket-key")
+        if not key:
+            writer.write(_http_response("400 Bad Request", b'{"error": "missing key"}'))
+            await writer.drain()
+            return
+        accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode("ascii")).digest())
+        writer.write(
+            b"HTTP/1.1 101 Switching Protocols\r\n"
+            b"Upgrade: websocket\r\n"
+            b"Connection: Upgrade\r\n"
+            b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+        )
+        subscriber = _Subscriber(writer, self.queue_size, self.max_drops)
+        subscriber.offer(_ws_frame(json.dumps(self.runner.snapshot()).encode("utf-8")))
+        self._subscribers.add(subscriber)
+        pump = asyncio.create_task(subscriber.pump())
+        try:
+            await self._read_frames(reader, subscriber)
+        finally:
+            self._subscribers.discard(subscriber)
+            subscriber.close()
+            try:
+                await asyncio.wait_for(pump, timeout=1.0)
+            except (asyncio.TimeoutError, ConnectionError):
+                pass
+
+    async def _read_frames(self, reader: asyncio.StreamReader, subscriber: _Subscriber) -> None:
+        # Clients only send control frames; anything else is read and ignored.
+        while True:
+            first, second = await reader.readexactly(2)
+            opcode = first & 0x0F
+            length = second & 0x7F
+            if length == 126:
+                (length,) = struct.unpack("!H", await reader.readexactly(2))
+            elif length == 127:
+                (length,) = struct.unpack("!Q", await reader.readexactly(8))
+            if length > _MAX_REQUEST_BYTES:
+                return
+            mask = await reader.readexactly(4) if second & 0x80 else b""
+            data = await reader.readexactly(length)
+            if mask:
+                data = bytes(byte ^ mask[index % 4] for index, byte in enumerate(data))
+            if opcode == 0x8:
+                subscriber.offer(_ws_frame(data[:2], opcode=0x8))
+                subscriber.close()
+                return
+            if opcode == 0x9:
+                subscriber.offer(_ws_frame(data, opcode=0xA))
+
+
+async def serve(runner: HeadlessRunner, host: str, port: int) -> None:
+    server = TimerServer(runner, host, port)
+    await server.start()
+    runner.keep_alive = True
+    try:
+        await runner.run()
+    finally:
+        await server.close()
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-import json
+import threading
 import time
 from pathlib import Path
+from typing import Any, Dict
 
-from PySide6.QtCore import QTimer, Qt
+from PySide6.QtCore import QEvent, QFileSystemWatcher, QTimer, Qt, Signal
 from PySide6.QtGui import QFont, QIcon
 from PySide6.QtWidgets import (
+    QApplication,
     QHBoxLayout,
     QLabel,
     QMainWindow,
@@ -15,58 +17,145 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from pypomodoro.core.config import AppConfig, save_config
-from pypomodoro.core.i18n import get_strings
-from pypomodoro.core.notifications import send_notification
+from pypomodoro.core import metrics
+from pypomodoro.core.checkpoint import EngineCheckpoint
+from pypomodoro.core.config import AppConfig
+from pypomodoro.core.config_store import ConfigStore
+from pypomodoro.core.events import THREAD, EventBus
+from pypomodoro.core.history import SessionHistory
+from pypomodoro.core.i18n import format_time, get_strings, state_text, transition_message
+from pypomodoro.core.ipc import DISPATCH_TIMEOUT
+from pypomodoro.core.notifications import NotificationDispatcher
 from pypomodoro.core.sounds import SoundPlayer
-from pypomodoro.core.timer_engine import SessionState, TimerEngine, TimerEvent
-from pypomodoro.ui.settings_dialog import SettingsDialog
-
-
-def _debug_log(message: str, data: dict, hypothesis_id: str) -> None:
-    payload = {
-        "sessionId": "debug-session",
-        "runId": "pre-fix",
-        "hypothesisId": hypothesis_id,
-        "location": "main_window.py",
-        "message": message,
-        "data": data,
-        "timestamp": int(time.time() * 1000),
-    }
-    log_path = Path("/Users/valente/Documents/projects/pomodoro/.cursor/debug.log")
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-    with log_path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(payload) + "\n")
+from pypomodoro.core.tick_scheduler import (
+    DEADLINE_ONLY,
+    PER_MINUTE,
+    PER_SECOND,
+    TickScheduler,
+)
+from pypomodoro.core.timer_engine import (
+    SessionState,
+    SuspendAwareClock,
+    TimerEngine,
+    TimerEvent,
+    TimerEventType,
+)
+from pypomodoro.core.trace import trace
+from pypomodoro.core.watchdog import HEARTBEAT_MS, get_watchdog
+from pypomodoro.ui.themes import CompiledTheme, ThemeRegistry, user_themes_dir
+from pypomodoro.ui.view_model import TimerViewModel
+
+
+# Interval of the event-loop lag probe, started only when metrics are on.
+_LAG_PROBE_MS = 500
+
+_ENGINE_SETTINGS = {
+    "work_minutes",
+    "short_break_minutes",
+    "long_break_minutes",
+    "auto_start_break",
+    "auto_start_work",
+    "schedule",
+}
+
+
+# A command received by the instance server thread, waiting for the main
+# thread to run it.
+class _PendingCommand:
+    def __init__(self, command: str) -> None:
+        self.command = command
+        self.done = threading.Event()
+        self.result: Dict[str, Any] = {}
+        self.error: Exception | None = None
 
 
 class MainWindow(QMainWindow):
-    def __init__(self, config: AppConfig, icon_path: Path | None = None) -> None:
+    first_painted = Signal()
+    command_received = Signal(object)
+
+    def __init__(
+        self,
+        config: AppConfig,
+        icon_path: Path | None = None,
+        store: ConfigStore | None = None,
+        tray: bool = False,
+    ) -> None:
         super().__init__()
+        self._painted = False
+        self._force_tray = tray
+        self._quitting = False
+        self.tray = None
         self.config = config
+        self.store = store or ConfigStore(config=config)
         self.strings = get_strings(config.language)
         self.setWindowTitle(self.strings["app_title"])
         if icon_path:
             self.setWindowIcon(QIcon(str(icon_path)))
 
+        self.bus = EventBus()
         self.engine = TimerEngine(
             work_minutes=config.work_minutes,
             short_break_minutes=config.short_break_minutes,
             long_break_minutes=config.long_break_minutes,
             auto_start_break=config.auto_start_break,
             auto_start_work=config.auto_start_work,
+            schedule=config.schedule,
             on_transition=self._on_transition,
+            clock=SuspendAwareClock(),
+            on_catch_up=self._on_catch_up,
+            bus=self.bus,
+        )
+        self.checkpoint = EngineCheckpoint()
+        self.checkpoint.restore(self.engine)
+        # Saves read the engine, so they must stay on the engine's thread.
+        self.bus.subscribe(self.checkpoint.subscriber(self.engine), offload_when_slow=False)
+        self.notifications = NotificationDispatcher()
+        self.history = SessionHistory()
+        self.bus.subscribe(
+            self._record_session, event_types=[TimerEventType.TRANSITION], mode=THREAD
         )
         self.sound_player = SoundPlayer()
         self.sound_player.configure(config.sound_enabled, config.sound_file)
 
+        self._view_model = TimerViewModel()
+        self._themes = ThemeRegistry()
+        self._theme: CompiledTheme | None = None
+        self._scheduler = TickScheduler(self.engine)
         self._timer = QTimer(self)
-        self._timer.setInterval(1000)
-        self._timer.timeout.connect(self._on_tick)
-        self._timer.start()
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_timer)
+        self._tick_due: float | None = None
+        self._last_tick: float | None = None
+        self._lag_probe: QTimer | None = None
+        if metrics.enabled():
+            self._start_lag_probe()
+        watchdog = get_watchdog()
+        if watchdog is not None:
+            self._heartbeat = QTimer(self)
+            self._heartbeat.setInterval(HEARTBEAT_MS)
+            self._heartbeat.timeout.connect(watchdog.heartbeat)
+            self._heartbeat.start()
+
+        # Editors often replace the file instead of rewriting it, which drops
+        # the file watch, so the directory is watched as well and the watch
+        # re-added on every reload.
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(100)
+        self._reload_timer.timeout.connect(self._reload_config)
+        self._config_watcher = QFileSystemWatcher(self)
+        self._config_watcher.fileChanged.connect(self._reload_timer.start)
+        self._config_watcher.directoryChanged.connect(self._reload_timer.start)
+        self._watch_config()
+
+        self.command_received.connect(self._run_pending_command)
 
         self._build_ui()
+        self._apply_tray()
         self._apply_theme(self.config.theme)
         self._update_display()
+        self._reschedule()
 
     def _build_ui(self) -> None:
         container = QWidget()
@@ -82,7 +171,7 @@ class MainWindow(QMainWindow):
         self.timer_label.setAlignment(Qt.AlignCenter)
         self.timer_label.setFont(QFont("Arial", 56, QFont.Bold))
 
-        self.cycle_label = QLabel(self.strings["cycles_completed"].format(count=0))
+        self.cycle_label = QLabel(self.strings.format("cycles_completed", count=0))
         self.cycle_label.setAlignment(Qt.AlignCenter)
 
         buttons_row = QHBoxLayout()
@@ -112,11 +201,110 @@ class MainWindow(QMainWindow):
         container.setLayout(layout)
         self.setCentralWidget(container)
 
+        self._bindings = {
+            "window_title": self.setWindowTitle,
+            "state_text": self.state_label.setText,
+            "time_text": self.timer_label.setText,
+            "cycles_text": self.cycle_label.setText,
+            "start_pause_text": self.start_pause_button.setText,
+            "reset_text": self.reset_button.setText,
+            "skip_text": self.skip_button.setText,
+            "start_break_text": self.start_break_button.setText,
+            "settings_text": self.settings_button.setText,
+            "skip_enabled": self.skip_button.setEnabled,
+            "start_break_enabled": self.start_break_button.setEnabled,
+        }
+
+    def _on_timer(self) -> None:
+        self._scheduler.woke()
+        if metrics.enabled():
+            now = time.monotonic()
+            if self._tick_due is not None:
+                metrics.observe("tick_lateness_ms", max(0.0, (now - self._tick_due) * 1000))
+            if self._last_tick is not None:
+                metrics.observe("tick_interval_ms", (now - self._last_tick) * 1000)
+            self._last_tick = now
+        self._on_tick()
+
     def _on_tick(self) -> None:
-        event = self.engine.tick()
-        if event:
-            self._handle_event(event)
-        self._update_display()
+        # Transitions reach _handle_event through the engine's on_transition.
+        self.engine.tick()
+        if self._is_on_screen():
+            self._update_display()
+        elif self.tray is not None:
+            self.tray.update(self.engine)
+        self._reschedule()
+
+    def _reschedule(self) -> None:
+        if self._is_on_screen():
+            resolution = PER_SECOND
+        elif self.tray is not None:
+            resolution = PER_MINUTE
+        else:
+            resolution = DEADLINE_ONLY
+        delay = self._scheduler.next_delay_ms(resolution)
+        if delay is None:
+            self._timer.stop()
+            self._tick_due = self._last_tick = None
+        else:
+            self._timer.start(delay)
+            self._tick_due = time.monotonic() + delay / 1000
+
+    def _start_lag_probe(self) -> None:
+        # A single-shot timer re-armed on every firing: how late it fires is
+        # how long the event loop was busy or starved.
+        self._lag_probe = QTimer(self)
+        self._lag_probe.setSingleShot(True)
+        self._lag_probe.setTimerType(Qt.PreciseTimer)
+        self._lag_probe.timeout.connect(self._on_lag_probe)
+        self._lag_probe_due = time.monotonic() + _LAG_PROBE_MS / 1000
+        self._lag_probe.start(_LAG_PROBE_MS)
+
+    def _on_lag_probe(self) -> None:
+        now = time.monotonic()
+        metrics.observe("event_loop_lag_ms", max(0.0, (now - self._lag_probe_due) * 1000))
+        self._lag_probe_due = now + _LAG_PROBE_MS / 1000
+        self._lag_probe.start(_LAG_PROBE_MS)
+
+    def _is_on_screen(self) -> bool:
+        return self.isVisible() and not self.isMinimized()
+
+    def closeEvent(self, event) -> None:
+        if self.tray is not None and not self._quitting:
+            # Closing the window leaves the countdown running in the tray.
+            event.ignore()
+            self.hide()
+            return
+        if self.tray is not None:
+            self.tray.hide()
+        self.notifications.close()
+        self.bus.close()
+        self.history.close()
+        self.checkpoint.close()
+        self.store.close()
+        super().closeEvent(event)
+
+    def paintEvent(self, event) -> None:
+        super().paintEvent(event)
+        if not self._painted:
+            self._painted = True
+            self.first_painted.emit()
+            # Decode and preload the alert once the window is up, off the
+            # startup path.
+            QTimer.singleShot(1000, self.sound_player.prepare)
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        self._on_tick()
+
+    def hideEvent(self, event) -> None:
+        super().hideEvent(event)
+        self._reschedule()
+
+    def changeEvent(self, event) -> None:
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self._on_tick()
 
     def _toggle_start_pause(self) -> None:
         if self.engine.is_running:
@@ -124,167 +312,235 @@ class MainWindow(QMainWindow):
         else:
             self.engine.start()
         self._update_display()
+        self._reschedule()
 
     def _reset_timer(self) -> None:
         self.engine.reset()
         self._update_display()
+        self._reschedule()
 
     def _skip_break(self) -> None:
-        event = self.engine.skip_break()
-        if event:
-            self._handle_event(event)
+        self.engine.skip_break()
         self._update_display()
+        self._reschedule()
 
     def _start_break(self) -> None:
-        event = self.engine.start_break()
-        if event:
-            self._handle_event(event)
+        self.engine.start_break()
         self._update_display()
+        self._reschedule()
 
     def _open_settings(self) -> None:
-        dialog = SettingsDialog(self.config, self)
+        from pypomodoro.ui.settings_dialog import SettingsDialog
+
+        self._themes.reload()
+        dialog = SettingsDialog(self.config, self, theme_names=self._themes.names())
         result = dialog.exec()
-        # #region agent log
-        _debug_log(
-            "settings_dialog_result",
-            {"result": result, "accepted": result == dialog.Accepted},
-            "H2",
-        )
-        # #endregion
+        trace("settings_dialog_result", result=result, accepted=result == dialog.Accepted)
         if result != dialog.Accepted:
             return
-        self.config = dialog.get_config()
-        # #region agent log
-        _debug_log(
+        config = dialog.get_config()
+        trace(
             "settings_config_applied",
-            {
-                "work_minutes": self.config.work_minutes,
-                "short_break_minutes": self.config.short_break_minutes,
-                "long_break_minutes": self.config.long_break_minutes,
-                "theme": self.config.theme,
-                "language": self.config.language,
-            },
-            "H3",
-        )
-        # #endregion
-        save_config(self.config)
-        self.strings = get_strings(self.config.language)
-        self._apply_language()
-        self.engine.update_settings(
-            work_minutes=self.config.work_minutes,
-            short_break_minutes=self.config.short_break_minutes,
-            long_break_minutes=self.config.long_break_minutes,
-            auto_start_break=self.config.auto_start_break,
-            auto_start_work=self.config.auto_start_work,
-        )
-        # #region agent log
-        _debug_log(
-            "engine_updated",
-            {
-                "state": self.engine.state.value,
-                "remaining_seconds": self.engine.remaining_seconds,
-                "is_running": self.engine.is_running,
-            },
-            "H3",
+            work_minutes=config.work_minutes,
+            short_break_minutes=config.short_break_minutes,
+            long_break_minutes=config.long_break_minutes,
+            theme=config.theme,
+            language=config.language,
         )
-        # #endregion
-        self.sound_player.configure(self.config.sound_enabled, self.config.sound_file)
+        self._apply_config(self.store.update(config))
+
+    def _watch_config(self) -> None:
+        path = self.store.path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        watched = set(self._config_watcher.files()) | set(self._config_watcher.directories())
+        for target in (str(path.parent), str(path), str(user_themes_dir())):
+            if target not in watched and Path(target).exists():
+                self._config_watcher.addPath(target)
+
+    def _reload_config(self) -> None:
+        # The user themes directory is watched too; re-applying the theme
+        # is a no-op unless its file changed.
+        self._watch_config()
+        self._themes.reload()
+        self._apply_config(self.store.reload())
         self._apply_theme(self.config.theme)
+
+    def _apply_config(self, changes: dict) -> None:
+        self.config = self.store.config
+        if not changes:
+            return
+        if "language" in changes:
+            self.strings = get_strings(self.config.language)
+            self._apply_language()
+        if changes.keys() & _ENGINE_SETTINGS:
+            self.engine.update_settings(
+                work_minutes=self.config.work_minutes,
+                short_break_minutes=self.config.short_break_minutes,
+                long_break_minutes=self.config.long_break_minutes,
+                auto_start_break=self.config.auto_start_break,
+                auto_start_work=self.config.auto_start_work,
+                schedule=self.config.schedule,
+            )
+            trace(
+                "engine_updated",
+                state=self.engine.state.value,
+                remaining_seconds=self.engine.remaining_seconds,
+                is_running=self.engine.is_running,
+            )
+        if changes.keys() & {"sound_enabled", "sound_file"}:
+            self.sound_player.configure(self.config.sound_enabled, self.config.sound_file)
+            self.sound_player.prepare()
+        if "theme" in changes:
+            self._apply_theme(self.config.theme)
+        if "tray_mode" in changes:
+            self._apply_tray()
         self._update_display()
+        self._reschedule()
 
     def _handle_event(self, event: TimerEvent) -> None:
         self._update_display()
         message = self._transition_message(event)
-        send_notification("PyPomodoro", message)
+        self.notifications.submit("PyPomodoro", message)
         if event.from_state == SessionState.WORK:
             self.sound_player.play()
 
     def _transition_message(self, event: TimerEvent) -> str:
-        if event.to_state == SessionState.WORK:
-            return self.strings["notification_break_over"]
-        if event.to_state == SessionState.SHORT_BREAK:
-            return self.strings["notification_short_break"]
-        if event.to_state == SessionState.LONG_BREAK:
-            return self.strings["notification_long_break"]
-        return self.strings["notification_transition"]
+        return transition_message(self.strings, event)
 
     def _on_transition(self, event: TimerEvent) -> None:
+        if event.catch_up:
+            # Reported once as a summary by _on_catch_up.
+            return
         self._handle_event(event)
 
-    def _update_display(self) -> None:
-        self.state_label.setText(self._state_label_text())
-        self.timer_label.setText(self._format_time(self.engine.remaining_seconds))
-        self.cycle_label.setText(
-            self.strings["cycles_completed"].format(count=self.engine.cycle_count)
-        )
-        self.start_pause_button.setText(
-            self.strings["pause"] if self.engine.is_running else self.strings["start"]
-        )
-        self.reset_button.setText(self.strings["reset"])
-        self.skip_button.setText(self.strings["skip_break"])
-        self.start_break_button.setText(self.strings["start_break"])
-        self.settings_button.setText(self.strings["settings"])
-        self.skip_button.setEnabled(
-            self.engine.state in (SessionState.SHORT_BREAK, SessionState.LONG_BREAK)
+    def _record_session(self, event: TimerEvent) -> None:
+        try:
+            self.history.append_event(event)
+        except OSError as exc:
+            trace("history_append_failed", error=repr(exc))
+
+    def _on_catch_up(self, events: list[TimerEvent]) -> None:
+        self._update_display()
+        message = self.strings.format(
+            "notification_catch_up",
+            count=len(events), message=self._transition_message(events[-1])
         )
-        self.start_break_button.setEnabled(self.engine.state == SessionState.WORK)
+        self.notifications.submit("PyPomodoro", message)
+        if any(event.from_state == SessionState.WORK for event in events):
+            self.sound_player.play()
 
-    def _state_label_text(self) -> str:
-        if self.engine.state == SessionState.WORK:
-            return self.strings["state_focus"]
-        if self.engine.state == SessionState.SHORT_BREAK:
-            return self.strings["state_short_break"]
-        return self.strings["state_long_break"]
+    @metrics.timed("update_display_ms")
+    def _update_display(self) -> None:
+        for name, value in self._view_model.update(self.engine, self.strings).items():
+            self._bindings[name](value)
+        if self.tray is not None:
+            self.tray.update(self.engine)
 
     def _apply_language(self) -> None:
-        self.setWindowTitle(self.strings["app_title"])
+        if self.tray is not None:
+            self.tray.retranslate(self.strings)
         self._update_display()
 
-    @staticmethod
-    def _format_time(total_seconds: int) -> str:
-        minutes = max(0, total_seconds) // 60
-        seconds = max(0, total_seconds) % 60
-        return f"{minutes:02d}:{seconds:02d}"
-
-    def _apply_theme(self, theme: str) -> None:
-        # #region agent log
-        _debug_log("apply_theme", {"theme": theme}, "H4")
-        # #endregion
-        if theme == "dark":
-            self.setStyleSheet(
-                """
-                QWidget {
-                    background-color: #1f1f1f;
-                    color: #f2f2f2;
-                }
-                QPushButton {
-                    background-color: #2d2d2d;
-                    border: 1px solid #3a3a3a;
-                    padding: 8px 12px;
-                    border-radius: 6px;
-                }
-                QPushButton:disabled {
-                    background-color: #242424;
-                    color: #7a7a7a;
-                }
-                """
+    def _apply_tray(self) -> None:
+        wanted = self.config.tray_mode or self._force_tray
+        if wanted and self.tray is None:
+            from pypomodoro.ui.tray import TrayCountdown
+
+            if not TrayCountdown.is_available():
+                trace("tray_unavailable")
+                return
+            self.tray = TrayCountdown(
+                self.strings,
+                on_toggle_window=self._toggle_window,
+                on_start_pause=self._toggle_start_pause,
+                on_skip_break=self._skip_break,
+                on_quit=self._quit,
+                parent=self,
             )
+            self.tray.update(self.engine)
+            self.tray.show()
+        elif not wanted and self.tray is not None:
+            self.tray.close()
+            self.tray = None
+            if not self.isVisible():
+                self.show()
+
+    def handle_command(self, command: str) -> Dict[str, Any]:
+        # Commands from other processes; same replies as HeadlessRunner.
+        actions = {
+            "start": self.engine.start,
+            "pause": self.engine.pause,
+            "reset": self.engine.reset,
+            "skip_break": self.engine.skip_break,
+            "start_break": self.engine.start_break,
+            "show": self._show_window,
+        }
+        if command != "status":
+            actions[command]()
+            self._update_display()
+            self._reschedule()
+        self.engine.tick()
+        message = (
+            f"{state_text(self.strings, self.engine.state)} "
+            f"{format_time(self.engine.remaining_seconds)}"
+        )
+        return {
+            "event": "status",
+            "time": time.time(),
+            "message": message,
+            "state": self.engine.state.value,
+            "remaining_seconds": self.engine.remaining_seconds,
+            "is_running": self.engine.is_running,
+            "cycle_count": self.engine.cycle_count,
+        }
+
+    def dispatch_command(self, command: str, timeout: float = DISPATCH_TIMEOUT) -> Dict[str, Any]:
+        # Called on the instance server thread; blocks until the main thread
+        # has run the command.
+        pending = _PendingCommand(command)
+        self.command_received.emit(pending)
+        if not pending.done.wait(timeout):
+            raise TimeoutError(f"the window is busy and did not run {command!r}")
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _run_pending_command(self, pending: _PendingCommand) -> None:
+        try:
+            pending.result = self.handle_command(pending.command)
+        except Exception as exc:
+            pending.error = exc
+        finally:
+            pending.done.set()
+
+    def _show_window(self) -> None:
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
+    def _toggle_window(self) -> None:
+        if self._is_on_screen():
+            self.hide()
         else:
-            self.setStyleSheet(
-                """
-                QWidget {
-                    background-color: #f6f6f6;
-                    color: #1b1b1b;
-                }
-                QPushButton {
-                    background-color: #ffffff;
-                    border: 1px solid #d0d0d0;
-                    padding: 8px 12px;
-                    border-radius: 6px;
-                }
-                QPushButton:disabled {
-                    background-color: #ededed;
-                    color: #9a9a9a;
-                }
-                """
-            )
+            self._show_window()
+
+    def _quit(self) -> None:
+        self._quitting = True
+        self.close()
+        QApplication.quit()
+
+    def _apply_theme(self, theme: str) -> None:
+        trace("apply_theme", theme=theme)
+        compiled = self._themes.get(theme)
+        if compiled is self._theme:
+            # Setting even an identical palette or stylesheet repolishes
+            # every widget.
+            return
+        self._theme = compiled
+        palette = compiled.palette()
+        self.setPalette(palette)
+        # A widget's palette stops at top-level children, so the settings
+        # dialog, message boxes and the tray menu take theirs from the
+        # application; the stylesheet already cascades to them.
+        QApplication.setPalette(palette)
+        self.setStyleSheet(compiled.stylesheet)
@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import json
-import time
 from pathlib import Path
 
 from PySide6.QtCore import Qt
@@ -20,31 +18,18 @@ from PySide6.QtWidgets import (
 )
 
 from pypomodoro.core.config import AppConfig
-from pypomodoro.core.i18n import get_strings
-
-
-def _debug_log(message: str, data: dict, hypothesis_id: str) -> None:
-    payload = {
-        "sessionId": "debug-session",
-        "runId": "pre-fix",
-        "hypothesisId": hypothesis_id,
-        "location": "settings_dialog.py",
-        "message": message,
-        "data": data,
-        "timestamp": int(time.time() * 1000),
-    }
-    log_path = Path("/Users/valente/Documents/projects/pomodoro/.cursor/debug.log")
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-    with log_path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(payload) + "\n")
+from pypomodoro.core.i18n import DEFAULT_LANGUAGE, available_languages, get_strings
+from pypomodoro.core.trace import trace
 
 
 class SettingsDialog(QDialog):
-    def __init__(self, config: AppConfig, parent=None) -> None:
+    def __init__(self, config: AppConfig, parent=None, theme_names=None) -> None:
         super().__init__(parent)
         self.strings = get_strings(config.language)
         self.setWindowTitle(self.strings["settings_title"])
         self.setModal(True)
+        # Only editable in config.json; carried over unchanged.
+        self._schedule = config.schedule
 
         self._work_input = QSpinBox()
         self._work_input.setRange(1, 180)
@@ -59,15 +44,14 @@ class SettingsDialog(QDialog):
         self._long_break_input.setValue(config.long_break_minutes)
 
         self._theme_select = QComboBox()
-        self._theme_select.addItems(["light", "dark"])
+        self._theme_select.addItems(theme_names or ["light", "dark"])
         self._theme_select.setCurrentText(config.theme)
 
         self._language_select = QComboBox()
-        self._language_select.addItem(self.strings["language_pt"], "pt-BR")
-        self._language_select.addItem(self.strings["language_en"], "en")
-        self._language_select.setCurrentIndex(
-            0 if config.language == "pt-BR" else 1
-        )
+        for code, name in available_languages().items():
+            self._language_select.addItem(name, code)
+        index = self._language_select.findData(config.language)
+        self._language_select.setCurrentIndex(max(0, index))
 
         self._sound_enabled = QCheckBox(self.strings["sound_enabled_label"])
         self._sound_enabled.setChecked(config.sound_enabled)
@@ -86,6 +70,9 @@ class SettingsDialog(QDialog):
         self._auto_start_work = QCheckBox(self.strings["auto_start_work"])
         self._auto_start_work.setChecked(config.auto_start_work)
 
+        self._tray_mode = QCheckBox(self.strings["tray_mode"])
+        self._tray_mode.setChecked(config.tray_mode)
+
         form = QFormLayout()
         form.addRow(self.strings["work_label"], self._work_input)
         form.addRow(self.strings["short_break_label"], self._short_break_input)
@@ -100,6 +87,7 @@ class SettingsDialog(QDialog):
         form.addRow(self.strings["sound_label"], sound_row)
         form.addRow("", self._auto_start_break)
         form.addRow("", self._auto_start_work)
+        form.addRow("", self._tray_mode)
 
         buttons = QHBoxLayout()
         buttons.addStretch(1)
@@ -122,20 +110,15 @@ class SettingsDialog(QDialog):
         self._long_break_input.interpretText()
         language = self._language_select.currentData()
         if not language:
-            language = "pt-BR" if self._language_select.currentIndex() == 0 else "en"
-        # #region agent log
-        _debug_log(
+            language = DEFAULT_LANGUAGE
+        trace(
             "settings_get_config",
-            {
-                "work_minutes": self._work_input.value(),
-                "short_break_minutes": self._short_break_input.value(),
-                "long_break_minutes": self._long_break_input.value(),
-                "language": language,
-                "theme": self._theme_select.currentText(),
-            },
-            "H2",
+            work_minutes=self._work_input.value(),
+            short_break_minutes=self._short_break_input.value(),
+            long_break_minutes=self._long_break_input.value(),
+            language=language,
+            theme=self._theme_select.currentText(),
         )
-        # #endregion
         return AppConfig(
             work_minutes=self._work_input.value(),
             short_break_minutes=self._short_break_input.value(),
@@ -146,6 +129,8 @@ class SettingsDialog(QDialog):
             sound_file=self._sound_path.text().strip(),
             auto_start_break=self._auto_start_break.isChecked(),
             auto_start_work=self._auto_start_work.isChecked(),
+            tray_mode=self._tray_mode.isChecked(),
+            schedule=self._schedule,
         )
 
     def _select_sound(self) -> None:
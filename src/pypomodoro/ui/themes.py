@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from string import Template
+from typing import Any, Dict, List, Optional, Tuple
+
+from PySide6.QtGui import QColor, QPalette
+
+from pypomodoro.core.config import config_path
+
+DEFAULT_THEME = "light"
+
+_DEFAULT_COLORS = {
+    "window": "#f6f6f6",
+    "text": "#1b1b1b",
+    "button": "#ffffff",
+    "button_border": "#d0d0d0",
+    "button_disabled": "#ededed",
+    "text_disabled": "#9a9a9a",
+}
+
+# Window and text colours come from the palette; the stylesheet only covers
+# what a palette cannot express, so Qt has fewer rules to match on polish.
+_BUTTON_QSS = Template(
+    """
+QPushButton {
+    background-color: $button;
+    color: $text;
+    border: 1px solid $button_border;
+    padding: 8px 12px;
+    border-radius: 6px;
+}
+QPushButton:disabled {
+    background-color: $button_disabled;
+    color: $text_disabled;
+}
+"""
+)
+
+
+def builtin_themes_dir() -> Path:
+    base_path = getattr(sys, "_MEIPASS", None)
+    if base_path:
+        return Path(base_path) / "themes"
+    return Path(__file__).resolve().parent / "themes"
+
+
+def user_themes_dir() -> Path:
+    return config_path().parent / "themes"
+
+
+@dataclass
+class CompiledTheme:
+    name: str
+    colors: Dict[str, str]
+    stylesheet: str
+    _palette: Optional[QPalette] = field(default=None, repr=False)
+
+    def palette(self) -> QPalette:
+        if self._palette is None:
+            self._palette = self._build_palette()
+        return self._palette
+
+    def _build_palette(self) -> QPalette:
+        colors = {key: QColor(value) for key, value in self.colors.items()}
+        palette = QPalette()
+        for role, key in (
+            (QPalette.Window, "window"),
+            (QPalette.Base, "window"),
+            (QPalette.AlternateBase, "window"),
+            (QPalette.WindowText, "text"),
+            (QPalette.Text, "text"),
+            (QPalette.ButtonText, "text"),
+            (QPalette.Button, "button"),
+        ):
+            palette.setColor(role, colors[key])
+        for role in (QPalette.WindowText, QPalette.Text, QPalette.ButtonText):
+            palette.setColor(QPalette.Disabled, role, colors["text_disabled"])
+        palette.setColor(QPalette.Disabled, QPalette.Button, colors["button_disabled"])
+        return palette
+
+
+# Themes are JSON files named after the theme, holding a "colors" table and
+# optionally an extra "stylesheet" (using $color placeholders). User files
+# override built-in ones with the same name. The directory listing and the
+# compiled themes are cached until reload(), so getting the current theme
+# again touches no files; after a reload a theme is only recompiled when its
+# file changed, and otherwise the same CompiledTheme object is returned.
+class ThemeRegistry:
+    def __init__(self, directories: Optional[List[Path]] = None) -> None:
+        self.directories = directories or [builtin_themes_dir(), user_themes_dir()]
+        self._cache: Dict[str, Tuple[float, CompiledTheme]] = {}
+        self._listing: Optional[Dict[str, Path]] = None
+        self._checked: Dict[str, CompiledTheme] = {}
+
+    def names(self) -> List[str]:
+        return sorted(self._files())
+
+    def reload(self) -> None:
+        # Call when theme files may have been added, removed or edited.
+        self._listing = None
+        self._checked = {}
+
+    def get(self, name: str) -> CompiledTheme:
+        theme = self._checked.get(name)
+        if theme is None:
+            theme = self._checked[name] = self._load(name)
+        return theme
+
+    def _load(self, name: str) -> CompiledTheme:
+        files = self._files()
+        if name not in files:
+            name = DEFAULT_THEME
+        path = files.get(name)
+        if path is None:
+            return self._compile(name, {})
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            return self._compile(name, {})
+        cached = self._cache.get(name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        theme = self._compile(name, data)
+        self._cache[name] = (mtime, theme)
+        return theme
+
+    def _files(self) -> Dict[str, Path]:
+        if self._listing is None:
+            files: Dict[str, Path] = {}
+            for directory in self.directories:
+                if not directory.is_dir():
+                    continue
+                for path in directory.glob("*.json"):
+                    files[path.stem] = path
+            self._listing = files
+        return self._listing
+
+    @staticmethod
+    def _compile(name: str, data: Dict[str, Any]) -> CompiledTheme:
+        colors = dict(_DEFAULT_COLORS)
+        table = data.get("colors")
+        for key, value in (table if isinstance(table, dict) else {}).items():
+            if QColor.isValidColorName(str(value)):
+                colors[key] = str(value)
+        stylesheet = _BUTTON_QSS.safe_substitute(colors)
+        extra = data.get("stylesheet")
+        if isinstance(extra, str):
+            stylesheet += Template(extra).safe_substitute(colors)
+        return CompiledTheme(name=name, colors=colors, stylesheet=stylesheet)
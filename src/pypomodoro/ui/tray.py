@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from PySide6.QtCore import QRectF, Qt
+from PySide6.QtGui import QAction, QColor, QFont, QIcon, QPainter, QPixmap
+from PySide6.QtWidgets import QMenu, QSystemTrayIcon
+
+from pypomodoro.core.i18n import Strings, state_text
+from pypomodoro.core.timer_engine import SessionState, TimerEngine
+
+MAX_GLYPH_MINUTES = 180
+
+STATE_COLORS: Dict[SessionState, str] = {
+    SessionState.WORK: "#d9534f",
+    SessionState.SHORT_BREAK: "#5cb85c",
+    SessionState.LONG_BREAK: "#428bca",
+}
+
+
+def display_minutes(remaining_seconds: float) -> int:
+    # Rounded up, so "25" shows until the first full minute has passed and
+    # the glyph changes exactly on the PER_MINUTE scheduler boundaries.
+    return min(MAX_GLYPH_MINUTES, max(0, math.ceil(remaining_seconds / 60)))
+
+
+# Minute glyphs are drawn on first use and kept in a small LRU: a session
+# only ever walks down one state's column, so a few dozen entries cover a
+# whole day without rendering each of the 181 x 3 combinations up front.
+class TrayGlyphCache:
+    def __init__(self, size: int = 64, capacity: int = 64) -> None:
+        self.size = size
+        self.capacity = capacity
+        self.renders = 0
+        self.hits = 0
+        self._icons: "OrderedDict[Tuple[int, SessionState], QIcon]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._icons)
+
+    def icon(self, minutes: int, state: SessionState) -> QIcon:
+        key = (minutes, state)
+        icon = self._icons.get(key)
+        if icon is not None:
+            self._icons.move_to_end(key)
+            self.hits += 1
+            return icon
+        icon = QIcon(self._render(minutes, state))
+        self.renders += 1
+        self._icons[key] = icon
+        if len(self._icons) > self.capacity:
+            self._icons.popitem(last=False)
+        return icon
+
+    def _render(self, minutes: int, state: SessionState) -> QPixmap:
+        pixmap = QPixmap(self.size, self.size)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(STATE_COLORS[state]))
+        painter.drawEllipse(QRectF(0, 0, self.size, self.size))
+        font = QFont()
+        font.setBold(True)
+        font.setPixelSize(int(self.size * (0.55 if minutes < 100 else 0.42)))
+        painter.setFont(font)
+        painter.setPen(QColor("#ffffff"))
+        painter.drawText(QRectF(0, 0, self.size, self.size), Qt.AlignCenter, str(minutes))
+        painter.end()
+        return pixmap
+
+
+class TrayCountdown:
+    def __init__(
+        self,
+        strings: Strings,
+        on_toggle_window: Callable[[], None],
+        on_start_pause: Callable[[], None],
+        on_skip_break: Callable[[], None],
+        on_quit: Callable[[], None],
+        parent=None,
+    ) -> None:
+        self.glyphs = TrayGlyphCache()
+        self.icon_swaps = 0
+        self._shown: Optional[Tuple[int, SessionState]] = None
+        self._tooltip: Optional[Tuple[int, SessionState, bool]] = None
+        self._strings = strings
+
+        self._menu = QMenu()
+        self._toggle_action = QAction(self._menu)
+        self._toggle_action.triggered.connect(on_toggle_window)
+        self._start_pause_action = QAction(self._menu)
+        self._start_pause_action.triggered.connect(on_start_pause)
+        self._skip_action = QAction(self._menu)
+        self._skip_action.triggered.connect(on_skip_break)
+        self._quit_action = QAction(self._menu)
+        self._quit_action.triggered.connect(on_quit)
+        self._menu.addAction(self._toggle_action)
+        self._menu.addSeparator()
+        self._menu.addAction(self._start_pause_action)
+        self._menu.addAction(self._skip_action)
+        self._menu.addSeparator()
+        self._menu.addAction(self._quit_action)
+
+        self.icon = QSystemTrayIcon(parent)
+        self.icon.setContextMenu(self._menu)
+        self.icon.activated.connect(
+            lambda reason: reason == QSystemTrayIcon.Trigger and on_toggle_window()
+        )
+        self.retranslate(strings)
+
+    @staticmethod
+    def is_available() -> bool:
+        return QSystemTrayIcon.isSystemTrayAvailable()
+
+    def show(self) -> None:
+        self.icon.show()
+
+    def hide(self) -> None:
+        self.icon.hide()
+
+    def close(self) -> None:
+        self.icon.hide()
+        self.icon.deleteLater()
+        self._menu.deleteLater()
+
+    def retranslate(self, strings: Strings) -> None:
+        self._strings = strings
+        self._toggle_action.setText(strings["show_window"])
+        self._skip_action.setText(strings["skip_break"])
+        self._quit_action.setText(strings["quit"])
+        self._tooltip = None
+
+    def update(self, engine: TimerEngine) -> None:
+        minutes = display_minutes(engine.time_remaining())
+        key = (minutes, engine.state)
+        if key != self._shown:
+            self._shown = key
+            self.icon.setIcon(self.glyphs.icon(minutes, engine.state))
+            self.icon_swaps += 1
+        tooltip = (minutes, engine.state, engine.is_running)
+        if tooltip != self._tooltip:
+            self._tooltip = tooltip
+            strings = self._strings
+            self.icon.setToolTip(f"{state_text(strings, engine.state)} · {minutes} min")
+            self._start_pause_action.setText(
+                strings["pause"] if engine.is_running else strings["start"]
+            )
+            self._skip_action.setEnabled(engine.state != SessionState.WORK)
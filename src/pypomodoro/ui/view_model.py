@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Tuple
+
+from pypomodoro.core.i18n import Strings, format_time, state_text
+from pypomodoro.core.timer_engine import SessionState, TimerEngine
+
+
+@dataclass(frozen=True)
+class ViewState:
+    window_title: str
+    state_text: str
+    time_text: str
+    cycles_text: str
+    start_pause_text: str
+    reset_text: str
+    skip_text: str
+    start_break_text: str
+    settings_text: str
+    skip_enabled: bool
+    start_break_enabled: bool
+
+
+_FIELDS: Tuple[str, ...] = tuple(field.name for field in fields(ViewState))
+
+
+# Sits between TimerEngine and the widgets. update() builds the next
+# ViewState and returns only the properties that differ from the last one,
+# so a normal tick pushes just the new time text. Translated labels are
+# rebuilt only when a different strings table is passed in, and MM:SS texts
+# are formatted once and reused.
+class TimerViewModel:
+    def __init__(self) -> None:
+        self._previous: Optional[ViewState] = None
+        self._strings: Optional[Strings] = None
+        self._labels: Dict[str, str] = {}
+        self._time_texts: List[str] = []
+        self._cycles: Tuple[int, str] = (-1, "")
+        self.pushed = 0
+
+    def update(self, engine: TimerEngine, strings: Strings) -> Dict[str, Any]:
+        if strings is not self._strings:
+            self._retranslate(strings)
+        state = ViewState(
+            window_title=self._labels["app_title"],
+            state_text=self._labels[engine.state.value],
+            time_text=self.time_text(engine.remaining_seconds),
+            cycles_text=self._cycles_text(engine.cycle_count),
+            start_pause_text=self._labels["pause" if engine.is_running else "start"],
+            reset_text=self._labels["reset"],
+            skip_text=self._labels["skip_break"],
+            start_break_text=self._labels["start_break"],
+            settings_text=self._labels["settings"],
+            skip_enabled=engine.state != SessionState.WORK,
+            start_break_enabled=engine.state == SessionState.WORK,
+        )
+        previous = self._previous
+        self._previous = state
+        if previous is None:
+            changes = {name: getattr(state, name) for name in _FIELDS}
+        else:
+            changes = {
+                name: getattr(state, name)
+                for name in _FIELDS
+                if getattr(state, name) != getattr(previous, name)
+            }
+        self.pushed += len(changes)
+        return changes
+
+    def invalidate(self) -> None:
+        self._previous = None
+
+    def time_text(self, seconds: int) -> str:
+        seconds = max(0, seconds)
+        if seconds >= len(self._time_texts):
+            start = len(self._time_texts)
+            self._time_texts.extend(format_time(value) for value in range(start, seconds + 61))
+        return self._time_texts[seconds]
+
+    def _cycles_text(self, count: int) -> str:
+        if self._cycles[0] != count:
+            self._cycles = (count, self._strings.format("cycles_completed", count=count))
+        return self._cycles[1]
+
+    def _retranslate(self, strings: Strings) -> None:
+        self._strings = strings
+        self._labels = {
+            key: strings[key]
+            for key in ("app_title", "start", "pause", "reset", "skip_break", "start_break", "settings")
+        }
+        for state in SessionState:
+            self._labels[state.value] = state_text(strings, state)
+        self._cycles = (-1, "")
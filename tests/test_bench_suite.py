@@ -0,0 +1,62 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+BENCH_DIR = Path(__file__).resolve().parents[1] / "benchmarks"
+if str(BENCH_DIR) not in sys.path:
+    sys.path.insert(0, str(BENCH_DIR))
+
+import suite  # noqa: E402
+
+
+def results(**groups):
+    return {"results": groups}
+
+
+def test_slower_beyond_tolerance_and_noise_floor_is_a_regression():
+    baseline = results(engine={"tick_us": 10.0, "load_ms": 200.0})
+    current = results(engine={"tick_us": 14.0, "load_ms": 300.0})
+    assert suite.compare(current, baseline, 0.25) == [
+        {"metric": "engine.tick_us", "baseline": 10.0, "current": 14.0, "ratio": 1.4},
+        {"metric": "engine.load_ms", "baseline": 200.0, "current": 300.0, "ratio": 1.5},
+    ]
+
+
+def test_differences_under_the_noise_floor_are_ignored():
+    baseline = results(engine={"tick_us": 0.1, "load_ms": 20.0})
+    current = results(engine={"tick_us": 0.5, "load_ms": 60.0})
+    assert suite.compare(current, baseline, 0.25) == []
+
+
+def test_within_tolerance_and_unknown_metrics_are_ignored():
+    baseline = results(engine={"tick_us": 10.0, "zero_us": 0.0})
+    current = results(engine={"tick_us": 12.0, "zero_us": 5.0, "new_us": 99.0}, other={"x": 1.0})
+    assert suite.compare(current, baseline, 0.25) == []
+
+
+def test_metrics_without_a_unit_suffix_have_no_floor():
+    assert suite._noise_floor("rss_kib") == 0.0
+    assert suite.compare(results(g={"count": 2.0}), results(g={"count": 1.0}), 0.25)
+
+
+def test_run_reports_median_of_repeats_and_skips_failures(monkeypatch):
+    values = iter([5.0, 1.0, 3.0])
+
+    def broken():
+        raise RuntimeError("no display")
+
+    monkeypatch.setattr(
+        suite, "BENCHMARKS", {"fast": lambda: {"call_us": next(values)}, "qt": broken}
+    )
+    report = suite.run(repeat=3)
+    assert report["results"] == {"fast": {"call_us": 3.0}}
+    assert report["skipped"] == {"qt": "no display"}
+
+
+@pytest.mark.parametrize("selected, expected", [(["fast"], {"fast"}), (None, {"fast", "slow"})])
+def test_run_only_selected(monkeypatch, selected, expected):
+    monkeypatch.setattr(
+        suite, "BENCHMARKS", {"fast": lambda: {"a_us": 1.0}, "slow": lambda: {"b_ms": 2.0}}
+    )
+    assert set(suite.run(selected, repeat=1)["results"]) == expected
@@ -0,0 +1,111 @@
+from pypomodoro.core.checkpoint import (
+    FILE_SIZE,
+    MAGIC,
+    MAX_RESUME_AGE,
+    SLOT_SIZE,
+    EngineCheckpoint,
+)
+from pypomodoro.core.timer_engine import SessionState, TimerEngine
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_engine(wall_now: float = 1_700_000_000.0):
+    clock, wall = FakeClock(1000.0), FakeClock(wall_now)
+    return TimerEngine(25, 5, 20, clock=clock, wall_clock=wall), clock, wall
+
+
+def corrupt_slot(path, slot):
+    data = bytearray(path.read_bytes())
+    data[len(MAGIC) + slot * SLOT_SIZE + 4] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+
+def test_running_session_resumes_from_wall_deadline(tmp_path):
+    engine, clock, wall = make_engine()
+    engine.start()
+    clock.now += 300
+    wall.now += 300
+    checkpoint = EngineCheckpoint(tmp_path / "checkpoint.bin")
+    checkpoint.save(engine)
+    checkpoint.close()
+
+    restored, _, _ = make_engine(wall.now + 200)
+    loaded = EngineCheckpoint(tmp_path / "checkpoint.bin").restore(restored)
+    assert loaded is not None and loaded.is_running
+    assert restored.is_running
+    assert restored.time_remaining() == 1000
+
+
+def test_torn_newest_slot_falls_back_to_previous(tmp_path):
+    path = tmp_path / "checkpoint.bin"
+    engine, clock, _ = make_engine()
+    checkpoint = EngineCheckpoint(path)
+    engine.start()
+    clock.now += 100
+    engine.pause()
+    checkpoint.save(engine)
+    engine.start()
+    clock.now += 100
+    engine.pause()
+    checkpoint.save(engine)
+    checkpoint.close()
+    assert path.stat().st_size == FILE_SIZE
+
+    newest = EngineCheckpoint(path).load()
+    assert (newest.seq, newest.remaining_seconds) == (2, 1300)
+    corrupt_slot(path, newest.seq % 2)
+    older = EngineCheckpoint(path).load()
+    assert (older.seq, older.remaining_seconds) == (1, 1400)
+
+    # The next save goes over the torn slot, not the good one.
+    reopened = EngineCheckpoint(path)
+    reopened.load()
+    reopened.save(engine)
+    reopened.close()
+    assert EngineCheckpoint(path).load().seq == 2
+    corrupt_slot(path, 0)
+    corrupt_slot(path, 1)
+    assert EngineCheckpoint(path).load() is None
+
+
+def test_garbage_file_is_reset(tmp_path):
+    path = tmp_path / "checkpoint.bin"
+    path.write_bytes(b"not a checkpoint")
+    assert EngineCheckpoint(path).load() is None
+    assert path.stat().st_size == FILE_SIZE
+
+
+def test_paused_checkpoint_never_goes_stale(tmp_path):
+    path = tmp_path / "checkpoint.bin"
+    engine, clock, _ = make_engine()
+    engine.start()
+    clock.now += 60
+    engine.pause()
+    checkpoint = EngineCheckpoint(path)
+    checkpoint.save(engine)
+    checkpoint.close()
+
+    later, _, _ = make_engine(1_700_000_000.0 + 30 * 86400)
+    assert EngineCheckpoint(path).restore(later) is not None
+    assert not later.is_running
+    assert later.time_remaining() == 1440
+
+
+def test_old_running_checkpoint_is_not_resumed(tmp_path):
+    path = tmp_path / "checkpoint.bin"
+    engine, _, _ = make_engine()
+    engine.start()
+    checkpoint = EngineCheckpoint(path)
+    checkpoint.save(engine)
+    checkpoint.close()
+
+    later, _, _ = make_engine(1_700_000_000.0 + MAX_RESUME_AGE + 1)
+    assert EngineCheckpoint(path).restore(later) is None
+    assert later.state == SessionState.WORK and not later.is_running
@@ -0,0 +1,59 @@
+import threading
+import time
+
+from pypomodoro.core import config_store
+from pypomodoro.core.config import AppConfig, load_config, save_config
+from pypomodoro.core.config_store import ConfigStore
+
+
+def test_burst_of_updates_is_one_write(tmp_path):
+    store = ConfigStore(tmp_path / "config.json", AppConfig(), debounce=60)
+    for minutes in range(20, 30):
+        store.update(work_minutes=minutes)
+    store.flush()
+    store.flush()
+    assert store.writes == 1
+    assert load_config(store.path).work_minutes == 29
+
+
+def test_reload_reports_outside_edits_only(tmp_path):
+    store = ConfigStore(tmp_path / "config.json", AppConfig(), debounce=60)
+    store.update(work_minutes=40)
+    store.flush()
+    assert store.reload() == {}
+    save_config(AppConfig(work_minutes=40, short_break_minutes=7), store.path)
+    assert store.reload() == {"short_break_minutes": 7}
+    assert store.config.short_break_minutes == 7
+
+
+def test_concurrent_flushes_never_write_an_older_payload(tmp_path, monkeypatch):
+    store = ConfigStore(tmp_path / "config.json", AppConfig(), debounce=60)
+    first_write = threading.Event()
+    release = threading.Event()
+    write = config_store.atomic_write_text
+
+    def slow_write(path, text):
+        if not first_write.is_set():
+            first_write.set()
+            release.wait(5)
+        write(path, text)
+
+    monkeypatch.setattr(config_store, "atomic_write_text", slow_write)
+    store.update(work_minutes=30)
+    old = threading.Thread(target=store.flush)
+    old.start()
+    first_write.wait(5)
+    store.update(work_minutes=45)
+    new = threading.Thread(target=store.flush)
+    new.start()
+    # A reload racing the stalled write must not take the old file for an
+    # outside edit and undo the pending change.
+    reload = threading.Thread(target=store.reload)
+    reload.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in (old, new, reload):
+        thread.join(5)
+    assert load_config(store.path).work_minutes == 45
+    assert store.config.work_minutes == 45
+    assert store.writes == 2
@@ -0,0 +1,95 @@
+import threading
+import time
+
+from pypomodoro.core.events import BATCH, SYNC, THREAD, EventBus
+from pypomodoro.core.timer_engine import SessionState, TimerEvent, TimerEventType
+
+
+def event(event_type=TimerEventType.TRANSITION):
+    return TimerEvent(
+        event_type=event_type,
+        from_state=SessionState.WORK,
+        to_state=SessionState.SHORT_BREAK,
+        cycle_count=1,
+    )
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+def test_priority_order_filters_and_contained_errors():
+    bus = EventBus()
+    calls = []
+
+    def broken(_event):
+        raise ValueError("boom")
+
+    failing = bus.subscribe(broken, priority=-1)
+    bus.subscribe(lambda _event: calls.append("late"), priority=5)
+    bus.subscribe(lambda _event: calls.append("early"))
+    bus.subscribe(lambda _event: calls.append("start"), event_types=[TimerEventType.START])
+    bus.publish(event())
+    assert calls == ["early", "late"]
+    assert failing.errors == 1
+
+
+def test_slow_sync_subscriber_is_moved_off_the_publisher_thread():
+    bus = EventBus(slow_threshold=0.01)
+    threads = []
+
+    def slow(_event):
+        threads.append(threading.current_thread())
+        time.sleep(0.03)
+
+    subscription = bus.subscribe(slow)
+    bus.publish(event())
+    assert subscription.slow == 1 and subscription.mode == THREAD
+    started = time.perf_counter()
+    bus.publish(event())
+    assert time.perf_counter() - started < 0.01
+    assert wait_for(lambda: len(threads) == 2)
+    assert threads[0] is threading.current_thread()
+    assert threads[1] is not threading.current_thread()
+    bus.close()
+
+
+def test_opted_out_subscriber_stays_on_the_publisher_thread():
+    bus = EventBus(slow_threshold=0.01)
+    threads = []
+
+    def slow(_event):
+        threads.append(threading.current_thread())
+        time.sleep(0.02)
+
+    subscription = bus.subscribe(slow, offload_when_slow=False)
+    bus.publish(event())
+    bus.publish(event())
+    assert subscription.mode == SYNC and subscription.slow == 2
+    assert threads == [threading.current_thread()] * 2
+
+
+def test_thread_and_batch_delivery():
+    bus = EventBus()
+    seen, batches = [], []
+    bus.subscribe(seen.append, mode=THREAD)
+    bus.subscribe(batches.append, mode=BATCH, batch_size=3, batch_interval=0.05)
+    for _ in range(7):
+        bus.publish(event())
+    bus.close()
+    assert len(seen) == 7
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+
+
+def test_full_queue_drops_instead_of_blocking():
+    bus = EventBus()
+    release = threading.Event()
+    subscription = bus.subscribe(lambda _event: release.wait(5), mode=THREAD, queue_size=2)
+    for _ in range(10):
+        bus.publish(event())
+    assert subscription.dropped >= 7
+    release.set()
+    bus.close()
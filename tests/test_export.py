@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+import random
+
+import pytest
+
+from pypomodoro.core import export
+from pypomodoro.core.history import SessionHistory, SessionRecord
+from pypomodoro.core.timer_engine import SessionState
+
+STATES = list(SessionState)
+
+
+@pytest.fixture
+def history(tmp_path):
+    rng = random.Random(7)
+    history = SessionHistory(tmp_path)
+    now = 1_700_000_000.0
+    for cycle in range(3000):
+        if rng.random() < 0.01:
+            now -= 2 * 86400
+        actual = rng.choice([300, 1455, 1500])
+        history.append(
+            SessionRecord(now + rng.random(), now + actual, rng.choice(STATES), 1500, actual, cycle)
+        )
+        now += actual + rng.choice([0, 600, 8 * 3600])
+    yield history
+    history.close()
+
+
+def expected(history, start=None, end=None, states=None):
+    return [
+        (r.start, r.end, r.state.value, r.planned_seconds, r.actual_seconds, r.cycle_count)
+        for r in history.records()
+        if (start is None or r.start >= start)
+        and (end is None or r.start < end)
+        and (states is None or r.state in states)
+    ]
+
+
+def window(history):
+    records = list(history.records())
+    return records[700].start, records[2100].start
+
+
+def test_csv_round_trip(history):
+    stream = io.StringIO()
+    assert export.export_history(history, stream, "csv") == len(history)
+    reader = csv.reader(io.StringIO(stream.getvalue()))
+    assert tuple(next(reader)) == export.COLUMNS
+    rows = [
+        (float(a), float(b), state, int(c), int(d), int(e)) for a, b, state, c, d, e in reader
+    ]
+    assert rows == expected(history)
+
+
+def test_jsonl_round_trip_with_filters(history):
+    start, end = window(history)
+    states = [SessionState.WORK, SessionState.LONG_BREAK]
+    stream = io.StringIO()
+    count = export.export_history(history, stream, "jsonl", start, end, states)
+    rows = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert count == len(rows)
+    assert [tuple(row[name] for name in export.COLUMNS) for row in rows] == expected(
+        history, start, end, states
+    )
+
+
+def test_columnar_round_trip_across_row_groups(history):
+    stream = io.BytesIO()
+    size = export.RECORD.size * 100
+    blocks = (
+        block[offset:offset + size]
+        for block in export.iter_blocks(history)
+        for offset in range(0, len(block), size)
+    )
+    rows = export.write_columnar(blocks, stream, row_group=500)
+    assert rows == len(history)
+    groups = list(export.read_columnar(stream))
+    assert len(groups) > 1
+    names = [state.value for state in sorted(export.STATE_CODES, key=export.STATE_CODES.get)]
+    decoded = [
+        (start, end, names[code], planned, actual, cycles)
+        for group in groups
+        for start, end, code, planned, actual, cycles in zip(
+            *(group[name] for name in export.COLUMNS)
+        )
+    ]
+    assert decoded == expected(history)
+
+
+def test_columnar_reads_only_selected_columns(history):
+    start, end = window(history)
+    stream = io.BytesIO()
+    export.export_history(history, stream, "columnar", start, end, [SessionState.SHORT_BREAK])
+    groups = list(export.read_columnar(stream, ["cycle_count"]))
+    assert all(set(group) == {"cycle_count"} for group in groups)
+    assert [cycles for group in groups for cycles in group["cycle_count"]] == [
+        row[5] for row in expected(history, start, end, [SessionState.SHORT_BREAK])
+    ]
+
+
+def test_columnar_rejects_bad_input(history):
+    with pytest.raises(ValueError, match="unknown columns"):
+        list(export.read_columnar(io.BytesIO(), ["nope"]))
+    with pytest.raises(ValueError, match="not a pypomodoro"):
+        list(export.read_columnar(io.BytesIO(b"x" * 64)))
+    stream = io.BytesIO()
+    export.export_history(history, stream, "columnar")
+    with pytest.raises(ValueError, match="truncated"):
+        list(export.read_columnar(io.BytesIO(stream.getvalue()[:-4])))
+
+
+def test_empty_state_filter_and_unknown_format(history):
+    assert list(export.iter_rows(history, states=[])) == []
+    with pytest.raises(ValueError, match="unknown export format"):
+        export.export_history(history, io.StringIO(), "xml")
@@ -0,0 +1,100 @@
+import asyncio
+import io
+import json
+
+import pytest
+
+from pypomodoro.core import ipc, watchdog
+from pypomodoro.core.config import AppConfig
+from pypomodoro.headless import HeadlessRunner
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    for name in ("XDG_CONFIG_HOME", "XDG_DATA_HOME", "XDG_CACHE_HOME", "XDG_RUNTIME_DIR"):
+        monkeypatch.setenv(name, str(tmp_path / name.lower()))
+    (tmp_path / "xdg_runtime_dir").mkdir()
+
+
+def make_runner(**kwargs):
+    output = io.StringIO()
+    runner = HeadlessRunner(AppConfig(), output=output, as_json=True, notify=False, **kwargs)
+    return runner, output
+
+
+async def run_for(runner, seconds):
+    task = asyncio.ensure_future(runner.run())
+    await asyncio.sleep(seconds)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+def test_commands_reply_with_status():
+    runner, output = make_runner()
+    reply = runner.handle_command("status")
+    assert (reply["state"], reply["is_running"]) == ("work", False)
+    assert runner.handle_command("start")["is_running"]
+    assert not runner.handle_command("pause")["is_running"]
+    with pytest.raises(KeyError):
+        runner.handle_command("explode")
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [line["is_running"] for line in lines] == [True, False]
+
+
+def test_heartbeats_watchdog_from_the_event_loop(monkeypatch):
+    stalls = []
+    dog = watchdog.StallWatchdog(threshold=0.3, on_stall=lambda *args: stalls.append(args))
+    beats = []
+    heartbeat = dog.heartbeat
+    monkeypatch.setattr(dog, "heartbeat", lambda: (beats.append(1), heartbeat()))
+    monkeypatch.setattr(watchdog, "_watchdog", dog)
+    runner, _ = make_runner()
+    runner.keep_alive = True
+    asyncio.run(run_for(runner, 0.8))
+    assert len(beats) >= 3
+    # Heartbeats stop with the runner.
+    count = len(beats)
+    assert dog.check() is False
+    asyncio.run(asyncio.sleep(0.3))
+    assert len(beats) == count
+    assert stalls == []
+
+
+def test_no_watchdog_no_heartbeat(monkeypatch):
+    monkeypatch.setattr(watchdog, "_watchdog", None)
+    runner, output = make_runner()
+    runner.keep_alive = True
+    asyncio.run(run_for(runner, 0.1))
+    assert json.loads(output.getvalue().splitlines()[0])["is_running"]
+
+
+def test_cli_commands_reach_a_headless_run():
+    server = ipc.InstanceServer()
+    server.bind()
+    runner, _ = make_runner(instance_server=server)
+    assert runner.keep_alive
+
+    async def scenario():
+        task = asyncio.ensure_future(runner.run())
+        await asyncio.sleep(0.1)
+        loop = asyncio.get_running_loop()
+        status = await loop.run_in_executor(None, ipc.send_command, "status")
+        paused = await loop.run_in_executor(None, ipc.send_command, "pause")
+        show = await loop.run_in_executor(None, ipc.send_command, "show")
+        await asyncio.sleep(0.1)
+        # Paused by a command, the run waits for the next one.
+        assert not task.done()
+        resumed = await loop.run_in_executor(None, ipc.send_command, "start")
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return status, paused, show, resumed
+
+    status, paused, show, resumed = asyncio.run(scenario())
+    assert status["ok"] and status["is_running"]
+    assert paused["ok"] and not paused["is_running"]
+    assert not show["ok"] and "headless" in show["error"]
+    assert resumed["is_running"]
+    # Closed with the run, so the next instance can bind.
+    assert ipc.send_command("status", timeout=1.0) is None
@@ -0,0 +1,113 @@
+import random
+
+import pytest
+
+from pypomodoro.core.history import RECORD, SessionHistory, SessionRecord
+from pypomodoro.core.timer_engine import SessionState
+
+STATES = list(SessionState)
+
+
+def random_records(seed: int, count: int = 1500):
+    rng = random.Random(seed)
+    now = 1_700_000_000.0
+    records = []
+    for cycle in range(count):
+        if rng.random() < 0.03:
+            # Clock set back, often across midnight.
+            now -= rng.choice([3 * 3600, 30 * 3600, 2 * 86400, 9 * 86400])
+        planned = rng.choice([300, 1200, 1500])
+        actual = planned - rng.choice([0, 0, 45])
+        records.append(
+            SessionRecord(now, now + actual, rng.choice(STATES), planned, actual, cycle)
+        )
+        now += actual + rng.choice([0, 60, 900, 9 * 3600])
+    return records
+
+
+def linear(records, start=None, end=None, state=None):
+    return [
+        record
+        for record in records
+        if (start is None or record.start >= start)
+        and (end is None or record.start < end)
+        and (state is None or record.state == state)
+    ]
+
+
+def check_queries(history, records, rng):
+    assert len(history) == len(records)
+    assert list(history.records()) == records
+    for state in STATES:
+        numbers = history.record_numbers(state)
+        assert list(numbers) == [n for n, r in enumerate(records) if r.state == state]
+        assert list(history.records(state=state)) == linear(records, state=state)
+    low, high = records[0].start - 86400, max(r.start for r in records) + 86400
+    for _ in range(200):
+        start = rng.uniform(low, high)
+        end = start + rng.choice([3600, 86400, 7 * 86400, 45 * 86400])
+        state = rng.choice([None] + STATES)
+        want = linear(records, start, end, state)
+        assert sorted(history.records(start, end, state), key=repr) == sorted(want, key=repr)
+        assert history.total_seconds(start, end, state or SessionState.WORK) == sum(
+            r.actual_seconds for r in linear(records, start, end, state or SessionState.WORK)
+        )
+        # blocks() may return whole days around the range, never less.
+        in_blocks = {
+            fields[5] for block in history.blocks(start, end) for fields in RECORD.iter_unpack(block)
+        }
+        assert {r.cycle_count for r in linear(records, start, end)} <= in_blocks
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_queries_match_linear_scan_with_clock_set_back(tmp_path, seed):
+    records = random_records(seed)
+    history = SessionHistory(tmp_path)
+    for record in records:
+        history.append(record)
+    rng = random.Random(seed)
+    check_queries(history, records, rng)
+    history.close()
+
+    reopened = SessionHistory(tmp_path)
+    check_queries(reopened, records, rng)
+    reopened.close()
+
+
+def test_in_order_history_keeps_sorted_index(tmp_path):
+    records = random_records(4)
+    records.sort(key=lambda record: record.start)
+    history = SessionHistory(tmp_path)
+    for record in records:
+        history.append(record)
+    assert history._days_sorted
+    check_queries(history, records, random.Random(4))
+    history.close()
+
+
+def test_missing_or_stale_indexes_are_rebuilt(tmp_path):
+    records = random_records(5, count=400)
+    history = SessionHistory(tmp_path)
+    for record in records:
+        history.append(record)
+    history.close()
+    (tmp_path / "days.idx").unlink()
+    (tmp_path / "state_work.idx").write_bytes(b"")
+    reopened = SessionHistory(tmp_path)
+    check_queries(reopened, records, random.Random(5))
+    reopened.close()
+
+
+def test_torn_record_is_dropped(tmp_path):
+    records = random_records(6, count=50)
+    history = SessionHistory(tmp_path)
+    for record in records:
+        history.append(record)
+    history.close()
+    with (tmp_path / "sessions.bin").open("ab") as handle:
+        handle.write(b"\x01" * (RECORD.size // 2))
+    reopened = SessionHistory(tmp_path)
+    assert list(reopened.records()) == records
+    reopened.append(records[0])
+    assert list(reopened.records())[-1] == records[0]
+    reopened.close()
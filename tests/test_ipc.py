@@ -0,0 +1,109 @@
+import threading
+import time
+
+import pytest
+
+from pypomodoro.core import ipc
+
+
+@pytest.fixture(autouse=True)
+def runtime_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+    return tmp_path
+
+
+@pytest.fixture
+def server():
+    commands = []
+
+    def handler(command):
+        commands.append(command)
+        if command == "reset":
+            raise RuntimeError("engine is busy")
+        return {"state": "work", "command": command}
+
+    server = ipc.InstanceServer()
+    server.start(handler)
+    server.commands = commands
+    yield server
+    server.close()
+
+
+def test_no_instance_means_no_reply():
+    assert ipc.send_command("status", timeout=1.0) is None
+
+
+def test_request_and_reply(server):
+    assert ipc.send_command("status") == {"ok": True, "state": "work", "command": "status"}
+    assert ipc.send_command("pause")["command"] == "pause"
+    assert server.commands == ["status", "pause"]
+
+
+def test_handler_errors_and_unknown_commands_are_replies(server):
+    assert ipc.send_command("reset") == {"ok": False, "error": "engine is busy"}
+    assert ipc.send_command("explode") == {"ok": False, "error": "unknown command: explode"}
+    assert server.commands == ["reset"]
+
+
+def test_second_instance_cannot_bind(server):
+    with pytest.raises(ipc.InstanceRunning):
+        ipc.InstanceServer().bind()
+    assert ipc.send_command("status")["ok"]
+
+
+def test_socket_is_removed_and_rebindable_after_close(server):
+    server.close()
+    assert ipc.send_command("status", timeout=1.0) is None
+    again = ipc.InstanceServer(lambda command: {"again": True})
+    again.start()
+    try:
+        assert ipc.send_command("show") == {"ok": True, "again": True}
+    finally:
+        again.close()
+
+
+def test_silent_client_does_not_hold_up_others(server):
+    silent = ipc._connect(ipc._client_address(), 5.0)
+    try:
+        started = time.monotonic()
+        assert ipc.send_command("status")["ok"]
+        assert time.monotonic() - started < ipc.READ_TIMEOUT
+    finally:
+        silent.close()
+
+
+def test_slow_commands_run_side_by_side():
+    release = threading.Event()
+
+    def handler(command):
+        if command == "start":
+            release.wait(5)
+        return {"command": command}
+
+    server = ipc.InstanceServer(handler)
+    server.start()
+    try:
+        replies = []
+        slow = threading.Thread(target=lambda: replies.append(ipc.send_command("start")))
+        slow.start()
+        time.sleep(0.05)
+        assert ipc.send_command("status")["command"] == "status"
+        release.set()
+        slow.join(5)
+        assert replies == [{"ok": True, "command": "start"}]
+    finally:
+        release.set()
+        server.close()
+
+
+def test_connections_over_the_limit_get_an_error(server):
+    silent = [ipc._connect(ipc._client_address(), 5.0) for _ in range(ipc.MAX_CONNECTIONS)]
+    try:
+        time.sleep(0.1)
+        assert ipc.send_command("status") == {"ok": False, "error": "too many connections"}
+    finally:
+        for sock in silent:
+            sock.close()
+    time.sleep(0.1)
+    assert ipc.send_command("status")["ok"]
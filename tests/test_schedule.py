@@ -0,0 +1,90 @@
+import pytest
+
+from pypomodoro.core.config import DEFAULT_SCHEDULE, parse_config
+from pypomodoro.core.schedule import MAX_SLOTS, SessionState, compile_schedule, parse_schedule
+from pypomodoro.core.timer_engine import TimerEngine
+
+W, S, L = SessionState.WORK, SessionState.SHORT_BREAK, SessionState.LONG_BREAK
+
+
+def test_default_schedule_matches_the_fixed_cycle():
+    slots = parse_schedule(DEFAULT_SCHEDULE)
+    assert [state for state, _ in slots] == [W] * 5 + [S] + [W] * 5 + [L]
+    assert all(minutes is None for _, minutes in slots)
+
+
+def test_groups_repeats_and_minutes():
+    slots = parse_schedule("(Work, short)*2, work:50, LONG_BREAK:30")
+    assert slots == ((W, None), (S, None), (W, None), (S, None), (W, 50), (L, 30))
+
+
+def test_compile_fills_default_durations_and_wraps():
+    table = compile_schedule("work, short:3, work, long", 25, 5, 20)
+    assert table.states == (W, S, W, L)
+    assert table.durations == (1500, 180, 1500, 1200)
+    assert table.next_slot == (1, 2, 3, 0)
+    assert table.work_slots == (0, 2)
+
+
+@pytest.mark.parametrize(
+    "spec, message",
+    [
+        ("", "empty"),
+        ("short, work", "start with a work"),
+        ("work, short, long", "two breaks"),
+        ("work, nap", "unknown session"),
+        ("(work, short", "unclosed"),
+        ("work*0", "at least 1"),
+        ("work:", "expected a number"),
+        ("work short", "unexpected"),
+        ("work; short", "unexpected"),
+        (f"work*{MAX_SLOTS + 1}", "longer than"),
+        (f"(work, short)*{MAX_SLOTS}", "longer than"),
+    ],
+)
+def test_invalid_specs_are_rejected(spec, message):
+    with pytest.raises(ValueError, match=message):
+        parse_schedule(spec)
+
+
+def test_max_slots_is_allowed():
+    assert len(parse_schedule(f"work*{MAX_SLOTS}")) == MAX_SLOTS
+
+
+def test_invalid_schedule_in_config_falls_back_to_default():
+    assert parse_config('{"schedule": "short, short"}').schedule == DEFAULT_SCHEDULE
+    assert parse_config('{"schedule": "work, long"}').schedule == "work, long"
+
+
+def test_slot_for_restored_sessions():
+    table = compile_schedule("work, work, short, work, long", 25, 5, 20)
+    assert table.slot_for(W, 0) == 0
+    assert table.slot_for(W, 1) == 1
+    assert table.slot_for(S, 2) == 2
+    assert table.slot_for(L, 3) == 4
+    # A break that the schedule does not put here was started by hand.
+    assert table.slot_for(L, 2) == 3
+
+
+def test_engine_follows_custom_schedule():
+    engine = TimerEngine(25, 5, 20, schedule="work:10, short:2, work:10, long:15")
+    engine.start()
+    events = engine.advance((10 + 2 + 10 + 15) * 60)
+    assert [(event.from_state, event.to_state) for event in events] == [
+        (W, S),
+        (S, W),
+        (W, L),
+        (L, W),
+    ]
+    assert engine.state == W
+    assert engine.remaining_seconds == 600
+
+
+def test_changing_schedule_moves_to_matching_slot():
+    engine = TimerEngine(25, 5, 20)
+    engine.start()
+    engine.advance(1500)
+    assert engine.state == W and engine.cycle_count == 1
+    engine.update_settings(25, 5, 20, True, True, schedule="work, short, work, long")
+    engine.advance(1500)
+    assert engine.state == L
@@ -0,0 +1,182 @@
+import wave
+from types import SimpleNamespace
+
+import pytest
+
+QtCore = pytest.importorskip("PySide6.QtCore")
+
+from pypomodoro.core.sounds import SoundPlayer  # noqa: E402
+
+
+@pytest.fixture(scope="module", autouse=True)
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+class Signal:
+    def __init__(self, owner):
+        self.owner = owner
+        self.slots = []
+
+    def connect(self, slot):
+        self.slots.append(slot)
+
+    def emit(self, *args):
+        if not self.owner.blocked:
+            for slot in self.slots:
+                slot(*args)
+
+
+class Format:
+    class SampleFormat:
+        Int16 = "int16"
+        Float = "float"
+
+    def __init__(self, sample_format="int16", rate=44100, channels=2):
+        self.values = [sample_format, rate, channels]
+
+    def setSampleRate(self, rate):
+        self.values[1] = rate
+
+    def setChannelCount(self, channels):
+        self.values[2] = channels
+
+    def setSampleFormat(self, sample_format):
+        self.values[0] = sample_format
+
+    def sampleFormat(self):
+        return self.values[0]
+
+    def sampleRate(self):
+        return self.values[1]
+
+    def channelCount(self):
+        return self.values[2]
+
+
+class Buffer:
+    def __init__(self, data, audio_format=None):
+        self.data = data
+        self.audio_format = audio_format or Format()
+
+    def format(self):
+        return self.audio_format
+
+    def constData(self):
+        return self.data
+
+
+class Decoder:
+    created = []
+
+    def __init__(self):
+        self.blocked = self.started = self.stopped = self.deleted = False
+        self.bufferReady = Signal(self)
+        self.finished = Signal(self)
+        self.error = Signal(self)
+        self.buffers = []
+        Decoder.created.append(self)
+
+    def isSupported(self):
+        return True
+
+    def setAudioFormat(self, audio_format):
+        pass
+
+    def setSource(self, url):
+        self.source = url.toLocalFile()
+
+    def start(self):
+        self.started = True
+
+    def stop(self):
+        self.stopped = True
+
+    def read(self):
+        return self.buffers.pop(0)
+
+    def deliver(self, buffer):
+        self.buffers.append(buffer)
+        self.bufferReady.emit()
+
+    def errorString(self):
+        return "broken"
+
+    def blockSignals(self, blocked):
+        self.blocked = blocked
+
+    def deleteLater(self):
+        self.deleted = True
+
+
+class Effect:
+    class Status:
+        Ready = "ready"
+        Error = "error"
+
+    def setSource(self, url):
+        self.source = url.toLocalFile()
+
+
+@pytest.fixture
+def player(tmp_path):
+    Decoder.created = []
+    first, second = tmp_path / "first.mp3", tmp_path / "second.mp3"
+    first.write_bytes(b"one")
+    second.write_bytes(b"two")
+    player = SoundPlayer(cache_dir=tmp_path / "cache")
+    player._multimedia = SimpleNamespace(
+        QAudioFormat=Format, QAudioDecoder=Decoder, QSoundEffect=Effect
+    )
+    player.files = first, second
+    return player
+
+
+def select(player, path):
+    player.configure(True, str(path))
+    player.prepare()
+    return Decoder.created[-1]
+
+
+def test_decoded_file_is_cached_and_loaded(player):
+    decoder = select(player, player.files[0])
+    decoder.deliver(Buffer(b"\x01\x00" * 8))
+    decoder.finished.emit()
+    assert decoder.deleted
+    (cached,) = player.cache_dir.glob("*.wav")
+    with wave.open(str(cached)) as wav:
+        assert wav.readframes(4) == b"\x01\x00" * 8
+    assert player._effect.source == str(cached)
+
+
+def test_switching_sound_cancels_the_decode_in_flight(player):
+    old = select(player, player.files[0])
+    old.deliver(Buffer(b"\x01\x00" * 4))
+    new = select(player, player.files[1])
+    assert (old.stopped, old.blocked, old.deleted) == (True, True, True)
+    assert new.started and player._decoding == player.files[1]
+
+    # Late callbacks from the cancelled decoder change nothing.
+    for slot in old.finished.slots:
+        slot()
+    for slot in old.error.slots:
+        slot(1)
+    assert player._decoding == player.files[1] and player._failed is None
+    assert not list(player.cache_dir.glob("*.wav"))
+
+    new.deliver(Buffer(b"\x02\x00" * 4))
+    new.finished.emit()
+    (cached,) = player.cache_dir.glob("*.wav")
+    with wave.open(str(cached)) as wav:
+        assert wav.readframes(4) == b"\x02\x00" * 4
+    assert player._effect_file == player.files[1]
+
+
+def test_decode_error_and_bad_format_fall_back(player):
+    decoder = select(player, player.files[0])
+    decoder.error.emit(1)
+    assert player._failed == player.files[0] and decoder.deleted
+    decoder = select(player, player.files[1])
+    decoder.deliver(Buffer(b"\x00" * 8, Format("float")))
+    assert player._failed == player.files[1] and decoder.stopped
+    assert not list(player.cache_dir.glob("*.wav"))
@@ -0,0 +1,141 @@
+import random
+import time
+from datetime import date
+
+import pytest
+
+from pypomodoro.core.history import SessionHistory, SessionRecord
+from pypomodoro.core.stats import SessionStats
+from pypomodoro.core.timer_engine import SessionState
+
+BACKENDS = ["array", "numpy"]
+
+
+@pytest.fixture(autouse=True)
+def dst_timezone(monkeypatch):
+    # A zone with DST switches, spelled out so no tz database is needed.
+    monkeypatch.setenv("TZ", "EST5EDT,M3.2.0,M11.1.0")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def backend(name):
+    if name == "numpy":
+        pytest.importorskip("numpy")
+    return name
+
+
+def make_records(seed, count=2000):
+    rng = random.Random(seed)
+    # Starts a week before the 2024-03-10 DST switch and runs past it.
+    now = 1_709_500_000.0
+    records = []
+    for cycle in range(count):
+        if rng.random() < 0.02:
+            now -= rng.choice([5 * 3600, 2 * 86400])
+        state = rng.choice([SessionState.WORK] * 3 + [SessionState.SHORT_BREAK])
+        actual = rng.choice([1500, 1500, 900]) if state == SessionState.WORK else 300
+        planned = 1500 if state == SessionState.WORK else 300
+        records.append(SessionRecord(now, now + actual, state, planned, actual, cycle))
+        now += actual + rng.choice([0, 120, 3000, 6 * 3600, 30 * 3600])
+    return records
+
+
+def local_day(timestamp):
+    local = time.localtime(timestamp)
+    return date(local.tm_year, local.tm_mon, local.tm_mday)
+
+
+def reference_streaks(records, today):
+    days = sorted(
+        {
+            local_day(r.start).toordinal()
+            for r in records
+            if r.state == SessionState.WORK and r.actual_seconds >= r.planned_seconds
+        }
+    )
+    longest = current = 0
+    for index, day in enumerate(days):
+        current = current + 1 if index and days[index - 1] == day - 1 else 1
+        longest = max(longest, current)
+    if not days or today.toordinal() - days[-1] > 1:
+        current = 0
+    return current, longest
+
+
+def check(stats, records):
+    work = [r for r in records if r.state == SessionState.WORK]
+    rng = random.Random(len(records))
+    low = min(r.start for r in records)
+    high = max(r.start for r in records)
+    for _ in range(100):
+        start = rng.uniform(low, high)
+        end = start + rng.choice([3600, 86400, 10 * 86400])
+        assert stats.focus_between(start, end) == sum(
+            r.actual_seconds for r in work if start <= r.start < end
+        )
+    first, last = local_day(low), local_day(high)
+    expected = {}
+    for r in work:
+        day = local_day(r.start)
+        expected[day] = expected.get(day, 0) + r.actual_seconds
+    assert {day: s for day, s in stats.daily_focus(first, last).items() if s} == expected
+    heat = [[0.0] * 24 for _ in range(7)]
+    for r in work:
+        local = time.localtime(r.start)
+        heat[local.tm_wday][local.tm_hour] += r.actual_seconds
+    assert stats.heatmap() == heat
+    today = local_day(max(r.start for r in records))
+    assert stats.streaks(today) == reference_streaks(records, today)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_live_adds_out_of_order_match_reference(name):
+    records = make_records(1)
+    stats = SessionStats(backend(name))
+    for record in records:
+        stats.add(record)
+    check(stats, records)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_bulk_load_matches_reference(tmp_path, name):
+    records = make_records(2)
+    history = SessionHistory(tmp_path)
+    for record in records:
+        history.append(record)
+    stats = SessionStats.from_history(history, backend(name))
+    history.close()
+    check(stats, records)
+    late = SessionRecord(records[0].start - 86400, records[0].start - 84900, SessionState.WORK, 1500, 1500, 0)
+    stats.add(late)
+    check(stats, records + [late])
+
+
+def test_backends_agree_on_dst_switch_day(tmp_path):
+    pytest.importorskip("numpy")
+    history = SessionHistory(tmp_path)
+    # Hourly sessions through the night of the 2024-03-10 switch (EST->EDT
+    # at 07:00 UTC) and the 2024-11-03 switch back (EDT->EST at 06:00 UTC).
+    for base in (1_710_028_800.0, 1_730_592_000.0):
+        for hour in range(20):
+            start = base + hour * 3600 + 1200
+            history.append(SessionRecord(start, start + 1500, SessionState.WORK, 1500, 1500, hour))
+    array_stats = SessionStats.from_history(history, "array")
+    numpy_stats = SessionStats.from_history(history, "numpy")
+    history.close()
+    first, last = date(2024, 3, 9), date(2024, 11, 4)
+    assert numpy_stats.daily_focus(first, last) == array_stats.daily_focus(first, last)
+    assert numpy_stats.heatmap() == array_stats.heatmap()
+
+
+def test_completion_rate_and_break_overrun():
+    stats = SessionStats("array")
+    base = 1_709_500_000.0
+    stats.add(SessionRecord(base, base + 1500, SessionState.WORK, 1500, 1500, 1))
+    stats.add(SessionRecord(base + 1500, base + 1800, SessionState.SHORT_BREAK, 300, 300, 1))
+    stats.add(SessionRecord(base + 1920, base + 2820, SessionState.WORK, 1500, 900, 1))
+    assert stats.completion_rate() == 0.5
+    assert stats.average_break_overrun() == 120.0
@@ -0,0 +1,72 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip("PySide6.QtGui")
+
+from pypomodoro.ui.themes import DEFAULT_THEME, ThemeRegistry  # noqa: E402
+
+
+def write_theme(directory, name, colors, mtime=None):
+    path = directory / f"{name}.json"
+    path.write_text(json.dumps({"colors": colors}), encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    builtin, user = tmp_path / "builtin", tmp_path / "user"
+    builtin.mkdir()
+    user.mkdir()
+    write_theme(builtin, DEFAULT_THEME, {"window": "#ffffff"})
+    write_theme(builtin, "dark", {"window": "#000000"})
+    return builtin, user
+
+
+def test_user_themes_override_builtin(dirs):
+    builtin, user = dirs
+    write_theme(user, "dark", {"window": "#111111"})
+    registry = ThemeRegistry([builtin, user])
+    assert registry.names() == ["dark", DEFAULT_THEME]
+    assert registry.get("dark").colors["window"] == "#111111"
+    assert registry.get("missing").name == DEFAULT_THEME
+
+
+def test_get_touches_no_files_until_reload(dirs):
+    builtin, user = dirs
+    registry = ThemeRegistry([builtin, user])
+    dark = registry.get("dark")
+    (builtin / "dark.json").unlink()
+    write_theme(user, "solar", {"window": "#fdf6e3"})
+    assert registry.get("dark") is dark
+    assert "solar" not in registry.names()
+
+    registry.reload()
+    assert registry.get("dark").name == DEFAULT_THEME
+    assert registry.get("solar").colors["window"] == "#fdf6e3"
+
+
+def test_reload_keeps_unchanged_themes_and_recompiles_edited_ones(dirs):
+    builtin, user = dirs
+    registry = ThemeRegistry([builtin, user])
+    light = registry.get(DEFAULT_THEME)
+    dark = registry.get("dark")
+    write_theme(builtin, "dark", {"window": "#222222"}, mtime=1_000_000)
+    registry.reload()
+    assert registry.get(DEFAULT_THEME) is light
+    assert registry.get("dark") is not dark
+    assert registry.get("dark").colors["window"] == "#222222"
+
+
+def test_invalid_colors_and_files_fall_back_to_defaults(dirs):
+    builtin, user = dirs
+    write_theme(user, "odd", {"window": "not a colour", "text": "#123456"})
+    (user / "broken.json").write_text("{", encoding="utf-8")
+    registry = ThemeRegistry([builtin, user])
+    odd = registry.get("odd")
+    assert odd.colors["text"] == "#123456"
+    assert odd.colors["window"] != "not a colour"
+    assert registry.get("broken").colors == ThemeRegistry._compile("broken", {}).colors
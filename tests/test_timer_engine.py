@@ -0,0 +1,136 @@
+from pypomodoro.core.events import EventBus
+from pypomodoro.core.timer_engine import SessionState, TimerEngine, TimerEventType
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_engine(clock=None, **kwargs):
+    clock = clock or FakeClock()
+    wall = FakeClock(1_700_000_000.0)
+    engine = TimerEngine(25, 5, 20, clock=clock, wall_clock=wall, **kwargs)
+    return engine, clock, wall
+
+
+def test_start_while_running_keeps_deadline():
+    engine, clock, _ = make_engine()
+    engine.start()
+    clock.now += 600
+    engine.start()
+    assert engine.time_remaining() == 900
+    clock.now += 1
+    engine.tick()
+    assert engine.remaining_seconds == 899
+
+
+def test_start_while_running_publishes_once():
+    bus = EventBus()
+    starts = []
+    bus.subscribe(starts.append, event_types=[TimerEventType.START])
+    engine, clock, _ = make_engine(bus=bus)
+    engine.start()
+    clock.now += 10
+    engine.start()
+    assert len(starts) == 1
+
+
+def test_pause_and_resume_keep_remaining_time():
+    engine, clock, _ = make_engine()
+    engine.start()
+    clock.now += 100.4
+    engine.pause()
+    assert engine.remaining_seconds == 1400
+    clock.now += 3600
+    assert engine.time_remaining() == 1400
+    engine.start()
+    clock.now += 400
+    engine.tick()
+    assert engine.remaining_seconds == 1000
+    assert engine.state == SessionState.WORK
+
+
+def test_deadline_does_not_drift_with_late_ticks():
+    engine, clock, _ = make_engine()
+    engine.start()
+    for _ in range(100):
+        clock.now += 1.25
+        engine.tick()
+    assert engine.remaining_seconds == 1500 - 125
+
+
+def test_single_missed_boundary_is_not_catch_up():
+    transitions = []
+    engine, clock, _ = make_engine(on_transition=transitions.append)
+    engine.start()
+    clock.now += 1500
+    event = engine.tick()
+    assert event is not None and not event.catch_up
+    assert engine.state == SessionState.WORK
+    assert engine.cycle_count == 1
+    assert transitions == [event]
+
+
+def test_catch_up_replays_missed_sessions_on_their_boundaries():
+    batches = []
+    engine, clock, wall = make_engine(on_catch_up=batches.append)
+    engine.start()
+    # Asleep for 5 work sessions, a short break and 100 s more.
+    clock.now += 5 * 1500 + 300 + 100
+    wall.now += 5 * 1500 + 300 + 100
+    engine.tick()
+    (events,) = batches
+    assert [event.from_state for event in events] == [SessionState.WORK] * 5 + [
+        SessionState.SHORT_BREAK
+    ]
+    assert all(event.catch_up for event in events)
+    ends = [event.ended_at - 1_700_000_000.0 for event in events]
+    assert ends == [1500, 3000, 4500, 6000, 7500, 7800]
+    assert engine.state == SessionState.WORK
+    assert engine.cycle_count == 5
+    assert engine.remaining_seconds == 1400
+
+
+def test_catch_up_stops_at_a_session_that_does_not_auto_start():
+    engine, clock, _ = make_engine()
+    engine.auto_start_break = False
+    engine.start()
+    clock.now += 10_000
+    engine.tick()
+    assert engine.state == SessionState.WORK
+    assert engine.cycle_count == 1
+    assert not engine.is_running
+    assert engine.remaining_seconds == 1500
+
+
+def test_tick_without_clock_counts_seconds():
+    engine = TimerEngine(1, 1, 1)
+    engine.start()
+    for _ in range(59):
+        assert engine.tick() is None
+    event = engine.tick()
+    assert event.from_state == SessionState.WORK
+    assert engine.remaining_seconds == 60
+
+
+def test_advance_jumps_over_sessions():
+    engine = TimerEngine(25, 5, 20)
+    engine.start()
+    events = engine.advance(5 * 1500 + 299)
+    assert len(events) == 5
+    assert engine.state == SessionState.SHORT_BREAK
+    assert engine.remaining_seconds == 1
+
+
+def test_reset_returns_to_first_work_session():
+    engine, clock, _ = make_engine()
+    engine.start()
+    clock.now += 1500 * 3
+    engine.tick()
+    engine.reset()
+    assert (engine.state, engine.cycle_count, engine.is_running) == (SessionState.WORK, 0, False)
+    assert engine.time_remaining() == 1500